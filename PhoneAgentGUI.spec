@@ -5,8 +5,8 @@ a = Analysis(
     ['gui.py'],
     pathex=[],
     binaries=[],
-    datas=[('adb.exe', '.'), ('hdc.exe', '.'), ('AdbWinApi.dll', '.'), ('AdbWinUsbApi.dll', '.'), ('libwinpthread-1.dll', '.'), ('libusb_shared.dll', '.'), ('ADBKeyboard.apk', '.'), ('phone_agent', 'phone_agent'), ('main.py', '.'), ('ios.py', '.'), ('ai_config.json', '.'), ('gui_config.json', '.'), ('gzh.png', '.'), ('task_simplifier.py', '.'), ('WebDriverAgent', 'WebDriverAgent')],
-    hiddenimports=['tkinter', 'tkinter.ttk', 'tkinter.scrolledtext', 'tkinter.messagebox', 'tkinter.filedialog', 'PIL', 'PIL.Image', 'openai', 'requests', 'aiohttp', 'urllib3', 'phone_agent', 'phone_agent.agent', 'phone_agent.agent_ios', 'phone_agent.device_factory', 'phone_agent.model', 'phone_agent.model.client', 'phone_agent.adb', 'phone_agent.adb.connection', 'phone_agent.adb.device', 'phone_agent.adb.input', 'phone_agent.adb.screenshot', 'phone_agent.hdc', 'phone_agent.hdc.connection', 'phone_agent.hdc.device', 'phone_agent.hdc.input', 'phone_agent.hdc.screenshot', 'phone_agent.xctest', 'phone_agent.xctest.connection', 'phone_agent.xctest.device', 'phone_agent.xctest.input', 'phone_agent.xctest.screenshot', 'phone_agent.actions', 'phone_agent.actions.handler', 'phone_agent.actions.handler_ios', 'phone_agent.config', 'phone_agent.config.apps', 'phone_agent.config.apps_harmonyos', 'phone_agent.config.apps_ios', 'phone_agent.config.i18n', 'phone_agent.config.prompts', 'phone_agent.config.prompts_zh', 'phone_agent.config.prompts_en', 'phone_agent.config.timing'],
+    datas=[('adb.exe', '.'), ('hdc.exe', '.'), ('AdbWinApi.dll', '.'), ('AdbWinUsbApi.dll', '.'), ('libwinpthread-1.dll', '.'), ('libusb_shared.dll', '.'), ('ADBKeyboard.apk', '.'), ('phone_agent', 'phone_agent'), ('main.py', '.'), ('ios.py', '.'), ('ai_config.json', '.'), ('gui_config.json', '.'), ('gzh.png', '.'), ('task_simplifier.py', '.'), ('task_history.py', '.'), ('simplify_cache.py', '.'), ('WebDriverAgent', 'WebDriverAgent')],
+    hiddenimports=['tkinter', 'tkinter.ttk', 'tkinter.scrolledtext', 'tkinter.messagebox', 'tkinter.filedialog', 'PIL', 'PIL.Image', 'openai', 'requests', 'aiohttp', 'urllib3', 'phone_agent', 'phone_agent.agent', 'phone_agent.agent_ios', 'phone_agent.agent_async', 'phone_agent.device_factory', 'phone_agent.async_device', 'phone_agent.app_index', 'phone_agent.fleet', 'phone_agent.checkpoint', 'phone_agent.trajectory', 'phone_agent.progress', 'phone_agent.deadline', 'phone_agent.ui_tree', 'phone_agent.model', 'phone_agent.model.client', 'phone_agent.adb', 'phone_agent.adb.connection', 'phone_agent.adb.device', 'phone_agent.adb.hierarchy', 'phone_agent.adb.input', 'phone_agent.adb.launcher', 'phone_agent.adb.screenshot', 'phone_agent.adb.transfer', 'phone_agent.hdc', 'phone_agent.hdc.batch', 'phone_agent.hdc.connection', 'phone_agent.hdc.device', 'phone_agent.hdc.hierarchy', 'phone_agent.hdc.input', 'phone_agent.hdc.launcher', 'phone_agent.hdc.screenshot', 'phone_agent.xctest', 'phone_agent.xctest.client', 'phone_agent.xctest.connection', 'phone_agent.xctest.context', 'phone_agent.xctest.device', 'phone_agent.xctest.hierarchy', 'phone_agent.xctest.input', 'phone_agent.xctest.screenshot', 'phone_agent.xctest.stream', 'phone_agent.actions', 'phone_agent.actions.handler', 'phone_agent.actions.handler_ios', 'phone_agent.actions.handler_async', 'phone_agent.actions.scroll', 'phone_agent.actions.verify', 'phone_agent.config', 'phone_agent.config.apps', 'phone_agent.config.apps_harmonyos', 'phone_agent.config.apps_ios', 'phone_agent.config.i18n', 'phone_agent.config.prompts', 'phone_agent.config.prompts_zh', 'phone_agent.config.prompts_en', 'phone_agent.config.timing'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+iOS截图延迟对比 - GET /screenshot vs WDA MJPEG帧流
+
+在本地启动一个模拟WDA的HTTP服务器，同时提供 /screenshot（PNG）和
+MJPEG帧流（multipart/x-mixed-replace），分别测量 get_screenshot
+走 /screenshot 和走后台帧源时的延迟，并演示基于帧变化的界面稳定等待。
+
+用法:
+    python benchmarks/mjpeg_frames.py --steps 100 --fps 10
+"""
+
+import argparse
+import base64
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from phone_agent.xctest import (
+    close_wda_clients,
+    get_screenshot,
+    start_frame_source,
+    stop_frame_source,
+)
+
+# 模拟设备分辨率，MJPEG帧按一半缩放
+DEVICE_SIZE = (1170, 2532)
+FRAME_SIZE = (585, 1266)
+
+
+def _encode(size, color, fmt: str) -> bytes:
+    buffered = BytesIO()
+    Image.new("RGB", size, color=color).save(buffered, format=fmt)
+    return buffered.getvalue()
+
+
+class FakeWDAHandler(BaseHTTPRequestHandler):
+    """模拟WDA的 /screenshot 和 MJPEG 帧流"""
+
+    protocol_version = "HTTP/1.1"
+    screenshot_b64 = base64.b64encode(_encode(DEVICE_SIZE, "white", "PNG")).decode("utf-8")
+    frames = [_encode(FRAME_SIZE, color, "JPEG") for color in ("white", "gray")]
+    fps = 10
+    # 为True时帧内容交替变化，模拟动画中的界面
+    animating = threading.Event()
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith("/mjpeg"):
+            self._stream()
+            return
+
+        # 模拟设备端截图编码耗时
+        time.sleep(0.05)
+        body = json.dumps({"value": self.screenshot_b64, "sessionId": "bench"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        index = 0
+        try:
+            while True:
+                if self.animating.is_set():
+                    index += 1
+                frame = self.frames[index % len(self.frames)]
+                self.wfile.write(
+                    b"--frame\r\nContent-Type: image/jpeg\r\n"
+                    + f"Content-Length: {len(frame)}\r\n\r\n".encode("ascii")
+                    + frame
+                    + b"\r\n"
+                )
+                self.wfile.flush()
+                time.sleep(1 / self.fps)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def measure(wda_url: str, steps: int) -> dict:
+    latencies = []
+    screenshot = None
+    for _ in range(steps):
+        start = time.perf_counter()
+        screenshot = get_screenshot(wda_url, "bench")
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return {
+        "mean": statistics.mean(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "size": f"{screenshot.width}x{screenshot.height}",
+        "kb": len(screenshot.base64_data) * 3 // 4 // 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="iOS截图延迟对比")
+    parser.add_argument("--steps", type=int, default=100, help="截图次数")
+    parser.add_argument("--fps", type=int, default=10, help="模拟MJPEG帧率")
+    args = parser.parse_args()
+
+    FakeWDAHandler.fps = args.fps
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeWDAHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    wda_url = f"http://127.0.0.1:{port}"
+
+    try:
+        results = {"screenshot": measure(wda_url, args.steps)}
+
+        source = start_frame_source(wda_url, f"{wda_url}/mjpeg")
+        source.wait_for_frame(0, timeout=5)
+        results["mjpeg"] = measure(wda_url, args.steps)
+
+        # 界面动画中等待稳定：动画0.5秒后停止
+        FakeWDAHandler.animating.set()
+        threading.Timer(0.5, FakeWDAHandler.animating.clear).start()
+        time.sleep(0.2)
+        start = time.perf_counter()
+        settled = source.wait_until_stable(stable_time=0.3, timeout=3.0)
+        settle_ms = (time.perf_counter() - start) * 1000
+    finally:
+        stop_frame_source(wda_url)
+        close_wda_clients()
+        server.shutdown()
+
+    print(f"{'mode':<12}{'mean(ms)':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'size':>12}{'KB':>6}")
+    for name, r in results.items():
+        print(
+            f"{name:<12}{r['mean']:>10.2f}{r['p50']:>10.2f}{r['p95']:>10.2f}"
+            f"{r['size']:>12}{r['kb']:>6}"
+        )
+    print(f"settle: {'stable' if settled else 'timeout'} after {settle_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+任务精简器延迟对比 - 每次新建事件循环/会话 vs 常驻运行时连接池
+
+在本地启动一个OpenAI兼容的桩服务器，分别用旧的调用方式
+（每次调用新建事件循环和aiohttp会话）和SimplifierRuntime
+（常驻事件循环 + 长连接）进行多次精简，输出延迟统计和建立的TCP连接数。
+
+用法:
+    python benchmarks/simplifier_latency.py --iterations 50 --delay 0.02
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+
+from task_simplifier import AIProvider, SimplifierRuntime, TaskSimplifier
+
+
+class StubServer:
+    """本地OpenAI兼容桩服务器，统计收到的TCP连接数"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = set()
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._runner = None
+
+    async def _handle(self, request):
+        self.connections.add(id(request.transport))
+        await request.json()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return web.json_response({
+            "choices": [{"message": {"role": "assistant", "content": "打开微信，发送消息"}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+        })
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    def start(self):
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self._start())
+            ready.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        ready.wait()
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+class BenchSimplifier(TaskSimplifier):
+    """跳过平台地址校验，以便指向本地桩服务器"""
+
+    def _validate_config(self, provider, config):
+        return {"valid": True}
+
+
+def run_case(name: str, simplifier: TaskSimplifier, server: StubServer, iterations: int) -> dict:
+    server.connections.clear()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = simplifier.simplify_task("打开微信给张三发消息说你好", AIProvider.OPENAI)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if not result.get("success"):
+            raise RuntimeError(f"{name} 调用失败: {result.get('error')}")
+
+    latencies.sort()
+    return {
+        "name": name,
+        "mean": statistics.mean(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "connections": len(server.connections),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="任务精简器延迟对比")
+    parser.add_argument("--iterations", type=int, default=50, help="每种方式的调用次数")
+    parser.add_argument("--delay", type=float, default=0.0, help="桩服务器模拟的推理耗时（秒）")
+    args = parser.parse_args()
+
+    server = StubServer(delay=args.delay)
+    base_url = server.start()
+    configs = {
+        AIProvider.OPENAI: {
+            "api_key": "sk-bench-000000000000000000",
+            "base_url": base_url,
+            "model": "gpt-4o",
+            "timeout": 30,
+        }
+    }
+
+    runtime = SimplifierRuntime()
+    try:
+        results = [
+            run_case("legacy", BenchSimplifier(configs), server, args.iterations),
+            run_case("runtime", BenchSimplifier(configs, runtime=runtime), server, args.iterations),
+        ]
+    finally:
+        runtime.close()
+        server.stop()
+
+    print(f"{'mode':<10}{'mean(ms)':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'conns':>8}")
+    for r in results:
+        print(f"{r['name']:<10}{r['mean']:>10.2f}{r['p50']:>10.2f}{r['p95']:>10.2f}{r['connections']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+WebDriverAgent调用延迟对比 - 每次新建连接 vs 共享长连接WDAClient
+
+在本地启动一个模拟WDA的HTTP服务器，模拟一次iOS步骤中的典型调用
+（activeAppInfo + screenshot + tap），分别用逐次 requests.get/post
+和 phone_agent.xctest 的共享连接池执行，输出延迟统计和建立的TCP连接数。
+
+用法:
+    python benchmarks/wda_latency.py --steps 200
+"""
+
+import argparse
+import base64
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from phone_agent.xctest import close_wda_clients, get_current_app, tap
+from phone_agent.xctest.screenshot import _get_screenshot_wda
+
+
+def _make_png() -> str:
+    buffered = BytesIO()
+    Image.new("RGB", (390, 844), color="white").save(buffered, format="PNG")
+    return base64.b64encode(buffered.getvalue()).decode("utf-8")
+
+
+class FakeWDAHandler(BaseHTTPRequestHandler):
+    """模拟WDA接口，保持HTTP/1.1长连接"""
+
+    protocol_version = "HTTP/1.1"
+    screenshot_b64 = _make_png()
+    connections = set()
+
+    def setup(self):
+        super().setup()
+        # 头部和正文分两次写出，关闭Nagle避免长连接上的延迟确认等待
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        FakeWDAHandler.connections.add(self.client_address)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, value):
+        body = json.dumps({"value": value, "sessionId": "bench"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.endswith("/screenshot"):
+            self._reply(self.screenshot_b64)
+        elif self.path.endswith("/wda/activeAppInfo"):
+            self._reply({"bundleId": "com.apple.springboard", "name": "", "pid": 1})
+        else:
+            self._reply({"ready": True})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self._reply(None)
+
+
+def legacy_step(wda_url: str) -> None:
+    """旧实现：每次调用都通过模块级requests新建连接"""
+    import requests
+
+    requests.get(f"{wda_url}/wda/activeAppInfo", timeout=5, verify=False)
+    response = requests.get(f"{wda_url}/screenshot", timeout=10, verify=False)
+    base64.b64decode(response.json()["value"])
+    requests.post(f"{wda_url}/session/bench/actions", json={"actions": []}, timeout=15, verify=False)
+
+
+def pooled_step(wda_url: str) -> None:
+    """新实现：xctest函数共享按WDA地址缓存的长连接会话"""
+    get_current_app(wda_url)
+    _get_screenshot_wda(wda_url, "bench", 10)
+    tap(100, 200, wda_url=wda_url, session_id="bench", delay=0)
+
+
+def run_case(name: str, step, wda_url: str, steps: int) -> dict:
+    FakeWDAHandler.connections.clear()
+    latencies = []
+    for _ in range(steps):
+        start = time.perf_counter()
+        step(wda_url)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return {
+        "name": name,
+        "mean": statistics.mean(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "connections": len(FakeWDAHandler.connections),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WDA调用延迟对比")
+    parser.add_argument("--steps", type=int, default=200, help="模拟的步骤数")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeWDAHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    wda_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        results = [
+            run_case("legacy", legacy_step, wda_url, args.steps),
+            run_case("pooled", pooled_step, wda_url, args.steps),
+        ]
+    finally:
+        close_wda_clients()
+        server.shutdown()
+
+    print(f"{'mode':<10}{'mean(ms)':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'conns':>8}")
+    for r in results:
+        print(f"{r['name']:<10}{r['mean']:>10.2f}{r['p50']:>10.2f}{r['p95']:>10.2f}{r['connections']:>8}")
+
+
+if __name__ == "__main__":
+    main()
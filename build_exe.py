@@ -31,6 +31,8 @@ a = Analysis(
         ('gui_config.json', '.'),
         ('gzh.png', '.'),
         ('task_simplifier.py', '.'),
+        ('task_history.py', '.'),
+        ('simplify_cache.py', '.'),
         ('WebDriverAgent', 'WebDriverAgent'),
     ],
     hiddenimports=[
@@ -48,27 +50,49 @@ a = Analysis(
         'phone_agent',
         'phone_agent.agent',
         'phone_agent.agent_ios',
+        'phone_agent.agent_async',
         'phone_agent.device_factory',
+        'phone_agent.async_device',
+        'phone_agent.app_index',
+        'phone_agent.fleet',
+        'phone_agent.checkpoint',
+        'phone_agent.trajectory',
+        'phone_agent.progress',
+        'phone_agent.deadline',
+        'phone_agent.ui_tree',
         'phone_agent.model',
         'phone_agent.model.client',
         'phone_agent.adb',
         'phone_agent.adb.connection',
         'phone_agent.adb.device',
+        'phone_agent.adb.hierarchy',
         'phone_agent.adb.input',
+        'phone_agent.adb.launcher',
         'phone_agent.adb.screenshot',
+        'phone_agent.adb.transfer',
         'phone_agent.hdc',
+        'phone_agent.hdc.batch',
         'phone_agent.hdc.connection',
         'phone_agent.hdc.device',
+        'phone_agent.hdc.hierarchy',
         'phone_agent.hdc.input',
+        'phone_agent.hdc.launcher',
         'phone_agent.hdc.screenshot',
         'phone_agent.xctest',
+        'phone_agent.xctest.client',
         'phone_agent.xctest.connection',
+        'phone_agent.xctest.context',
         'phone_agent.xctest.device',
+        'phone_agent.xctest.hierarchy',
         'phone_agent.xctest.input',
         'phone_agent.xctest.screenshot',
+        'phone_agent.xctest.stream',
         'phone_agent.actions',
         'phone_agent.actions.handler',
         'phone_agent.actions.handler_ios',
+        'phone_agent.actions.handler_async',
+        'phone_agent.actions.scroll',
+        'phone_agent.actions.verify',
         'phone_agent.config',
         'phone_agent.config.apps',
         'phone_agent.config.apps_harmonyos',
@@ -146,6 +170,8 @@ def build_exe():
         '--add-data', 'gui_config.json;.',
         '--add-data', 'gzh.png;.',
         '--add-data', 'task_simplifier.py;.',
+        '--add-data', 'task_history.py;.',
+        '--add-data', 'simplify_cache.py;.',
         '--add-data', 'WebDriverAgent;WebDriverAgent',
         '--hidden-import', 'tkinter',
         '--hidden-import', 'tkinter.ttk',
@@ -161,27 +187,49 @@ def build_exe():
         '--hidden-import', 'phone_agent',
         '--hidden-import', 'phone_agent.agent',
         '--hidden-import', 'phone_agent.agent_ios',
+        '--hidden-import', 'phone_agent.agent_async',
         '--hidden-import', 'phone_agent.device_factory',
+        '--hidden-import', 'phone_agent.async_device',
+        '--hidden-import', 'phone_agent.app_index',
+        '--hidden-import', 'phone_agent.fleet',
+        '--hidden-import', 'phone_agent.checkpoint',
+        '--hidden-import', 'phone_agent.trajectory',
+        '--hidden-import', 'phone_agent.progress',
+        '--hidden-import', 'phone_agent.deadline',
+        '--hidden-import', 'phone_agent.ui_tree',
         '--hidden-import', 'phone_agent.model',
         '--hidden-import', 'phone_agent.model.client',
         '--hidden-import', 'phone_agent.adb',
         '--hidden-import', 'phone_agent.adb.connection',
         '--hidden-import', 'phone_agent.adb.device',
+        '--hidden-import', 'phone_agent.adb.hierarchy',
         '--hidden-import', 'phone_agent.adb.input',
+        '--hidden-import', 'phone_agent.adb.launcher',
         '--hidden-import', 'phone_agent.adb.screenshot',
+        '--hidden-import', 'phone_agent.adb.transfer',
         '--hidden-import', 'phone_agent.hdc',
+        '--hidden-import', 'phone_agent.hdc.batch',
         '--hidden-import', 'phone_agent.hdc.connection',
         '--hidden-import', 'phone_agent.hdc.device',
+        '--hidden-import', 'phone_agent.hdc.hierarchy',
         '--hidden-import', 'phone_agent.hdc.input',
+        '--hidden-import', 'phone_agent.hdc.launcher',
         '--hidden-import', 'phone_agent.hdc.screenshot',
         '--hidden-import', 'phone_agent.xctest',
+        '--hidden-import', 'phone_agent.xctest.client',
         '--hidden-import', 'phone_agent.xctest.connection',
+        '--hidden-import', 'phone_agent.xctest.context',
         '--hidden-import', 'phone_agent.xctest.device',
+        '--hidden-import', 'phone_agent.xctest.hierarchy',
         '--hidden-import', 'phone_agent.xctest.input',
         '--hidden-import', 'phone_agent.xctest.screenshot',
+        '--hidden-import', 'phone_agent.xctest.stream',
         '--hidden-import', 'phone_agent.actions',
         '--hidden-import', 'phone_agent.actions.handler',
         '--hidden-import', 'phone_agent.actions.handler_ios',
+        '--hidden-import', 'phone_agent.actions.handler_async',
+        '--hidden-import', 'phone_agent.actions.scroll',
+        '--hidden-import', 'phone_agent.actions.verify',
         '--hidden-import', 'phone_agent.config',
         '--hidden-import', 'phone_agent.config.apps',
         '--hidden-import', 'phone_agent.config.apps_harmonyos',
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Phone Agent Fleet CLI - run a queue of tasks across many Android/HarmonyOS devices.
+
+Usage:
+    python fleet.py TASK_FILE [OPTIONS]
+
+Each non-empty line of TASK_FILE is a plain task description or a JSON object:
+    {"task": "打开微信", "task_id": "t1", "device_id": "emulator-5554"}
+    {"task": "打开设置", "device_type": "hdc", "max_steps": 20}
+
+Environment Variables:
+    PHONE_AGENT_BASE_URL: Model API base URL (default: http://localhost:8000/v1)
+    PHONE_AGENT_MODEL: Model name (default: autoglm-phone-9b)
+    PHONE_AGENT_API_KEY: API key for model authentication (default: EMPTY)
+    PHONE_AGENT_MAX_STEPS: Maximum steps per task (default: 100)
+    PHONE_AGENT_MODEL_CONCURRENCY: Maximum concurrent model requests (default: 4)
+"""
+
+import argparse
+import os
+import sys
+
+from phone_agent.device_factory import DeviceType
+from phone_agent.fleet import FleetRunner, discover_devices, load_tasks
+from phone_agent.model import ModelConfig
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Phone Agent Fleet - run tasks on many devices concurrently",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    # Run tasks on every connected Android and HarmonyOS device
+    python fleet.py tasks.jsonl
+
+    # Only Android devices, at most 2 concurrent model requests
+    python fleet.py tasks.txt --device-type adb --max-model-concurrency 2
+
+    # Only the given devices, results to a custom file
+    python fleet.py tasks.jsonl --devices emulator-5554,emulator-5556 --output out.jsonl
+        """,
+    )
+
+    parser.add_argument("tasks", type=str, help="Task file (one task or JSON object per line)")
+
+    # Model options
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default=os.getenv("PHONE_AGENT_BASE_URL", "http://localhost:8000/v1"),
+        help="Model API base URL",
+    )
+
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=os.getenv("PHONE_AGENT_MODEL", "autoglm-phone-9b"),
+        help="Model name",
+    )
+
+    parser.add_argument(
+        "--apikey",
+        type=str,
+        default=os.getenv("PHONE_AGENT_API_KEY", "EMPTY"),
+        help="API key for model authentication",
+    )
+
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=int(os.getenv("PHONE_AGENT_MAX_STEPS", "100")),
+        help="Maximum steps per task",
+    )
+
+    parser.add_argument(
+        "--max-model-concurrency",
+        type=int,
+        default=int(os.getenv("PHONE_AGENT_MODEL_CONCURRENCY", "4")),
+        help="Maximum concurrent model requests across all devices (default: 4)",
+    )
+
+    # Device options
+    parser.add_argument(
+        "--device-type",
+        type=str,
+        choices=["adb", "hdc", "all"],
+        default="all",
+        help="Device types to use (default: all)",
+    )
+
+    parser.add_argument(
+        "--devices",
+        type=str,
+        help="Comma-separated device IDs to use (default: all online devices)",
+    )
+
+    # Output options
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default="fleet_results.jsonl",
+        help="JSONL file results are appended to (default: fleet_results.jsonl)",
+    )
+
+    parser.add_argument(
+        "--trajectory-db",
+        type=str,
+        help="SQLite file to record successful runs in and replay them from (default: off)",
+    )
+
+    parser.add_argument(
+        "--auto-confirm",
+        action="store_true",
+        help="Confirm sensitive actions automatically (default: decline)",
+    )
+
+    parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Print every agent step"
+    )
+
+    parser.add_argument(
+        "--lang",
+        type=str,
+        choices=["cn", "en"],
+        default=os.getenv("PHONE_AGENT_LANG", "cn"),
+        help="Language for system prompt (cn or en, default: cn)",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    tasks = load_tasks(args.tasks)
+    if not tasks:
+        print(f"No tasks in {args.tasks}")
+        sys.exit(1)
+
+    device_types = (
+        [DeviceType.ADB, DeviceType.HDC]
+        if args.device_type == "all"
+        else [DeviceType(args.device_type)]
+    )
+    device_ids = args.devices.split(",") if args.devices else None
+    devices = discover_devices(device_types, device_ids)
+    if not devices:
+        print("No devices connected.")
+        sys.exit(1)
+
+    print("=" * 50)
+    print("Phone Agent Fleet")
+    print("=" * 50)
+    print(f"Model: {args.model}")
+    print(f"Base URL: {args.base_url}")
+    print(f"Tasks: {len(tasks)}")
+    print(f"Devices: {len(devices)}")
+    for device in devices:
+        model_info = f" ({device.model})" if device.model else ""
+        print(f"  {device.device_id:<30} [{device.device_type.value}]{model_info}")
+    print(f"Model concurrency: {args.max_model_concurrency}")
+    if args.trajectory_db:
+        print(f"Trajectories: {args.trajectory_db}")
+    print(f"Results: {args.output}")
+    print("=" * 50)
+
+    runner = FleetRunner(
+        ModelConfig(
+            base_url=args.base_url,
+            model_name=args.model,
+            api_key=args.apikey,
+            lang=args.lang,
+        ),
+        devices,
+        max_model_concurrency=args.max_model_concurrency,
+        max_steps=args.max_steps,
+        lang=args.lang,
+        verbose=args.verbose,
+        results_path=args.output,
+        auto_confirm=args.auto_confirm,
+        trajectory_db=args.trajectory_db,
+    )
+
+    try:
+        results = runner.run(tasks)
+    except KeyboardInterrupt:
+        print("\n\nInterrupted.")
+        runner.stop()
+        sys.exit(130)
+
+    succeeded = sum(result.success for result in results)
+    print("=" * 50)
+    print(f"Done: {succeeded}/{len(results)} tasks succeeded")
+    saved = sum(result.model_calls_saved for result in results)
+    if saved:
+        print(f"Model calls saved by replay: {saved}")
+    stalled = [result for result in results if result.stalls]
+    if stalled:
+        steps_saved = sum(result.steps_saved for result in stalled)
+        print(f"Tasks stuck without progress: {len(stalled)} ({steps_saved} steps saved)")
+    sys.exit(0 if succeeded == len(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
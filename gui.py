@@ -120,9 +120,14 @@ import re
 
 # 导入任务精简器
 from task_simplifier import TaskSimplifierManager
+# 导入任务历史存储
+from task_history import TaskHistoryStore, OUTCOME_SUCCESS, OUTCOME_FAILED, OUTCOME_STOPPED
 
 
 class PhoneAgentGUI:
+    # 任务历史每页显示条数
+    HISTORY_PAGE_SIZE = 100
+
     def __init__(self, root):
         self.root = root
         self.root.title("私域新势力")
@@ -146,6 +151,7 @@ class PhoneAgentGUI:
         
         self.process = None
         self.running = False
+        self.agent = None  # 正在执行任务的代理，停止时中断其当前步骤
         self.config_file = "gui_config.json"
         
         # 设备相关变量
@@ -172,7 +178,11 @@ class PhoneAgentGUI:
         
         # 任务历史记录
         self.task_history_file = "task_history.json"
-        self.task_history = []
+        self.task_history_db = "task_history.db"
+        self.checkpoint_dir = "checkpoints"  # 运行检查点目录，用于"续跑"
+        self.trajectory_db = "trajectories.db"  # 成功任务的操作轨迹，相同任务再次执行时回放
+        self.task_history_store = None
+        self._current_run_id = None
         self.load_task_history()
         
         # 快速创建基础界面
@@ -775,6 +785,10 @@ class PhoneAgentGUI:
             self.pwd_button = ttk.Button(main_buttons, text="🔒 自动唤醒/解锁", command=self.open_lock_password_dialog)
             self.pwd_button.grid(row=0, column=2, padx=5)
             
+            # 从最近一次未完成运行的检查点继续执行
+            self.resume_button = ttk.Button(main_buttons, text="⏯️ 续跑", command=self.resume_last_run)
+            self.resume_button.grid(row=0, column=3, padx=5)
+            
             # 辅助功能按钮
             aux_buttons = ttk.Frame(button_frame)
             aux_buttons.pack(side=tk.LEFT)
@@ -892,7 +906,43 @@ class PhoneAgentGUI:
         self.time_var.set(current_time)
         self.root.after(1000, self.update_time)
         
-    def run_agent(self):
+    def resume_last_run(self):
+        """从最近一次未完成运行的检查点继续执行"""
+        if self.running:
+            return
+        
+        from phone_agent.checkpoint import latest_checkpoint
+        
+        checkpoint = latest_checkpoint(self.checkpoint_dir)
+        if checkpoint is None:
+            messagebox.showinfo("续跑", "没有可恢复的未完成任务")
+            return
+        
+        if self.device_type.get() == 'iOS':
+            messagebox.showerror("续跑", "iOS设备暂不支持续跑")
+            return
+        current_type = 'adb' if self.device_type.get() == '安卓' else 'hdc'
+        if checkpoint.device_type and checkpoint.device_type != current_type:
+            messagebox.showerror(
+                "续跑", f"检查点记录的设备类型为 {checkpoint.device_type.upper()}，请先切换设备类型")
+            return
+        
+        task_preview = checkpoint.task if len(checkpoint.task) <= 80 else checkpoint.task[:80] + "..."
+        updated = datetime.fromtimestamp(checkpoint.updated_at).strftime("%Y-%m-%d %H:%M:%S")
+        if not messagebox.askyesno(
+            "续跑",
+            f"任务: {task_preview}\n"
+            f"已执行步数: {checkpoint.step_count}\n"
+            f"设备: {checkpoint.device_id or '默认设备'}\n"
+            f"最后更新: {updated}\n\n是否从该位置继续执行？",
+        ):
+            return
+        
+        self.task_text.delete("1.0", tk.END)
+        self.task_text.insert("1.0", checkpoint.task)
+        self.run_agent(checkpoint=checkpoint)
+        
+    def run_agent(self, checkpoint=None):
         if self.running:
             return
             
@@ -900,7 +950,7 @@ class PhoneAgentGUI:
         base_url = self.base_url.get().strip()
         model = self.model.get().strip()
         apikey = self.apikey.get().strip()
-        task = self.task_text.get("1.0", tk.END).strip()
+        task = checkpoint.task if checkpoint else self.task_text.get("1.0", tk.END).strip()
         
         # 验证必要参数
         if not base_url:
@@ -923,11 +973,14 @@ class PhoneAgentGUI:
         self.status_var.set("🔄 正在执行任务...")
         self.clear_output()
         
-        # 添加任务到历史记录
-        self.add_task_to_history(task)
+        # 添加任务到历史记录，并记录本次执行
+        task_id = self.add_task_to_history(task)
+        self._start_history_run(task_id)
             
-        # 获取设备ID，优先使用环境变量，其次是用户选择
+        # 获取设备ID，续跑时使用检查点绑定的设备，否则优先使用环境变量，其次是用户选择
         selected_device = self.env_device_id or self.selected_device_id.get()
+        if checkpoint and checkpoint.device_id:
+            selected_device = checkpoint.device_id
         
         # 如果环境变量存在，输出提示信息
         if self.env_device_id:
@@ -944,7 +997,7 @@ class PhoneAgentGUI:
             self._run_ios_agent(base_url, model, apikey, task)
         else:
             # 异步执行系统检查，避免阻塞界面
-            self._run_agent_async(base_url, model, apikey, task, selected_device)
+            self._run_agent_async(base_url, model, apikey, task, selected_device, checkpoint)
         
     def _run_adb_silent(self, cmd, timeout=10):
         """静默执行ADB命令，避免弹窗"""
@@ -1081,6 +1134,7 @@ class PhoneAgentGUI:
 
     def _on_process_finished(self, return_code):
         """处理进程结束"""
+        self._finish_history_run(return_code)
         self.running = False
         self.run_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
@@ -1092,7 +1146,7 @@ class PhoneAgentGUI:
             self.status_var.set("⚠️ 任务执行结束")
             self._append_output(f"\n⚠️ 任务执行结束，返回码: {return_code}\n")
 
-    def _run_agent_async(self, base_url, model, apikey, task, selected_device):
+    def _run_agent_async(self, base_url, model, apikey, task, selected_device, checkpoint=None):
         """异步执行代理，避免阻塞界面"""
         import threading
         import time
@@ -1119,7 +1173,7 @@ class PhoneAgentGUI:
                         "✅ 设备已唤醒或已解锁\n" if ok else "⚠️ 无法唤醒设备，继续尝试运行\n"))
                 
                 # 2. 在主线程中调用同步的运行函数
-                self.root.after(0, lambda: self._run_agent_direct(base_url, model, apikey, task, selected_device))
+                self.root.after(0, lambda: self._run_agent_direct(base_url, model, apikey, task, selected_device, checkpoint))
                 
             except Exception as e:
                 self.root.after(0, lambda: self._append_output(f"❌ 准备失败: {str(e)}\n"))
@@ -1129,12 +1183,12 @@ class PhoneAgentGUI:
         thread = threading.Thread(target=prepare_and_run, daemon=True)
         thread.start()
 
-    def _run_agent_direct(self, base_url, model, apikey, task, selected_device):
+    def _run_agent_direct(self, base_url, model, apikey, task, selected_device, checkpoint=None):
         """直接运行代理（打包环境）"""
         # 导入必要模块
         from phone_agent.agent import PhoneAgent, AgentConfig
         from phone_agent.model import ModelConfig
-        from phone_agent.device_factory import DeviceType, set_device_type
+        from phone_agent.device_factory import DeviceFactory, DeviceType
         # 从main.py导入检查函数
         import main
         
@@ -1156,7 +1210,6 @@ class PhoneAgentGUI:
             else:
                 device_type = DeviceType.HDC
                 device_type_str = "hdc"
-            set_device_type(device_type)
             safe_output(f"🔗 设备类型: {device_type_str.upper()}\n")
             
             # 解析设备ID（必须在检查系统要求之前）
@@ -1243,15 +1296,23 @@ class PhoneAgentGUI:
             agent_config = AgentConfig(
                 device_id=device_id,
                 verbose=True,
-                max_steps=int(self.max_steps.get() or os.getenv("PHONE_AGENT_MAX_STEPS", "200"))  # 优先使用GUI设置
+                max_steps=int(self.max_steps.get() or os.getenv("PHONE_AGENT_MAX_STEPS", "200")),  # 优先使用GUI设置
+                checkpoint_dir=self.checkpoint_dir,  # 每步追加写入检查点，崩溃或重启后可续跑
+                trajectory_db=self.trajectory_db  # 屏幕匹配时回放已记录的操作，跳过模型调用
             )
             
             # 创建并运行PhoneAgent
             safe_output("🚀 开始执行任务...\n")
+            # 每个代理绑定自己的设备工厂，不在工作线程中修改全局设备类型
             agent = PhoneAgent(
                 model_config=model_config,
-                agent_config=agent_config
+                agent_config=agent_config,
+                device_factory=DeviceFactory(device_type, device_id)
             )
+            if checkpoint:
+                agent.restore(checkpoint)
+                safe_output(f"⏯️ 从检查点续跑: 已完成 {checkpoint.step_count} 步\n")
+            self.agent = agent
             
             # 设置ADB/HDC路径（如果需要）
             device_tool_name = "HDC" if device_type_str == 'hdc' else "ADB"
@@ -1317,18 +1378,21 @@ class PhoneAgentGUI:
                         if not self.running:
                             safe_output("🛑 任务被用户停止\n")
                             return
-                            
-                        result = agent.step(task)
-                        safe_output(f"📊 步骤 1: {result.message}\n")
                         
-                        if result.finished:
-                            safe_output("✅ 任务提前完成\n")
-                            sys.stdout = original_stdout
-                            self.root.after(0, self._process_finished, 0)
-                            return
+                        # 最后一步的结果，决定记录为成功还是失败
+                        result = None
+                        if not checkpoint:
+                            result = agent.step(task)
+                            safe_output(f"📊 步骤 1: {result.message}\n")
+                            
+                            if result.finished:
+                                safe_output("✅ 任务提前完成\n" if result.success else "❌ 任务未成功结束\n")
+                                sys.stdout = original_stdout
+                                self.root.after(0, self._process_finished, 0 if result.success else 1)
+                                return
                         
-                        # 继续执行步骤
-                        step_count = 2
+                        # 继续执行步骤（续跑时从检查点的下一步开始）
+                        step_count = agent.step_count + 1
                         while self.running and step_count <= agent_config.max_steps:
                             if not self.running:
                                 safe_output("🛑 任务被用户停止\n")
@@ -1338,7 +1402,7 @@ class PhoneAgentGUI:
                             safe_output(f"📊 步骤 {step_count}: {result.message}\n")
                             
                             if result.finished:
-                                safe_output("✅ 任务执行完成\n")
+                                safe_output("✅ 任务执行完成\n" if result.success else "❌ 任务未成功结束\n")
                                 break
                                 
                             step_count += 1
@@ -1350,10 +1414,13 @@ class PhoneAgentGUI:
                         # 恢复原始输出
                         sys.stdout = original_stdout
                         
-                    if self.running:
+                    if not self.running:
+                        self.root.after(0, lambda: self._process_finished(-2))  # 自定义停止代码
+                    elif result is not None and result.finished and result.success:
                         self.root.after(0, self._process_finished, 0)
                     else:
-                        self.root.after(0, lambda: self._process_finished(-2))  # 自定义停止代码
+                        # 模型错误、卡住中止、设备超时或达到最大步数：记录为失败
+                        self.root.after(0, self._process_finished, 1)
                     
                 except Exception as e:
                     safe_output(f"❌ 任务执行出错: {str(e)}\n")
@@ -1833,6 +1900,7 @@ class PhoneAgentGUI:
             return False
         
     def _process_finished(self, return_code):
+        self._finish_history_run(return_code)
         self.running = False
         self.run_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
@@ -1857,8 +1925,10 @@ class PhoneAgentGUI:
                 self.running = False  # 设置停止标志
                 self._append_output("🛑 正在停止任务...\n")
                 
-                # 由于直接调用方式没有进程可以终止，只能通过标志位停止
-                # 实际的停止会在下一次循环检查时生效
+                # 中断当前步骤：正在执行的设备命令会被立即终止，
+                # 模型请求则在返回后结束，循环随后检查标志位退出
+                if self.agent is not None:
+                    self.agent.stop()
                 
                 # 立即更新UI状态
                 self.run_button.config(state=tk.NORMAL)
@@ -4054,10 +4124,10 @@ class PhoneAgentGUI:
         main_container.pack(fill=tk.BOTH, expand=True)
         
         # 绑定ESC键关闭窗口
-        dialog.bind('<Escape>', lambda e: (save_platform_selection(), dialog.destroy()))
+        dialog.bind('<Escape>', lambda e: (save_platform_selection(), cancel_pending(), dialog.destroy()))
         
-        # 窗口关闭时保存选择
-        dialog.protocol("WM_DELETE_WINDOW", lambda: (save_platform_selection(), dialog.destroy()))
+        # 窗口关闭时保存选择，并中止进行中的润色请求
+        dialog.protocol("WM_DELETE_WINDOW", lambda: (save_platform_selection(), cancel_pending(), dialog.destroy()))
         
         # 创建笔记本控件用于分页，无边距
         notebook = ttk.Notebook(main_container)
@@ -4094,13 +4164,20 @@ class PhoneAgentGUI:
             "tongyi": "通义千问"
         }
         
+        # 竞速模式：同时使用所有已配置平台，返回首个合格结果
+        race_platform = "race"
+        race_display = "⚡ 多平台竞速"
+        
         # 反向映射（从显示名称到实际值）
         display_to_platform = {v: k for k, v in platform_display_map.items()}
+        display_to_platform[race_display] = race_platform
         
         # 获取显示名称列表
         display_values = [platform_display_map.get(p, p) for p in ["deepseek", "doubao", "yuanbao", "openai", "gemini", "claude", "glm", "wenxin", "tongyi"]]
+        display_values.append(race_display)
         
-        platform_var_display = tk.StringVar(value=platform_display_map.get(last_platform, last_platform))
+        platform_var_display = tk.StringVar(
+            value=race_display if last_platform == race_platform else platform_display_map.get(last_platform, last_platform))
         platform_combo = ttk.Combobox(platform_frame, textvariable=platform_var_display, 
                                       values=display_values,
                                       state="readonly", width=15)
@@ -4121,8 +4198,9 @@ class PhoneAgentGUI:
             # 更新配置页面显示为当前选择的平台
             selected_display = platform_var_display.get()
             selected_platform = display_to_platform.get(selected_display, selected_display)
-            config_platform_var_display.set(selected_display)
-            update_config_display()
+            if selected_platform != race_platform:
+                config_platform_var_display.set(selected_display)
+                update_config_display()
         
         config_btn = ttk.Button(platform_frame, text="⚙️ API配置", 
                                command=jump_to_config)
@@ -4166,66 +4244,144 @@ class PhoneAgentGUI:
         status_label = ttk.Label(button_frame, textvariable=status_var)
         status_label.pack(side=tk.LEFT)
         
+        # 强制刷新：忽略缓存重新调用AI平台
+        force_refresh_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="强制刷新", variable=force_refresh_var).pack(side=tk.LEFT, padx=(10, 0))
+        
+        # 进行中的润色请求（流式输出时可提前采用并取消）
+        pending = {"future": None}
+        
+        def cancel_pending():
+            """取消进行中的润色请求"""
+            future = pending["future"]
+            pending["future"] = None
+            if future is not None and not future.done():
+                future.cancel()
+                return True
+            return False
+        
         def start_simplify():
             """开始润色任务"""
-            def simplify_worker():
+            cancel_pending()
+            started_at = time.time()
+            stream_state = {"received": False}
+            
+            def append_delta(delta):
+                """在主线程中追加流式输出的文本"""
+                if pending["future"] is not future:
+                    return
+                if not stream_state["received"]:
+                    stream_state["received"] = True
+                    result_text.delete("1.0", tk.END)
+                    status_var.set(f"✍️ 正在生成（首字 {time.time() - started_at:.2f}秒），可随时应用结果")
+                result_text.insert(tk.END, delta)
+                result_text.see(tk.END)
+            
+            def on_delta(delta):
+                """流式输出回调（在精简器事件循环线程中执行）"""
                 try:
-                    # 在主线程中更新状态
-                    selected_display = platform_var_display.get()
-                    platform = display_to_platform.get(selected_display, selected_display)
-                    dialog.after(0, lambda: status_var.set(f"🔍 检查{selected_display}平台配置..."))
-                    
-                    # 检查是否有配置
-                    if not self.task_simplifier.get_provider_status().get(platform, False):
-                        dialog.after(0, lambda: status_var.set("⚠️ 配置未完成"))
-                        dialog.after(0, lambda: messagebox.showwarning(
-                            "配置提示", 
-                            f"🔧 {selected_display}平台未配置\n\n请先在API配置页面设置：\n• API密钥\n• 接口地址\n• 模型名称\n\n配置完成后重试润色"
-                        ))
-                        dialog.after(0, lambda: status_var.set("❌ 配置未完成"))
-                        return
-                    
-                    dialog.after(0, lambda: status_var.set(f"🤖 使用{selected_display}润色任务..."))
+                    dialog.after(0, lambda: append_delta(delta))
+                except (tk.TclError, RuntimeError):
+                    pass  # 对话框已关闭
+            
+            def handle_result(result):
+                """在主线程中处理润色结果"""
+                if pending["future"] is not future:
+                    return  # 已提前采用或重新开始
+                pending["future"] = None
+                if result.get("success"):
+                    simplified = result.get("simplified_task", current_task)
+                    result_text.delete("1.0", tk.END)
+                    result_text.insert("1.0", simplified)
+                    if result.get("cached"):
+                        hit = "相似任务缓存" if result.get("cache_match") == "similar" else "缓存"
+                        status_var.set(f"⚡ 命中{hit}（{result.get('cached_at', '')}），可勾选强制刷新重新润色")
+                    elif platform == race_platform:
+                        winner = platform_display_map.get(result.get("provider"), result.get("provider", ""))
+                        status_var.set(f"✅ 润色完成（{winner}，{result.get('latency', 0):.1f}秒）")
+                    elif result.get("time_to_first_token") is not None:
+                        status_var.set(f"✅ 润色完成（首字 {result['time_to_first_token']:.2f}秒，"
+                                       f"总耗时 {time.time() - started_at:.2f}秒）")
+                    else:
+                        status_var.set("✅ 润色完成")
+                else:
+                    error = result.get("error", "未知错误")
+                    provider = result.get("provider", platform)
+                    field = result.get("field", "unknown")
                     
-                    # 使用任务润色器
-                    result = self.task_simplifier.simplify_task(current_task, platform)
+                    # 使用友好的错误提示
+                    friendly_error = self._parse_simplify_error(error)
                     
-                    if result.get("success"):
-                        simplified = result.get("simplified_task", current_task)
-                        dialog.after(0, lambda: result_text.delete("1.0", tk.END))
-                        dialog.after(0, lambda: result_text.insert("1.0", simplified))
-                        dialog.after(0, lambda: status_var.set("✅ 润色完成"))
+                    # 如果是特定字段错误，提供更具体的指导
+                    if field != "unknown":
+                        field_guide = self._get_field_specific_guide(field, provider)
+                        full_error = friendly_error + "\n\n" + field_guide
                     else:
-                        error = result.get("error", "未知错误")
-                        provider = result.get("provider", platform_var.get())
-                        field = result.get("field", "unknown")
-                        
-                        # 使用友好的错误提示
-                        friendly_error = self._parse_simplify_error(error)
-                        
-                        # 如果是特定字段错误，提供更具体的指导
-                        if field != "unknown":
-                            field_guide = self._get_field_specific_guide(field, provider)
-                            full_error = friendly_error + "\n\n" + field_guide
-                        else:
-                            full_error = friendly_error
-                        
-                        dialog.after(0, lambda: messagebox.showerror("润色失败", full_error))
-                        dialog.after(0, lambda: status_var.set("❌ 润色失败"))
-                
-                except Exception as e:
-                    # 解析错误信息并提供友好的中文提示
-                    error_msg = self._parse_simplify_error(str(e))
-                    dialog.after(0, lambda: messagebox.showerror("润色失败", error_msg))
-                    dialog.after(0, lambda: status_var.set("❌ 润色失败"))
+                        full_error = friendly_error
+                    
+                    messagebox.showerror("润色失败", full_error)
+                    status_var.set("❌ 润色失败")
+            
+            def handle_error(error):
+                if pending["future"] is not future:
+                    return
+                pending["future"] = None
+                # 解析错误信息并提供友好的中文提示
+                messagebox.showerror("润色失败", self._parse_simplify_error(str(error)))
+                status_var.set("❌ 润色失败")
+            
+            def on_done(done_future):
+                """润色完成回调（在精简器事件循环线程中执行）"""
+                if done_future.cancelled():
+                    return
+                try:
+                    try:
+                        result = done_future.result()
+                    except Exception as e:
+                        dialog.after(0, lambda err=e: handle_error(err))
+                        return
+                    dialog.after(0, lambda: handle_result(result))
+                except (tk.TclError, RuntimeError):
+                    pass  # 对话框已关闭
+            
+            selected_display = platform_var_display.get()
+            platform = display_to_platform.get(selected_display, selected_display)
+            status_var.set(f"🔍 检查{selected_display}平台配置...")
+            
+            # 竞速模式需要至少一个已配置平台
+            if platform == race_platform:
+                if not self.task_simplifier.get_available_providers():
+                    messagebox.showwarning("配置提示", "🔧 尚未配置任何AI平台\n\n请先在API配置页面设置至少一个平台")
+                    status_var.set("❌ 配置未完成")
+                    return
+            # 检查是否有配置
+            elif not self.task_simplifier.get_provider_status().get(platform, False):
+                messagebox.showwarning(
+                    "配置提示", 
+                    f"🔧 {selected_display}平台未配置\n\n请先在API配置页面设置：\n• API密钥\n• 接口地址\n• 模型名称\n\n配置完成后重试润色"
+                )
+                status_var.set("❌ 配置未完成")
+                return
+            
+            status_var.set(f"🤖 使用{selected_display}润色任务...")
             
-            # 在后台线程中执行润色
-            threading.Thread(target=simplify_worker, daemon=True).start()
+            # 提交到精简器的常驻事件循环，复用已建立的连接，不阻塞界面
+            try:
+                future = self.task_simplifier.submit_simplify(
+                    current_task, None if platform == race_platform else platform,
+                    force_refresh=force_refresh_var.get(), on_delta=on_delta)
+            except Exception as e:
+                messagebox.showerror("润色失败", self._parse_simplify_error(str(e)))
+                status_var.set("❌ 润色失败")
+                return
+            pending["future"] = future
+            future.add_done_callback(on_done)
         
         def apply_result():
-            """应用润色结果到主界面"""
+            """应用润色结果到主界面（流式输出中途应用时采用已生成的部分并中止请求）"""
             simplified = result_text.get("1.0", tk.END).strip()
             if simplified:
+                cancel_pending()
                 self.task_text.delete("1.0", tk.END)
                 self.task_text.insert("1.0", simplified)
                 self.task.set(simplified)
@@ -4259,9 +4415,10 @@ class PhoneAgentGUI:
                  font=('Microsoft YaHei', 9, 'bold')).pack(side=tk.LEFT, padx=(0, 10))
         
         # API配置页面的平台选择也使用中文显示
-        config_platform_var_display = tk.StringVar(value=platform_display_map.get(last_platform, last_platform))
+        config_platform = "deepseek" if last_platform == race_platform else last_platform
+        config_platform_var_display = tk.StringVar(value=platform_display_map.get(config_platform, config_platform))
         config_platform_combo = ttk.Combobox(platform_select_frame, textvariable=config_platform_var_display, 
-                                           values=display_values,
+                                           values=[v for v in display_values if v != race_display],
                                            state="readonly", width=15)
         config_platform_combo.pack(side=tk.LEFT, padx=(0, 10))
         def on_config_platform_change():
@@ -5078,8 +5235,11 @@ class PhoneAgentGUI:
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(config, f, ensure_ascii=False, indent=2)
             
-            # 保存任务历史记录
+            # 关闭任务历史数据库
             self.save_task_history()
+            
+            # 关闭精简器连接
+            self.task_simplifier.close()
                 
         except Exception:
             pass  # 静默忽略错误，确保程序能正常关闭
@@ -5130,97 +5290,110 @@ class PhoneAgentGUI:
 
 
     def load_task_history(self):
-        """加载任务历史记录"""
+        """打开任务历史数据库（首次使用时自动迁移旧版JSON历史）"""
         try:
-            if os.path.exists(self.task_history_file):
-                with open(self.task_history_file, 'r', encoding='utf-8') as f:
-                    self.task_history = json.load(f)
+            self.task_history_store = TaskHistoryStore(self.task_history_db, self.task_history_file)
         except Exception as e:
             print(f"加载任务历史失败: {e}")
-            self.task_history = []
+            self.task_history_store = None
     
     def save_task_history(self):
-        """保存任务历史记录"""
+        """结束未完成的执行记录并关闭任务历史数据库"""
+        if not self.task_history_store:
+            return
         try:
-            with open(self.task_history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.task_history, f, ensure_ascii=False, indent=2)
+            self._finish_history_run(-2)
+            self.task_history_store.close()
         except Exception as e:
             print(f"保存任务历史失败: {e}")
     
     def add_task_to_history(self, task):
-        """添加任务到历史记录"""
+        """添加任务到历史记录，返回任务ID"""
+        if not self.task_history_store:
+            return None
         try:
-            # 规范化任务文本，去除多余空白
-            normalized = ' '.join(task.split()) if isinstance(task, str) else str(task)
-            if not normalized:
-                return
-
-            # 如果历史不为空，检查最近一条是否与当前相同（避免重复添加）
-            if self.task_history:
-                try:
-                    last_task = self.task_history[0].get('task', '')
-                    last_norm = ' '.join(last_task.split()) if isinstance(last_task, str) else str(last_task)
-                    if last_norm == normalized:
-                        return
-                except Exception:
-                    pass
-
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            task_record = {
-                'task': normalized,
-                'timestamp': current_time,
-                'id': len(self.task_history) + 1
-            }
-
-            # 添加到历史记录开头
-            self.task_history.insert(0, task_record)
-            
-            # 保持历史记录不超过50条
-            if len(self.task_history) > 50:
-                self.task_history = self.task_history[:50]
-            
-            self.save_task_history()
-            
+            return self.task_history_store.add_task(task)
         except Exception as e:
             print(f"添加任务历史失败: {e}")
+            return None
+    
+    def _start_history_run(self, task_id):
+        """记录任务开始执行"""
+        self._current_run_id = None
+        if not self.task_history_store or task_id is None:
+            return
+        try:
+            self._current_run_id = self.task_history_store.start_run(task_id)
+        except Exception as e:
+            print(f"记录任务执行失败: {e}")
+    
+    def _finish_history_run(self, return_code):
+        """记录任务执行结果和耗时"""
+        run_id = self._current_run_id
+        self._current_run_id = None
+        if not self.task_history_store or run_id is None:
+            return
+        if return_code == 0:
+            outcome = OUTCOME_SUCCESS
+        elif return_code == -2:
+            outcome = OUTCOME_STOPPED
+        else:
+            outcome = OUTCOME_FAILED
+        try:
+            self.task_history_store.finish_run(run_id, outcome)
+        except Exception as e:
+            print(f"记录任务结果失败: {e}")
     
     def show_task_history(self):
         """显示任务历史窗口"""
+        if not self.task_history_store:
+            messagebox.showerror("错误", "任务历史数据库不可用")
+            return
+        
         # 使用优化的居中窗口创建方法
-        history_window = self.create_centered_toplevel(self.root, "📚 任务历史记录", 900, 550)
+        history_window = self.create_centered_toplevel(self.root, "📚 任务历史记录", 900, 580)
         history_window.transient(self.root)
         history_window.grab_set()
         
         # 居中显示窗口
         self.center_window(history_window)
         
- # 主框架
+        # 主框架
         main_frame = ttk.Frame(history_window, padding="15")
         main_frame.pack(fill=tk.BOTH, expand=True)
         
-        # 标题
+        # 标题和搜索框
         title_frame = ttk.Frame(main_frame)
         title_frame.pack(fill=tk.X, pady=(0, 10))
         
         ttk.Label(title_frame, text="📚 任务历史记录", 
                  font=('Microsoft YaHei', 14, 'bold')).pack(side=tk.LEFT)
         
+        search_var = tk.StringVar()
+        search_entry = ttk.Entry(title_frame, textvariable=search_var, width=30)
+        search_entry.pack(side=tk.RIGHT)
+        ttk.Label(title_frame, text="🔍 搜索:").pack(side=tk.RIGHT, padx=(0, 5))
+        
         # 创建表格框架来包含tree和滚动条
         table_frame = ttk.Frame(main_frame)
         table_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
         
         # 创建Treeview显示历史记录，启用多选
-        columns = ('时间', '任务')
+        columns = ('时间', '次数', '结果', '任务')
         tree = ttk.Treeview(table_frame, columns=columns, show='tree headings', height=12, selectmode='extended')
         
         # 设置列标题和宽度
         tree.heading('#0', text='')
-        tree.heading('时间', text='执行时间')
+        tree.heading('时间', text='最近执行')
+        tree.heading('次数', text='次数')
+        tree.heading('结果', text='上次结果')
         tree.heading('任务', text='任务内容')
         
         tree.column('#0', width=0, stretch='NO')  # 隐藏树形列
         tree.column('时间', width=150, anchor='center')
-        tree.column('任务', width=650, anchor='w')
+        tree.column('次数', width=50, anchor='center')
+        tree.column('结果', width=90, anchor='center')
+        tree.column('任务', width=510, anchor='w')
         
         # 添加滚动条
         scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
@@ -5229,18 +5402,25 @@ class PhoneAgentGUI:
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # 分页状态
+        tree.page = 0
+        tree.query = ""
+        page_var = tk.StringVar()
+        tree.page_var = page_var
+        
         # 填充数据
-        for record in self.task_history:
-            # 显示完整的任务内容，仅在表格中适当截断用于显示
-            task_content = record.get('task', '')
-            display_task = task_content
-            if len(display_task) > 100:
-                display_task = display_task[:97] + "..."
-            
-            tree.insert('', 'end', values=(
-                record.get('timestamp', ''),
-                display_task
-            ))
+        self._refresh_history_tree(tree)
+        
+        def on_search(*_):
+            tree.query = search_var.get().strip()
+            tree.page = 0
+            self._refresh_history_tree(tree)
+        
+        def change_page(delta):
+            tree.page = max(0, tree.page + delta)
+            self._refresh_history_tree(tree)
+        
+        search_entry.bind('<KeyRelease>', on_search)
         
         # 绑定双击事件
         tree.bind('<Double-1>', lambda e: self.use_task_from_history(history_window, tree))
@@ -5252,8 +5432,15 @@ class PhoneAgentGUI:
         bottom_frame = ttk.Frame(main_frame)
         bottom_frame.pack(fill=tk.X, pady=(10, 0))
         
+        # 分页控制
+        page_frame = ttk.Frame(bottom_frame)
+        page_frame.pack(pady=(0, 5))
+        ttk.Button(page_frame, text="◀ 上一页", command=lambda: change_page(-1)).pack(side=tk.LEFT, padx=5)
+        ttk.Label(page_frame, textvariable=page_var).pack(side=tk.LEFT, padx=10)
+        ttk.Button(page_frame, text="下一页 ▶", command=lambda: change_page(1)).pack(side=tk.LEFT, padx=5)
+        
         # 说明文字
-        ttk.Label(bottom_frame, text="提示：Ctrl+点击可多选 | 双击可快速使用 | ESC关闭窗口", 
+        ttk.Label(bottom_frame, text="提示：Ctrl+点击可多选 | 双击可快速使用 | 输入关键词即可搜索 | ESC关闭窗口", 
                  font=('Microsoft YaHei', 8), foreground='gray').pack(pady=(0, 10))
         
         # 操作按钮放在底部中间
@@ -5276,6 +5463,45 @@ class PhoneAgentGUI:
         ttk.Button(buttons_container, text="⚡ 删除重复项", 
               command=lambda: self.remove_duplicate_tasks(history_window, tree)).pack(side=tk.LEFT, padx=10)
     
+    def _refresh_history_tree(self, tree):
+        """按当前页码和搜索词分页查询并刷新历史表格"""
+        page_size = self.HISTORY_PAGE_SIZE
+        total = self.task_history_store.count_tasks(tree.query)
+        pages = max(1, (total + page_size - 1) // page_size)
+        tree.page = min(tree.page, pages - 1)
+        
+        records = self.task_history_store.list_tasks(tree.query, limit=page_size, offset=tree.page * page_size)
+        
+        for item in tree.get_children():
+            tree.delete(item)
+        
+        outcome_labels = {
+            OUTCOME_SUCCESS: "✅ 成功",
+            OUTCOME_FAILED: "❌ 失败",
+            OUTCOME_STOPPED: "🛑 停止",
+            "running": "🔄 执行中",
+        }
+        for record in records:
+            # 显示完整的任务内容，仅在表格中适当截断用于显示
+            task_content = record.get('task', '')
+            display_task = task_content
+            if len(display_task) > 100:
+                display_task = display_task[:97] + "..."
+            
+            outcome = outcome_labels.get(record.get('last_outcome'), '')
+            if outcome and record.get('last_duration') is not None:
+                outcome += f" {record['last_duration']:.0f}s"
+            
+            # 使用任务ID作为表格项ID，便于精确定位记录
+            tree.insert('', 'end', iid=str(record['id']), values=(
+                record.get('last_used_at', ''),
+                record.get('use_count', 1),
+                outcome,
+                display_task
+            ))
+        
+        tree.page_var.set(f"第 {tree.page + 1}/{pages} 页，共 {total} 条")
+    
     def use_task_from_history(self, history_window, tree):
         """从历史记录中使用任务"""
         selected_item = tree.selection()
@@ -5283,25 +5509,20 @@ class PhoneAgentGUI:
             messagebox.showwarning("提示", "请先选择一个任务记录")
             return
         
-        item = selected_item[0]
-        values = tree.item(item, 'values')
+        record = self.task_history_store.get_task(int(selected_item[0]))
+        if not record:
+            return
         
-        # 根据时间和任务内容查找对应的完整任务记录
-        timestamp = values[0]
-        task_display = values[1]
-        for record in self.task_history:
-            if record.get('timestamp') == timestamp and record.get('task', '').startswith(task_display.replace('...', '')):
-                # 将完整的任务内容填充到任务输入框
-                full_task = record.get('task', '')
-                self.task_text.delete("1.0", tk.END)
-                self.task_text.insert("1.0", full_task)
-                self.task.set(full_task)
-                
-                # 关闭历史记录窗口
-                history_window.destroy()
-                
-                self.status_var.set("✅ 已加载历史任务")
-                break
+        # 将完整的任务内容填充到任务输入框
+        full_task = record.get('task', '')
+        self.task_text.delete("1.0", tk.END)
+        self.task_text.insert("1.0", full_task)
+        self.task.set(full_task)
+        
+        # 关闭历史记录窗口
+        history_window.destroy()
+        
+        self.status_var.set("✅ 已加载历史任务")
     
     def delete_selected_tasks(self, history_window, tree):
         """删除选中的任务历史记录（支持单条和多条）"""
@@ -5317,82 +5538,42 @@ class PhoneAgentGUI:
             message = f"确定要删除选中的 {count} 条任务记录吗？"
         
         if messagebox.askyesno("确认", message):
-            # 获取要删除的任务
-            tasks_to_delete = []
-            for item in selected_items:
-                values = tree.item(item, 'values')
-                timestamp = values[0]
-                task_display = values[1]
-                tasks_to_delete.append((timestamp, task_display))
-            
-            # 从历史记录中删除
-            for timestamp, task_display in tasks_to_delete:
-                self.task_history = [r for r in self.task_history 
-                                   if not (r.get('timestamp') == timestamp and 
-                                          r.get('task', '').startswith(task_display.replace('...', '')))]
-            self.save_task_history()
+            self.task_history_store.delete_tasks([int(item) for item in selected_items])
             
             # 刷新树形视图
-            for item in selected_items:
-                tree.delete(item)
+            self._refresh_history_tree(tree)
             
             self.status_var.set(f"✅ 已删除 {count} 条任务记录")
 
     def remove_duplicate_tasks(self, history_window, tree):
         """移除任务历史中的重复项，保留每个任务的第一条记录。"""
-        if not self.task_history:
+        if not self.task_history_store.count_tasks():
             messagebox.showinfo("提示", "历史记录为空，无重复项可删")
             return
 
-        # 使用规范化文本作为判重依据
-        seen = set()
-        new_history = []
-        removed = 0
-        for record in self.task_history:
-            task_text = record.get('task', '')
-            norm = ' '.join(task_text.split()) if isinstance(task_text, str) else str(task_text)
-            if norm in seen:
-                removed += 1
-                continue
-            seen.add(norm)
-            # 先加入保留列表
-            new_history.append(record)
-
+        removed = self.task_history_store.remove_duplicates()
         if removed == 0:
             messagebox.showinfo("提示", "未发现重复记录")
             return
 
-        # 重新分配ID并保存
-        for idx, rec in enumerate(new_history, start=1):
-            rec['id'] = idx
-
-        self.task_history = new_history
-        self.save_task_history()
-
         # 刷新树视图
-        for item in tree.get_children():
-            tree.delete(item)
-        for record in self.task_history:
-            task_content = record.get('task', '')
-            display_task = task_content if len(task_content) <= 100 else task_content[:97] + '...'
-            tree.insert('', 'end', values=(record.get('timestamp', ''), display_task))
+        self._refresh_history_tree(tree)
 
         self.status_var.set(f"✅ 已删除 {removed} 条重复记录")
     
 
     def clear_all_tasks(self, history_window, tree):
         """清空所有任务历史记录"""
-        if not self.task_history:
+        total = self.task_history_store.count_tasks()
+        if not total:
             messagebox.showinfo("提示", "历史记录已经是空的")
             return
         
-        if messagebox.askyesno("确认", f"确定要清空所有 {len(self.task_history)} 条任务历史记录吗？此操作不可恢复！"):
-            self.task_history = []
-            self.save_task_history()
+        if messagebox.askyesno("确认", f"确定要清空所有 {total} 条任务历史记录吗？此操作不可恢复！"):
+            self.task_history_store.clear()
             
             # 清空树形视图
-            for item in tree.get_children():
-                tree.delete(item)
+            self._refresh_history_tree(tree)
             
             self.status_var.set("✅ 已清空所有历史记录")
     
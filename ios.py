@@ -325,6 +325,13 @@ Examples:
         help="WebDriverAgent URL (default: http://localhost:8100)",
     )
 
+    parser.add_argument(
+        "--mjpeg-url",
+        type=str,
+        default=os.getenv("PHONE_AGENT_MJPEG_URL"),
+        help="WDA MJPEG server URL for streamed screenshots (e.g. http://localhost:9100)",
+    )
+
     parser.add_argument(
         "--list-devices", action="store_true", help="List connected iOS devices and exit"
     )
@@ -483,6 +490,7 @@ def main():
         max_steps=args.max_steps,
         wda_url=args.wda_url,
         device_id=args.device_id,
+        mjpeg_url=args.mjpeg_url,
         verbose=not args.quiet,
         lang=args.lang,
     )
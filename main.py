@@ -28,7 +28,12 @@ from phone_agent.agent_ios import IOSAgentConfig, IOSPhoneAgent
 from phone_agent.config.apps import list_supported_apps
 from phone_agent.config.apps_harmonyos import list_supported_apps as list_harmonyos_apps
 from phone_agent.config.apps_ios import list_supported_apps as list_ios_apps
-from phone_agent.device_factory import DeviceType, get_device_factory, set_device_type
+from phone_agent.device_factory import (
+    DeviceFactory,
+    DeviceType,
+    get_device_factory,
+    set_device_type,
+)
 from phone_agent.model import ModelConfig
 from phone_agent.xctest import XCTestConnection
 from phone_agent.xctest import list_devices as list_ios_devices
@@ -506,6 +511,34 @@ Examples:
         help="Language for system prompt (cn or en, default: cn)",
     )
 
+    parser.add_argument(
+        "--stuck-policy",
+        type=str,
+        choices=["off", "hint", "takeover", "abort"],
+        default=os.getenv("PHONE_AGENT_STUCK_POLICY", "hint"),
+        help="What to do when the agent stops making progress: hint the model, "
+        "then hand over to a person (takeover) or stop (abort) (default: hint)",
+    )
+
+    parser.add_argument(
+        "--ui-tree",
+        action="store_true",
+        help="Send the compacted UI hierarchy (diffed per step) to the model with each screenshot",
+    )
+
+    parser.add_argument(
+        "--snap-taps",
+        action="store_true",
+        help="Move taps that land near a UI element to the element's center",
+    )
+
+    parser.add_argument(
+        "--verify-taps",
+        action="store_true",
+        help="Check that each tap changed the screen and repeat it once if not "
+        "(never for checkable elements; Android/HarmonyOS only)",
+    )
+
     parser.add_argument(
         "--device-type",
         type=str,
@@ -760,6 +793,8 @@ def main():
             device_id=args.device_id,
             verbose=not args.quiet,
             lang=args.lang,
+            ui_tree=args.ui_tree,
+            snap_taps=args.snap_taps,
         )
 
         agent = IOSPhoneAgent(
@@ -773,11 +808,16 @@ def main():
             device_id=args.device_id,
             verbose=not args.quiet,
             lang=args.lang,
+            stuck_policy=args.stuck_policy,
+            ui_tree=args.ui_tree,
+            snap_taps=args.snap_taps,
+            verify_taps=args.verify_taps,
         )
 
         agent = PhoneAgent(
             model_config=model_config,
             agent_config=agent_config,
+            device_factory=DeviceFactory(device_type, args.device_id),
         )
 
     # Print header
@@ -2,13 +2,15 @@
 
 import ast
 import re
-import subprocess
 import time
 from dataclasses import dataclass
 from typing import Any, Callable
 
+from phone_agent.actions import verify
+from phone_agent.app_index import get_app_index
 from phone_agent.config.timing import TIMING_CONFIG
-from phone_agent.device_factory import get_device_factory
+from phone_agent.deadline import DeviceTimeoutError, pause_deadline, run_command
+from phone_agent.device_factory import DeviceFactory, get_device_factory
 
 
 @dataclass
@@ -19,6 +21,9 @@ class ActionResult:
     should_finish: bool
     message: str | None = None
     requires_confirmation: bool = False
+    verification: str | None = None  # Tap effect check outcome (see actions.verify)
+    timed_out: bool = False  # A device command ran out of time (see phone_agent.deadline)
+    stopped: bool = False  # The step was stopped while the action ran
 
 
 class ActionHandler:
@@ -30,6 +35,12 @@ class ActionHandler:
         confirmation_callback: Optional callback for sensitive action confirmation.
             Should return True to proceed, False to cancel.
         takeover_callback: Optional callback for takeover requests (login, captcha).
+        device_factory: Optional DeviceFactory for this device. If not given,
+            the global factory from get_device_factory() is used.
+        verify_taps: Check after each tap whether the screen changed and, if
+            not, wait once more and then repeat the tap once before returning.
+            Needs the pre-action screenshot passed to execute(). Taps on
+            checkable elements (per the UI hierarchy) are never repeated.
     """
 
     def __init__(
@@ -37,13 +48,31 @@ class ActionHandler:
         device_id: str | None = None,
         confirmation_callback: Callable[[str], bool] | None = None,
         takeover_callback: Callable[[str], None] | None = None,
+        device_factory: DeviceFactory | None = None,
+        verify_taps: bool = False,
     ):
+        if device_id is None and device_factory is not None:
+            device_id = device_factory.device_id
         self.device_id = device_id
         self.confirmation_callback = confirmation_callback or self._default_confirmation
         self.takeover_callback = takeover_callback or self._default_takeover
+        self._device_factory = device_factory
+        self.verify_taps = verify_taps
+        self._before: Any = None  # Screenshot the current action was decided on
+        self._tree: Any = None  # UI hierarchy the current action was decided on, if fetched
+
+    @property
+    def device_factory(self) -> DeviceFactory:
+        """The injected DeviceFactory, or the global one for compatibility."""
+        return self._device_factory or get_device_factory()
 
     def execute(
-        self, action: dict[str, Any], screen_width: int, screen_height: int
+        self,
+        action: dict[str, Any],
+        screen_width: int,
+        screen_height: int,
+        screenshot: Any = None,
+        ui_tree: Any = None,
     ) -> ActionResult:
         """
         Execute an action from the AI model.
@@ -52,10 +81,16 @@ class ActionHandler:
             action: The action dictionary from the model.
             screen_width: Current screen width in pixels.
             screen_height: Current screen height in pixels.
+            screenshot: Optional screenshot the action was decided on, used
+                to verify taps.
+            ui_tree: Optional UITree of that screen, used to avoid repeating
+                taps on checkable elements.
 
         Returns:
             ActionResult indicating success and whether to finish.
         """
+        self._before = screenshot
+        self._tree = ui_tree
         action_type = action.get("_metadata")
 
         if action_type == "finish":
@@ -82,6 +117,8 @@ class ActionHandler:
 
         try:
             return handler_method(action, screen_width, screen_height)
+        except DeviceTimeoutError as e:
+            return timeout_result(e)
         except Exception as e:
             return ActionResult(
                 success=False, should_finish=False, message=f"Action failed: {e}"
@@ -95,6 +132,7 @@ class ActionHandler:
             "Type": self._handle_type,
             "Type_Name": self._handle_type,
             "Swipe": self._handle_swipe,
+            "Scroll": self._handle_scroll,
             "Back": self._handle_back,
             "Home": self._handle_home,
             "Double Tap": self._handle_double_tap,
@@ -121,8 +159,13 @@ class ActionHandler:
         if not app_name:
             return ActionResult(False, False, "No app name specified")
 
-        device_factory = get_device_factory()
-        success = device_factory.launch_app(app_name, self.device_id)
+        device_factory = self.device_factory
+
+        # Resolve the name against the apps installed on this device
+        package = get_app_index(device_factory.device_type, self.device_id).resolve(
+            app_name
+        )
+        success = device_factory.launch_app(package or app_name, self.device_id)
         if success:
             return ActionResult(True, False)
         return ActionResult(False, False, f"App not found: {app_name}")
@@ -137,22 +180,77 @@ class ActionHandler:
 
         # Check for sensitive operation
         if "message" in action:
-            if not self.confirmation_callback(action["message"]):
+            with pause_deadline():
+                confirmed = self.confirmation_callback(action["message"])
+            if not confirmed:
                 return ActionResult(
                     success=False,
                     should_finish=True,
                     message="User cancelled sensitive operation",
                 )
 
-        device_factory = get_device_factory()
+        device_factory = self.device_factory
         device_factory.tap(x, y, self.device_id)
-        return ActionResult(True, False)
+        if not self._should_verify(action):
+            return ActionResult(True, False)
+
+        outcome = self._verify_tap(x, y, width, height)
+        message = "Tap had no visible effect" if outcome == verify.NO_CHANGE else None
+        return ActionResult(True, False, message=message, verification=outcome)
+
+    def _should_verify(self, action: dict) -> bool:
+        # Sensitive taps (payments, deletions) are never repeated
+        return (
+            self.verify_taps
+            and self._before is not None
+            and not getattr(self._before, "is_sensitive", False)
+            and "message" not in action
+        )
+
+    def _verify_tap(self, x: int, y: int, width: int, height: int) -> str:
+        """
+        Check that a tap changed the screen; if not, wait and then retry once.
+
+        Returns:
+            One of the outcomes in phone_agent.actions.verify.
+        """
+        device_factory = self.device_factory
+        before = self._before.base64_data
+
+        def changed() -> bool:
+            after = device_factory.get_screenshot(self.device_id)
+            return verify.has_changed(before, after.base64_data, x, y, width, height)
+
+        if changed():
+            return verify.CHANGED
+
+        # The UI may still be animating: give it longer before tapping again
+        time.sleep(TIMING_CONFIG.action.tap_verify_settle)
+        if changed():
+            return verify.CHANGED_AFTER_SETTLE
+
+        tree = self._tree or device_factory.get_ui_tree(
+            self.device_id, width=width, height=height
+        )
+        if tree is not None and tree.toggles_at(x, y):
+            # A second tap on a slow checkbox or switch would flip it back
+            print(f"⚠️ Tap at ({x}, {y}) had no visible effect on a checkable element, not retrying")
+            return verify.NO_CHANGE
+
+        offset = TIMING_CONFIG.action.tap_retry_offset
+        retry_x = min(max(x + offset, 0), width - 1)
+        retry_y = min(max(y + offset, 0), height - 1)
+        print(f"🔁 Tap at ({x}, {y}) had no visible effect, retrying")
+        device_factory.tap(retry_x, retry_y, self.device_id)
+        if changed():
+            return verify.CHANGED_AFTER_RETRY
+        return verify.NO_CHANGE
 
     def _handle_type(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle text input action."""
         text = action.get("text", "")
 
-        device_factory = get_device_factory()
+        device_factory = self.device_factory
 
         # Switch to ADB keyboard
         original_ime = device_factory.detect_and_set_adb_keyboard(self.device_id)
@@ -183,19 +281,46 @@ class ActionHandler:
         start_x, start_y = self._convert_relative_to_absolute(start, width, height)
         end_x, end_y = self._convert_relative_to_absolute(end, width, height)
 
-        device_factory = get_device_factory()
+        device_factory = self.device_factory
         device_factory.swipe(start_x, start_y, end_x, end_y, device_id=self.device_id)
         return ActionResult(True, False)
 
+    def _handle_scroll(self, action: dict, width: int, height: int) -> ActionResult:
+        """Handle scroll action: swipe locally until the end of the list or the budget."""
+        from phone_agent.actions.scroll import scroll
+
+        direction = str(action.get("direction", "down")).lower()
+        try:
+            max_swipes = int(action.get("max_swipes", 5))
+        except (TypeError, ValueError):
+            max_swipes = 5
+
+        result = scroll(
+            self.device_factory,
+            direction,
+            width,
+            height,
+            max_swipes=max_swipes,
+            device_id=self.device_id,
+            target=action.get("target"),
+        )
+        if result.found:
+            message = f"Scrolled {direction} {result.swipes} times, found {action['target']!r}"
+        elif result.reached_end:
+            message = f"Scrolled {direction} {result.swipes} times and reached the end"
+        else:
+            message = f"Scrolled {direction} {result.swipes} times"
+        return ActionResult(True, False, message=message)
+
     def _handle_back(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle back button action."""
-        device_factory = get_device_factory()
+        device_factory = self.device_factory
         device_factory.back(self.device_id)
         return ActionResult(True, False)
 
     def _handle_home(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle home button action."""
-        device_factory = get_device_factory()
+        device_factory = self.device_factory
         device_factory.home(self.device_id)
         return ActionResult(True, False)
 
@@ -206,7 +331,7 @@ class ActionHandler:
             return ActionResult(False, False, "No element coordinates")
 
         x, y = self._convert_relative_to_absolute(element, width, height)
-        device_factory = get_device_factory()
+        device_factory = self.device_factory
         device_factory.double_tap(x, y, self.device_id)
         return ActionResult(True, False)
 
@@ -217,7 +342,7 @@ class ActionHandler:
             return ActionResult(False, False, "No element coordinates")
 
         x, y = self._convert_relative_to_absolute(element, width, height)
-        device_factory = get_device_factory()
+        device_factory = self.device_factory
         device_factory.long_press(x, y, device_id=self.device_id)
         return ActionResult(True, False)
 
@@ -235,7 +360,8 @@ class ActionHandler:
     def _handle_takeover(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle takeover request (login, captcha, etc.)."""
         message = action.get("message", "User intervention required")
-        self.takeover_callback(message)
+        with pause_deadline():
+            self.takeover_callback(message)
         return ActionResult(True, False)
 
     def _handle_note(self, action: dict, width: int, height: int) -> ActionResult:
@@ -257,62 +383,38 @@ class ActionHandler:
 
     def _send_keyevent(self, keycode: str) -> None:
         """Send a keyevent to the device."""
-        from phone_agent.device_factory import DeviceType, get_device_factory
+        from phone_agent.device_factory import DeviceType
         from phone_agent.hdc.connection import _run_hdc_command
 
-        device_factory = get_device_factory()
+        device_factory = self.device_factory
 
         # Handle HDC devices with HarmonyOS-specific keyEvent command
         if device_factory.device_type == DeviceType.HDC:
-            hdc_prefix = ["hdc", "-t", self.device_id] if self.device_id else ["hdc"]
-            
+            from phone_agent.hdc.input import send_key_events
+
             # Map common keycodes to HarmonyOS keyEvent codes
             # KEYCODE_ENTER (66) -> 2054 (HarmonyOS Enter key code)
-            if keycode == "KEYCODE_ENTER" or keycode == "66":
+            if keycode in ("KEYCODE_ENTER", "66") or (
+                keycode.startswith("KEYCODE_") and "ENTER" in keycode
+            ):
+                send_key_events(["2054"], self.device_id)
+            elif keycode.isdigit():
+                # Assume it's a numeric HarmonyOS code
+                send_key_events([keycode], self.device_id)
+            else:
+                # Fallback to ADB-style command for unsupported keys
+                hdc_prefix = ["hdc", "-t", self.device_id] if self.device_id else ["hdc"]
                 _run_hdc_command(
-                    hdc_prefix + ["shell", "uitest", "uiInput", "keyEvent", "2054"],
+                    hdc_prefix + ["shell", "input", "keyevent", keycode],
                     capture_output=True,
                     text=True,
                 )
-            else:
-                # For other keys, try to use the numeric code directly
-                # If keycode is a string like "KEYCODE_ENTER", convert it
-                try:
-                    # Try to extract numeric code from string or use as-is
-                    if keycode.startswith("KEYCODE_"):
-                        # For now, only handle ENTER, other keys may need mapping
-                        if "ENTER" in keycode:
-                            _run_hdc_command(
-                                hdc_prefix + ["shell", "uitest", "uiInput", "keyEvent", "2054"],
-                                capture_output=True,
-                                text=True,
-                            )
-                        else:
-                            # Fallback to ADB-style command for unsupported keys
-                            subprocess.run(
-                                hdc_prefix + ["shell", "input", "keyevent", keycode],
-                                capture_output=True,
-                                text=True,
-                            )
-                    else:
-                        # Assume it's a numeric code
-                        _run_hdc_command(
-                            hdc_prefix + ["shell", "uitest", "uiInput", "keyEvent", str(keycode)],
-                            capture_output=True,
-                            text=True,
-                        )
-                except Exception:
-                    # Fallback to ADB-style command
-                    subprocess.run(
-                        hdc_prefix + ["shell", "input", "keyevent", keycode],
-                        capture_output=True,
-                        text=True,
-                    )
         else:
             # ADB devices use standard input keyevent command
             cmd_prefix = ["adb", "-s", self.device_id] if self.device_id else ["adb"]
-            subprocess.run(
+            run_command(
                 cmd_prefix + ["shell", "input", "keyevent", keycode],
+                timeout=TIMING_CONFIG.device.command_timeout,
                 capture_output=True,
                 text=True,
             )
@@ -397,3 +499,16 @@ def finish(**kwargs) -> dict[str, Any]:
     """Helper function for creating 'finish' actions."""
     kwargs["_metadata"] = "finish"
     return kwargs
+
+
+def timeout_result(error: DeviceTimeoutError) -> ActionResult:
+    """ActionResult for an action whose device command ran out of time or was stopped."""
+    # A cancelled deadline means the run was stopped, which the agent handles
+    # without finishing the run
+    return ActionResult(
+        success=False,
+        should_finish=False,
+        message=f"Action failed: {error}",
+        timed_out=not error.cancelled,
+        stopped=error.cancelled,
+    )
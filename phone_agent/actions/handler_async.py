@@ -0,0 +1,213 @@
+"""Async action handler for running agent actions on an event loop."""
+
+import asyncio
+from typing import Any, Callable
+
+from phone_agent.actions import verify
+from phone_agent.actions.handler import ActionHandler, ActionResult, timeout_result
+from phone_agent.config.timing import TIMING_CONFIG
+from phone_agent.async_device import AsyncDeviceFactory
+from phone_agent.deadline import DeviceTimeoutError, pause_deadline
+
+
+class AsyncActionHandler(ActionHandler):
+    """
+    Executes model actions without blocking the event loop.
+
+    Taps, swipes, key presses and waits go through AsyncDeviceFactory. All
+    other actions (Launch, Type, Take_over, ...) run the synchronous
+    ActionHandler logic in a worker thread, so their behavior stays identical
+    to the synchronous agent.
+
+    Args:
+        device: AsyncDeviceFactory for the device.
+        confirmation_callback: Optional callback for sensitive action confirmation.
+            Called in a worker thread, so it may block (e.g. on input()).
+        takeover_callback: Optional callback for takeover requests (login, captcha).
+        verify_taps: Check taps for a visible effect and retry once (see ActionHandler).
+    """
+
+    def __init__(
+        self,
+        device: AsyncDeviceFactory,
+        confirmation_callback: Callable[[str], bool] | None = None,
+        takeover_callback: Callable[[str], None] | None = None,
+        verify_taps: bool = False,
+    ):
+        super().__init__(
+            device_id=device.device_id,
+            confirmation_callback=confirmation_callback,
+            takeover_callback=takeover_callback,
+            device_factory=device.sync,
+            verify_taps=verify_taps,
+        )
+        self.device = device
+
+    async def execute(  # type: ignore[override]
+        self,
+        action: dict[str, Any],
+        screen_width: int,
+        screen_height: int,
+        screenshot: Any = None,
+        ui_tree: Any = None,
+    ) -> ActionResult:
+        """
+        Execute an action from the AI model.
+
+        Args:
+            action: The action dictionary from the model.
+            screen_width: Current screen width in pixels.
+            screen_height: Current screen height in pixels.
+            screenshot: Optional screenshot the action was decided on, used
+                to verify taps.
+            ui_tree: Optional UITree of that screen, used to avoid repeating
+                taps on checkable elements.
+
+        Returns:
+            ActionResult indicating success and whether to finish.
+        """
+        handler = None
+        if action.get("_metadata") == "do":
+            handler = self._get_async_handler(action.get("action"))
+
+        if handler is None:
+            return await asyncio.to_thread(
+                super().execute, action, screen_width, screen_height, screenshot, ui_tree
+            )
+
+        self._before = screenshot
+        self._tree = ui_tree
+        try:
+            return await handler(action, screen_width, screen_height)
+        except DeviceTimeoutError as e:
+            return timeout_result(e)
+        except Exception as e:
+            return ActionResult(
+                success=False, should_finish=False, message=f"Action failed: {e}"
+            )
+
+    def _get_async_handler(self, action_name: str) -> Callable | None:
+        handlers = {
+            "Tap": self._async_tap,
+            "Swipe": self._async_swipe,
+            "Back": self._async_back,
+            "Home": self._async_home,
+            "Double Tap": self._async_double_tap,
+            "Long Press": self._async_long_press,
+            "Wait": self._async_wait,
+        }
+        return handlers.get(action_name)
+
+    async def _async_tap(self, action: dict, width: int, height: int) -> ActionResult:
+        element = action.get("element")
+        if not element:
+            return ActionResult(False, False, "No element coordinates")
+
+        x, y = self._convert_relative_to_absolute(element, width, height)
+
+        # Check for sensitive operation
+        if "message" in action:
+            with pause_deadline():
+                confirmed = await asyncio.to_thread(
+                    self.confirmation_callback, action["message"]
+                )
+            if not confirmed:
+                return ActionResult(
+                    success=False,
+                    should_finish=True,
+                    message="User cancelled sensitive operation",
+                )
+
+        await self.device.tap(x, y)
+        if not self._should_verify(action):
+            return ActionResult(True, False)
+
+        outcome = await self._async_verify_tap(x, y, width, height)
+        message = "Tap had no visible effect" if outcome == verify.NO_CHANGE else None
+        return ActionResult(True, False, message=message, verification=outcome)
+
+    async def _async_verify_tap(self, x: int, y: int, width: int, height: int) -> str:
+        """Async counterpart of ActionHandler._verify_tap."""
+        before = self._before.base64_data
+
+        async def changed() -> bool:
+            after = await self.device.get_screenshot()
+            return await asyncio.to_thread(
+                verify.has_changed, before, after.base64_data, x, y, width, height
+            )
+
+        if await changed():
+            return verify.CHANGED
+
+        await asyncio.sleep(TIMING_CONFIG.action.tap_verify_settle)
+        if await changed():
+            return verify.CHANGED_AFTER_SETTLE
+
+        tree = self._tree or await asyncio.to_thread(
+            self.device.sync.get_ui_tree, None, width=width, height=height
+        )
+        if tree is not None and tree.toggles_at(x, y):
+            print(f"⚠️ Tap at ({x}, {y}) had no visible effect on a checkable element, not retrying")
+            return verify.NO_CHANGE
+
+        offset = TIMING_CONFIG.action.tap_retry_offset
+        print(f"🔁 Tap at ({x}, {y}) had no visible effect, retrying")
+        await self.device.tap(
+            min(max(x + offset, 0), width - 1), min(max(y + offset, 0), height - 1)
+        )
+        if await changed():
+            return verify.CHANGED_AFTER_RETRY
+        return verify.NO_CHANGE
+
+    async def _async_swipe(self, action: dict, width: int, height: int) -> ActionResult:
+        start = action.get("start")
+        end = action.get("end")
+
+        if not start or not end:
+            return ActionResult(False, False, "Missing swipe coordinates")
+
+        start_x, start_y = self._convert_relative_to_absolute(start, width, height)
+        end_x, end_y = self._convert_relative_to_absolute(end, width, height)
+
+        await self.device.swipe(start_x, start_y, end_x, end_y)
+        return ActionResult(True, False)
+
+    async def _async_back(self, action: dict, width: int, height: int) -> ActionResult:
+        await self.device.back()
+        return ActionResult(True, False)
+
+    async def _async_home(self, action: dict, width: int, height: int) -> ActionResult:
+        await self.device.home()
+        return ActionResult(True, False)
+
+    async def _async_double_tap(
+        self, action: dict, width: int, height: int
+    ) -> ActionResult:
+        element = action.get("element")
+        if not element:
+            return ActionResult(False, False, "No element coordinates")
+
+        x, y = self._convert_relative_to_absolute(element, width, height)
+        await self.device.double_tap(x, y)
+        return ActionResult(True, False)
+
+    async def _async_long_press(
+        self, action: dict, width: int, height: int
+    ) -> ActionResult:
+        element = action.get("element")
+        if not element:
+            return ActionResult(False, False, "No element coordinates")
+
+        x, y = self._convert_relative_to_absolute(element, width, height)
+        await self.device.long_press(x, y)
+        return ActionResult(True, False)
+
+    async def _async_wait(self, action: dict, width: int, height: int) -> ActionResult:
+        duration_str = action.get("duration", "1 seconds")
+        try:
+            duration = float(duration_str.replace("seconds", "").strip())
+        except ValueError:
+            duration = 1.0
+
+        await asyncio.sleep(duration)
+        return ActionResult(True, False)
@@ -13,7 +13,7 @@ from phone_agent.xctest import (
     swipe,
     tap,
 )
-from phone_agent.xctest.input import clear_text, hide_keyboard, type_text
+from phone_agent.xctest.input import clear_text, fast_type_text, hide_keyboard
 
 
 @dataclass
@@ -166,14 +166,15 @@ class IOSActionHandler:
         clear_text(wda_url=self.wda_url, session_id=self.session_id)
         time.sleep(0.5)
 
-        type_text(text, wda_url=self.wda_url, session_id=self.session_id)
+        # Fastest accepted method (set value / fast keys), falls back to slow typing
+        typing = fast_type_text(text, wda_url=self.wda_url, session_id=self.session_id)
         time.sleep(0.5)
 
         # Hide keyboard after typing
         hide_keyboard(wda_url=self.wda_url, session_id=self.session_id)
         time.sleep(0.5)
 
-        return ActionResult(True, False)
+        return ActionResult(typing.success, False, typing.describe())
 
     def _handle_swipe(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle swipe action."""
@@ -0,0 +1,122 @@
+"""Local scrolling: swipe repeatedly without a model call per swipe."""
+
+import time
+from dataclasses import dataclass
+
+from phone_agent.config.timing import TIMING_CONFIG
+from phone_agent.actions.verify import GLOBAL_THRESHOLD, screen_diff
+from phone_agent.device_factory import DeviceFactory
+
+# Relative (0-1000) swipe paths that scroll the content in each direction.
+# Scrolling down moves the finger up, and so on.
+SCROLL_PATHS = {
+    "down": ((500, 750), (500, 300)),
+    "up": ((500, 300), (500, 750)),
+    "right": ((800, 500), (200, 500)),
+    "left": ((200, 500), (800, 500)),
+}
+
+# Frames whose mean grayscale difference (0-255) is at most this show the same
+# content. A perceptual hash cannot be used: consecutive list pages under a
+# fixed header and navigation bar hash alike.
+SAME_FRAME_THRESHOLD = GLOBAL_THRESHOLD
+
+
+@dataclass
+class ScrollResult:
+    """Outcome of a local scroll."""
+
+    swipes: int  # Swipes performed
+    reached_end: bool  # The last swipe no longer moved the content
+    elapsed: float  # Seconds spent
+    found: bool = False  # The target text appeared in the UI hierarchy
+
+
+def scroll(
+    device_factory: DeviceFactory,
+    direction: str,
+    screen_width: int,
+    screen_height: int,
+    max_swipes: int = 5,
+    device_id: str | None = None,
+    target: str | None = None,
+) -> ScrollResult:
+    """
+    Scroll in a direction until a target appears, the list ends or the budget is spent.
+
+    Each swipe is followed by frames taken `scroll_settle_delay` apart until
+    two consecutive frames match (fling finished, content loaded) or
+    `scroll_settle_timeout` passes. If the settled frame matches the one
+    before the swipe, the content did not move and the end is reached. With
+    a target, the UI hierarchy is checked for it before the first swipe and
+    after each one.
+
+    Args:
+        device_factory: DeviceFactory of the device.
+        direction: "up", "down", "left" or "right" (direction the content scrolls).
+        screen_width: Screen width in pixels.
+        screen_height: Screen height in pixels.
+        max_swipes: Maximum number of swipes, capped by scroll_max_swipes.
+        device_id: Optional device ID.
+        target: Optional text (or resource ID) to stop at once it is on screen.
+
+    Returns:
+        ScrollResult.
+
+    Raises:
+        ValueError: If the direction is unknown.
+    """
+    if direction not in SCROLL_PATHS:
+        raise ValueError(f"Unknown scroll direction: {direction}")
+
+    timing = TIMING_CONFIG.device
+    max_swipes = max(1, min(max_swipes, timing.scroll_max_swipes))
+    (sx, sy), (ex, ey) = SCROLL_PATHS[direction]
+    start_x, start_y = sx * screen_width // 1000, sy * screen_height // 1000
+    end_x, end_y = ex * screen_width // 1000, ey * screen_height // 1000
+
+    started = time.time()
+    if target and _target_visible(device_factory, device_id, target):
+        return ScrollResult(0, False, time.time() - started, found=True)
+
+    before = _frame(device_factory, device_id)
+    swipes = 0
+    reached_end = found = False
+    while swipes < max_swipes:
+        device_factory.swipe(
+            start_x, start_y, end_x, end_y, device_id=device_id, delay=0
+        )
+        swipes += 1
+        after = _settle(device_factory, device_id)
+        if screen_diff(before, after) <= SAME_FRAME_THRESHOLD:
+            reached_end = True
+            break
+        if target and _target_visible(device_factory, device_id, target):
+            found = True
+            break
+        before = after
+
+    return ScrollResult(swipes, reached_end, time.time() - started, found)
+
+
+def _target_visible(device_factory: DeviceFactory, device_id: str | None, target: str) -> bool:
+    tree = device_factory.get_ui_tree(device_id)
+    return tree is not None and tree.find(target) is not None
+
+
+def _frame(device_factory: DeviceFactory, device_id: str | None) -> str:
+    return device_factory.get_screenshot(device_id).base64_data
+
+
+def _settle(device_factory: DeviceFactory, device_id: str | None) -> str:
+    """Wait until the content stops moving and return the last frame (base64)."""
+    timing = TIMING_CONFIG.device
+    deadline = time.time() + timing.scroll_settle_timeout
+    time.sleep(timing.scroll_settle_delay)
+    frame = _frame(device_factory, device_id)
+    while time.time() < deadline:
+        time.sleep(timing.scroll_settle_delay)
+        previous, frame = frame, _frame(device_factory, device_id)
+        if screen_diff(previous, frame) <= SAME_FRAME_THRESHOLD:
+            break
+    return frame
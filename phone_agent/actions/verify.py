@@ -0,0 +1,100 @@
+"""Checks whether an action visibly changed the screen."""
+
+import base64
+from io import BytesIO
+
+from PIL import Image, ImageChops, ImageStat
+
+# Verification outcomes recorded in ActionResult / StepResult
+CHANGED = "changed"  # The screen changed after the action
+CHANGED_AFTER_SETTLE = "changed_after_settle"  # Changed after waiting longer
+CHANGED_AFTER_RETRY = "changed_after_retry"  # Changed after repeating the tap
+NO_CHANGE = "no_change"  # Nothing changed even after the retry
+
+# Frames are compared at this width (height keeps the aspect ratio)
+_COMPARE_WIDTH = 90
+
+# Mean absolute grayscale difference (0-255) that counts as a change, in the
+# region around the tap point and over the whole screen. A ripple or a
+# checkbox flips the region; a page transition flips everything.
+REGION_THRESHOLD = 6.0
+GLOBAL_THRESHOLD = 1.5
+
+# Half the side of the square region around the tap point, relative to screen width
+_REGION_HALF = 0.08
+
+
+def frame_diff(
+    before_base64: str, after_base64: str, x: int, y: int, width: int, height: int
+) -> tuple[float, float]:
+    """
+    Compare two screenshots around a point and globally.
+
+    Args:
+        before_base64: Screenshot before the action (base64).
+        after_base64: Screenshot after the action (base64).
+        x: X coordinate of the action in pixels.
+        y: Y coordinate of the action in pixels.
+        width: Screen width in pixels.
+        height: Screen height in pixels.
+
+    Returns:
+        Tuple of (region difference, global difference) as mean absolute
+        grayscale differences.
+    """
+    before = _small_gray(before_base64)
+    after = _small_gray(after_base64)
+    if before.size != after.size:
+        # Rotation or resolution change: certainly a change
+        return 255.0, 255.0
+
+    diff = ImageChops.difference(before, after)
+    global_diff = ImageStat.Stat(diff).mean[0]
+
+    scale_x = diff.width / max(width, 1)
+    scale_y = diff.height / max(height, 1)
+    half = max(1, int(_REGION_HALF * diff.width))  # Square region
+    cx, cy = int(x * scale_x), int(y * scale_y)
+    box = (
+        max(0, cx - half),
+        max(0, cy - half),
+        min(diff.width, cx + half + 1),
+        min(diff.height, cy + half + 1),
+    )
+    region_diff = ImageStat.Stat(diff.crop(box)).mean[0]
+    return region_diff, global_diff
+
+
+def screen_diff(before_base64: str, after_base64: str) -> float:
+    """
+    Mean absolute grayscale difference between two whole screenshots.
+
+    Unlike a perceptual hash, this sees content moving under a fixed header
+    and navigation bar, e.g. one list page scrolled to the next.
+
+    Args:
+        before_base64: First screenshot (base64).
+        after_base64: Second screenshot (base64).
+
+    Returns:
+        Difference from 0 (identical) to 255.
+    """
+    before = _small_gray(before_base64)
+    after = _small_gray(after_base64)
+    if before.size != after.size:
+        return 255.0
+    return ImageStat.Stat(ImageChops.difference(before, after)).mean[0]
+
+
+def has_changed(
+    before_base64: str, after_base64: str, x: int, y: int, width: int, height: int
+) -> bool:
+    """Whether the screen changed around (x, y) or as a whole."""
+    region_diff, global_diff = frame_diff(before_base64, after_base64, x, y, width, height)
+    return region_diff > REGION_THRESHOLD or global_diff > GLOBAL_THRESHOLD
+
+
+def _small_gray(base64_data: str) -> Image.Image:
+    with Image.open(BytesIO(base64.b64decode(base64_data))) as img:
+        height = max(1, round(img.height * _COMPARE_WIDTH / img.width))
+        return img.convert("L").resize((_COMPARE_WIDTH, height), Image.BILINEAR)
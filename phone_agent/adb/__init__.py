@@ -17,12 +17,18 @@ from phone_agent.adb.device import (
     swipe,
     tap,
 )
+from phone_agent.adb.hierarchy import get_ui_tree
 from phone_agent.adb.input import (
     clear_text,
     detect_and_set_adb_keyboard,
     restore_keyboard,
     type_text,
 )
+from phone_agent.adb.launcher import (
+    LaunchResult,
+    get_launch_stats,
+    launch_package,
+)
 from phone_agent.adb.screenshot import get_screenshot
 
 __all__ = [
@@ -33,6 +39,8 @@ __all__ = [
     "clear_text",
     "detect_and_set_adb_keyboard",
     "restore_keyboard",
+    # UI hierarchy
+    "get_ui_tree",
     # Device control
     "get_current_app",
     "tap",
@@ -42,6 +50,10 @@ __all__ = [
     "double_tap",
     "long_press",
     "launch_app",
+    # Launcher
+    "launch_package",
+    "get_launch_stats",
+    "LaunchResult",
     # Connection management
     "ADBConnection",
     "DeviceInfo",
@@ -1,12 +1,15 @@
 """Device control utilities for Android automation."""
 
+import math
 import os
-import subprocess
 import time
 from typing import List, Optional, Tuple
 
+from phone_agent.adb.launcher import launch_package
+from phone_agent.app_index import is_package_name
 from phone_agent.config.apps import APP_PACKAGES
 from phone_agent.config.timing import TIMING_CONFIG
+from phone_agent.deadline import run_command
 
 
 def get_current_app(device_id: str | None = None) -> str:
@@ -21,14 +24,22 @@ def get_current_app(device_id: str | None = None) -> str:
     """
     adb_prefix = _get_adb_prefix(device_id)
 
-    result = subprocess.run(
-        adb_prefix + ["shell", "dumpsys", "window"], capture_output=True, text=True, encoding="utf-8"
+    result = run_command(
+        adb_prefix + ["shell", "dumpsys", "window"],
+        timeout=TIMING_CONFIG.device.command_timeout,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
     )
     output = result.stdout
     if not output:
         raise ValueError("No output from dumpsys window")
 
-    # Parse window focus info
+    return _parse_current_app(output)
+
+
+def _parse_current_app(output: str) -> str:
+    """Find the focused app in `dumpsys window` output."""
     for line in output.split("\n"):
         if "mCurrentFocus" in line or "mFocusedApp" in line:
             for app_name, package in APP_PACKAGES.items():
@@ -55,9 +66,7 @@ def tap(
 
     adb_prefix = _get_adb_prefix(device_id)
 
-    subprocess.run(
-        adb_prefix + ["shell", "input", "tap", str(x), str(y)], capture_output=True
-    )
+    _run(adb_prefix + ["shell", "input", "tap", str(x), str(y)])
     time.sleep(delay)
 
 
@@ -78,13 +87,9 @@ def double_tap(
 
     adb_prefix = _get_adb_prefix(device_id)
 
-    subprocess.run(
-        adb_prefix + ["shell", "input", "tap", str(x), str(y)], capture_output=True
-    )
+    _run(adb_prefix + ["shell", "input", "tap", str(x), str(y)])
     time.sleep(TIMING_CONFIG.device.double_tap_interval)
-    subprocess.run(
-        adb_prefix + ["shell", "input", "tap", str(x), str(y)], capture_output=True
-    )
+    _run(adb_prefix + ["shell", "input", "tap", str(x), str(y)])
     time.sleep(delay)
 
 
@@ -110,10 +115,10 @@ def long_press(
 
     adb_prefix = _get_adb_prefix(device_id)
 
-    subprocess.run(
+    _run(
         adb_prefix
         + ["shell", "input", "swipe", str(x), str(y), str(x), str(y), str(duration_ms)],
-        capture_output=True,
+        duration_ms,
     )
     time.sleep(delay)
 
@@ -145,12 +150,9 @@ def swipe(
     adb_prefix = _get_adb_prefix(device_id)
 
     if duration_ms is None:
-        # Calculate duration based on distance
-        dist_sq = (start_x - end_x) ** 2 + (start_y - end_y) ** 2
-        duration_ms = int(dist_sq / 1000)
-        duration_ms = max(1000, min(duration_ms, 2000))  # Clamp between 1000-2000ms
+        duration_ms = _swipe_duration(start_x, start_y, end_x, end_y)
 
-    subprocess.run(
+    _run(
         adb_prefix
         + [
             "shell",
@@ -162,7 +164,7 @@ def swipe(
             str(end_y),
             str(duration_ms),
         ],
-        capture_output=True,
+        duration_ms,
     )
     time.sleep(delay)
 
@@ -180,9 +182,7 @@ def back(device_id: str | None = None, delay: float | None = None) -> None:
 
     adb_prefix = _get_adb_prefix(device_id)
 
-    subprocess.run(
-        adb_prefix + ["shell", "input", "keyevent", "4"], capture_output=True
-    )
+    _run(adb_prefix + ["shell", "input", "keyevent", "4"])
     time.sleep(delay)
 
 
@@ -199,9 +199,7 @@ def home(device_id: str | None = None, delay: float | None = None) -> None:
 
     adb_prefix = _get_adb_prefix(device_id)
 
-    subprocess.run(
-        adb_prefix + ["shell", "input", "keyevent", "KEYCODE_HOME"], capture_output=True
-    )
+    _run(adb_prefix + ["shell", "input", "keyevent", "KEYCODE_HOME"])
     time.sleep(delay)
 
 
@@ -212,37 +210,39 @@ def launch_app(
     Launch an app by name.
 
     Args:
-        app_name: The app name (must be in APP_PACKAGES).
+        app_name: The app name (in APP_PACKAGES) or a package name.
         device_id: Optional ADB device ID.
-        delay: Delay in seconds after launching. If None, uses configured default.
+        delay: Delay in seconds after launching. If None, uses the short
+            settle delay when the launch was timed by am start -W, otherwise
+            the configured default.
 
     Returns:
         True if app was launched, False if app not found.
     """
-    if delay is None:
-        delay = TIMING_CONFIG.device.default_launch_delay
-
-    if app_name not in APP_PACKAGES:
+    package = APP_PACKAGES.get(app_name)
+    if package is None:
+        if not is_package_name(app_name):
+            return False
+        package = app_name
+
+    result = launch_package(package, device_id)
+    if not result.success:
         return False
 
-    adb_prefix = _get_adb_prefix(device_id)
-    package = APP_PACKAGES[app_name]
-
-    subprocess.run(
-        adb_prefix
-        + [
-            "shell",
-            "monkey",
-            "-p",
-            package,
-            "-c",
-            "android.intent.category.LAUNCHER",
-            "1",
-        ],
-        capture_output=True,
-    )
+    if delay is None:
+        delay = (
+            TIMING_CONFIG.device.launch_settle_delay
+            if result.timed
+            else TIMING_CONFIG.device.default_launch_delay
+        )
     time.sleep(delay)
-    return True
+    return result.success
+
+
+def _run(cmd: list, duration_ms: int = 0) -> None:
+    """Run an input command, bounded by command_timeout plus the gesture duration."""
+    timeout = TIMING_CONFIG.device.command_timeout + duration_ms / 1000
+    run_command(cmd, timeout=timeout, capture_output=True)
 
 
 def _get_adb_prefix(device_id: str | None) -> list:
@@ -250,3 +250,17 @@ def _get_adb_prefix(device_id: str | None) -> list:
     if device_id:
         return ["adb", "-s", device_id]
     return ["adb"]
+
+
+def _swipe_duration(start_x: int, start_y: int, end_x: int, end_y: int) -> int:
+    """
+    Calculate swipe duration in milliseconds adapted to the gesture.
+
+    Long swipes (page scrolls) move at a steady speed instead of taking up to
+    two seconds; short drags (sliders, pickers) keep a minimum duration so
+    they stay slow and land where intended.
+    """
+    timing = TIMING_CONFIG.device
+    distance = math.hypot(start_x - end_x, start_y - end_y)
+    duration = int(distance / timing.swipe_speed)
+    return max(timing.swipe_min_duration, min(duration, timing.swipe_max_duration))
@@ -0,0 +1,61 @@
+"""UI hierarchy dumps from Android devices via uiautomator."""
+
+import subprocess
+import threading
+
+from phone_agent.deadline import command_timeout
+from phone_agent.ui_tree import UITree, parse_android_xml
+
+# Read size for the streamed dump
+_CHUNK_SIZE = 16 * 1024
+
+
+def get_ui_tree(
+    device_id: str | None = None, timeout: int = 10, width: int = 0, height: int = 0
+) -> UITree | None:
+    """
+    Dump and compact the current UI hierarchy.
+
+    The XML is streamed over `exec-out uiautomator dump /dev/tty`, so no file
+    is written on the device or host, and parsed as it arrives.
+
+    Args:
+        device_id: Optional ADB device ID.
+        timeout: Timeout in seconds for the dump.
+        width: Screen width in pixels (0 to take it from the hierarchy).
+        height: Screen height in pixels.
+
+    Returns:
+        The compacted UITree, or None if the dump failed (uiautomator cannot
+        dump while the UI never goes idle, e.g. during video playback).
+    """
+    cmd = _get_adb_prefix(device_id) + ["exec-out", "uiautomator", "dump", "/dev/tty"]
+    timeout = command_timeout(timeout, cmd)
+    try:
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError as e:
+        print(f"UI hierarchy error: {e}")
+        return None
+
+    timer = threading.Timer(timeout, process.kill)
+    timer.start()
+    try:
+        chunks = iter(lambda: process.stdout.read1(_CHUNK_SIZE), b"")
+        tree = parse_android_xml(chunks, width, height)
+    finally:
+        timer.cancel()
+        process.kill()
+        process.wait()
+
+    return tree if tree.nodes else None
+
+
+def _get_adb_prefix(device_id: str | None) -> list:
+    """Get ADB command prefix with optional device specifier."""
+    if device_id:
+        return ["adb", "-s", device_id]
+    return ["adb"]
@@ -1,9 +1,11 @@
 """Input utilities for Android device text input."""
 
 import base64
-import subprocess
 from typing import Optional
 
+from phone_agent.config.timing import TIMING_CONFIG
+from phone_agent.deadline import run_command
+
 
 def type_text(text: str, device_id: str | None = None) -> None:
     """
@@ -20,7 +22,7 @@ def type_text(text: str, device_id: str | None = None) -> None:
     adb_prefix = _get_adb_prefix(device_id)
     encoded_text = base64.b64encode(text.encode("utf-8")).decode("utf-8")
 
-    subprocess.run(
+    run_command(
         adb_prefix
         + [
             "shell",
@@ -32,6 +34,7 @@ def type_text(text: str, device_id: str | None = None) -> None:
             "msg",
             encoded_text,
         ],
+        timeout=TIMING_CONFIG.device.command_timeout,
         capture_output=True,
         text=True,
     )
@@ -46,8 +49,9 @@ def clear_text(device_id: str | None = None) -> None:
     """
     adb_prefix = _get_adb_prefix(device_id)
 
-    subprocess.run(
+    run_command(
         adb_prefix + ["shell", "am", "broadcast", "-a", "ADB_CLEAR_TEXT"],
+        timeout=TIMING_CONFIG.device.command_timeout,
         capture_output=True,
         text=True,
     )
@@ -66,8 +70,9 @@ def detect_and_set_adb_keyboard(device_id: str | None = None) -> str:
     adb_prefix = _get_adb_prefix(device_id)
 
     # Get current IME
-    result = subprocess.run(
+    result = run_command(
         adb_prefix + ["shell", "settings", "get", "secure", "default_input_method"],
+        timeout=TIMING_CONFIG.device.command_timeout,
         capture_output=True,
         text=True,
     )
@@ -75,8 +80,9 @@ def detect_and_set_adb_keyboard(device_id: str | None = None) -> str:
 
     # Switch to ADB Keyboard if not already set
     if "com.android.adbkeyboard/.AdbIME" not in current_ime:
-        subprocess.run(
+        run_command(
             adb_prefix + ["shell", "ime", "set", "com.android.adbkeyboard/.AdbIME"],
+            timeout=TIMING_CONFIG.device.command_timeout,
             capture_output=True,
             text=True,
         )
@@ -97,8 +103,11 @@ def restore_keyboard(ime: str, device_id: str | None = None) -> None:
     """
     adb_prefix = _get_adb_prefix(device_id)
 
-    subprocess.run(
-        adb_prefix + ["shell", "ime", "set", ime], capture_output=True, text=True
+    run_command(
+        adb_prefix + ["shell", "ime", "set", ime],
+        timeout=TIMING_CONFIG.device.command_timeout,
+        capture_output=True,
+        text=True,
     )
 
 
@@ -0,0 +1,233 @@
+"""App launcher for Android using cached launcher activities and am start -W."""
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from phone_agent.config.timing import TIMING_CONFIG
+from phone_agent.deadline import run_command
+
+_MAIN_ACTION = "android.intent.action.MAIN"
+_LAUNCHER_CATEGORY = "android.intent.category.LAUNCHER"
+
+# monkey prints these (and exits 0) when the package has no launcher activity
+# or is not installed
+_MONKEY_FAILURES = ("No activities found", "monkey aborted")
+
+# Resolved launcher component ("pkg/.Activity") per (device, package)
+_activities: dict[tuple[str, str], str] = {}
+# Launch timings per (device, package), see get_launch_stats()
+_launch_stats: dict[tuple[str, str], list["LaunchResult"]] = {}
+_lock = threading.Lock()
+
+
+@dataclass
+class LaunchResult:
+    """Outcome of an app launch."""
+
+    package: str
+    success: bool
+    method: str  # "am_start" or "monkey"
+    component: str | None = None
+    launch_state: str | None = None  # COLD / WARM / HOT as reported by am start -W
+    total_time_ms: int | None = None  # Time until the first frame was drawn
+    elapsed: float = 0.0  # Wall-clock seconds including adb overhead
+
+    @property
+    def timed(self) -> bool:
+        """Whether the launch waited for the app to draw (no fixed sleep needed)."""
+        return self.method == "am_start" and self.success
+
+
+def resolve_launch_activity(
+    package: str, device_id: str | None = None, refresh: bool = False
+) -> str | None:
+    """
+    Resolve a package's launcher activity once and cache it per device.
+
+    Args:
+        package: Android package name.
+        device_id: Optional ADB device ID.
+        refresh: Ignore the cached value and resolve again.
+
+    Returns:
+        Component name like "com.tencent.mm/.ui.LauncherUI", or None if the
+        package has no launcher activity or resolution failed.
+    """
+    key = (device_id or "", package)
+    if not refresh:
+        with _lock:
+            if key in _activities:
+                return _activities[key]
+
+    try:
+        result = run_command(
+            _get_adb_prefix(device_id)
+            + [
+                "shell",
+                "cmd",
+                "package",
+                "resolve-activity",
+                "--brief",
+                "-c",
+                _LAUNCHER_CATEGORY,
+                package,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except Exception:
+        return None
+
+    # --brief prints "priority=... preferredOrder=..." then "pkg/activity"
+    component = None
+    for line in reversed(result.stdout.strip().splitlines()):
+        line = line.strip()
+        if line.startswith(f"{package}/"):
+            component = line
+            break
+
+    if component:
+        with _lock:
+            _activities[key] = component
+    return component
+
+
+def launch_package(package: str, device_id: str | None = None) -> LaunchResult:
+    """
+    Launch a package and measure how long it took.
+
+    Uses `am start -W` with the cached launcher activity, which waits for
+    the first frame and reports the launch state and time. The intent
+    carries the MAIN action and LAUNCHER category like a launcher tap, so
+    a running app's task is brought to the front instead of getting a new
+    activity on top. Falls back to monkey when the activity cannot be
+    resolved or am start fails.
+
+    Args:
+        package: Android package name.
+        device_id: Optional ADB device ID.
+
+    Returns:
+        LaunchResult describing the launch; success is False if the package
+        is not installed or has no launcher activity.
+    """
+    start = time.time()
+    component = resolve_launch_activity(package, device_id)
+
+    if component:
+        result = _am_start(package, component, device_id)
+        if not result.success:
+            # The cached activity may be stale (app updated); resolve again
+            component = resolve_launch_activity(package, device_id, refresh=True)
+            if component:
+                result = _am_start(package, component, device_id)
+        if result.success:
+            result.elapsed = time.time() - start
+            _record(device_id, result)
+            return result
+
+    process = run_command(
+        _get_adb_prefix(device_id)
+        + ["shell", "monkey", "-p", package, "-c", _LAUNCHER_CATEGORY, "1"],
+        timeout=TIMING_CONFIG.device.command_timeout,
+        capture_output=True,
+        text=True,
+    )
+    output = process.stdout + process.stderr
+    success = process.returncode == 0 and not any(f in output for f in _MONKEY_FAILURES)
+    result = LaunchResult(package, success, "monkey", elapsed=time.time() - start)
+    _record(device_id, result)
+    return result
+
+
+def _am_start(package: str, component: str, device_id: str | None) -> LaunchResult:
+    try:
+        process = run_command(
+            _get_adb_prefix(device_id)
+            + [
+                "shell",
+                "am",
+                "start",
+                "-W",
+                "-a",
+                _MAIN_ACTION,
+                "-c",
+                _LAUNCHER_CATEGORY,
+                "-n",
+                component,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except Exception:
+        return LaunchResult(package, False, "am_start", component)
+
+    output = process.stdout + process.stderr
+    success = "Status: ok" in output and "Error" not in output
+    state = re.search(r"LaunchState:\s*(\w+)", output)
+    total = re.search(r"TotalTime:\s*(\d+)", output)
+    return LaunchResult(
+        package,
+        success,
+        "am_start",
+        component,
+        launch_state=state.group(1) if state else None,
+        total_time_ms=int(total.group(1)) if total else None,
+    )
+
+
+def _record(device_id: str | None, result: LaunchResult) -> None:
+    if not result.success:
+        print(f"[Launch] {result.package} failed ({result.method})")
+        return
+    with _lock:
+        _launch_stats.setdefault((device_id or "", result.package), []).append(result)
+
+    state = result.launch_state or result.method
+    timing = (
+        f"{result.total_time_ms}ms" if result.total_time_ms is not None else f"{result.elapsed:.2f}s"
+    )
+    print(f"[Launch] {result.package} {state} {timing}")
+
+
+def get_launch_stats(device_id: str | None = None) -> dict[str, dict[str, list[int]]]:
+    """
+    Get recorded launch times per package, grouped by launch state.
+
+    Args:
+        device_id: Optional ADB device ID.
+
+    Returns:
+        Dictionary like {"com.tencent.mm": {"COLD": [812], "WARM": [233]}},
+        with times in milliseconds.
+    """
+    stats: dict[str, dict[str, list[int]]] = {}
+    with _lock:
+        for (device, package), results in _launch_stats.items():
+            if device != (device_id or ""):
+                continue
+            for result in results:
+                state = result.launch_state or result.method.upper()
+                ms = result.total_time_ms
+                if ms is None:
+                    ms = int(result.elapsed * 1000)
+                stats.setdefault(package, {}).setdefault(state, []).append(ms)
+    return stats
+
+
+def clear_launch_cache(device_id: str | None = None) -> None:
+    """Forget resolved activities for a device (e.g. after app reinstalls)."""
+    with _lock:
+        for key in [k for k in _activities if k[0] == (device_id or "")]:
+            del _activities[key]
+
+
+def _get_adb_prefix(device_id: str | None) -> list:
+    """Get ADB command prefix with optional device specifier."""
+    if device_id:
+        return ["adb", "-s", device_id]
+    return ["adb"]
@@ -1,16 +1,22 @@
 """Screenshot utilities for capturing Android device screen."""
 
 import base64
+import gzip
 import os
-import subprocess
+import struct
 import tempfile
+import time
 import uuid
+import zlib
 from dataclasses import dataclass
 from io import BytesIO
 from typing import Tuple
 
 from PIL import Image
 
+from phone_agent.adb import transfer
+from phone_agent.deadline import DeviceTimeoutError, run_command
+
 
 @dataclass
 class Screenshot:
@@ -36,13 +42,20 @@ def get_screenshot(device_id: str | None = None, timeout: int = 10) -> Screensho
     Note:
         If the screenshot fails (e.g., on sensitive screens like payment pages),
         a black fallback image is returned with is_sensitive=True.
+        On WiFi and remote links the raw frame is compressed on the device
+        instead of pulling a PNG (see phone_agent.adb.transfer).
     """
     temp_path = os.path.join(tempfile.gettempdir(), f"screenshot_{uuid.uuid4()}.png")
     adb_prefix = _get_adb_prefix(device_id)
 
+    if transfer.use_compressed(device_id):
+        screenshot = _get_compressed_screenshot(adb_prefix, device_id, timeout)
+        if screenshot is not None:
+            return screenshot
+
     try:
         # Execute screenshot command
-        result = subprocess.run(
+        result = run_command(
             adb_prefix + ["shell", "screencap", "-p", "/sdcard/tmp.png"],
             capture_output=True,
             text=True,
@@ -55,7 +68,8 @@ def get_screenshot(device_id: str | None = None, timeout: int = 10) -> Screensho
             return _create_fallback_screenshot(is_sensitive=True)
 
         # Pull screenshot to local temp path
-        subprocess.run(
+        started = time.time()
+        run_command(
             adb_prefix + ["pull", "/sdcard/tmp.png", temp_path],
             capture_output=True,
             text=True,
@@ -64,6 +78,9 @@ def get_screenshot(device_id: str | None = None, timeout: int = 10) -> Screensho
 
         if not os.path.exists(temp_path):
             return _create_fallback_screenshot(is_sensitive=False)
+        transfer.record_png_pull(
+            device_id, os.path.getsize(temp_path), time.time() - started
+        )
 
         # Read and encode image
         img = Image.open(temp_path)
@@ -80,11 +97,86 @@ def get_screenshot(device_id: str | None = None, timeout: int = 10) -> Screensho
             base64_data=base64_data, width=width, height=height, is_sensitive=False
         )
 
+    except DeviceTimeoutError:
+        # Out of time for this step (or stopped): a black frame would mislead the model
+        raise
     except Exception as e:
         print(f"Screenshot error: {e}")
         return _create_fallback_screenshot(is_sensitive=False)
 
 
+# Raw screencap pixel formats (android PixelFormat) and their PIL raw modes
+_RAW_MODES = {1: "RGBA", 2: "RGBX", 5: "BGRA"}
+
+# The raw frame is piped through this on the device; level 1 is fast and
+# still shrinks flat UI frames many times over
+_COMPRESS_COMMAND = "screencap | gzip -1"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _get_compressed_screenshot(
+    adb_prefix: list, device_id: str | None, timeout: int
+) -> Screenshot | None:
+    """
+    Capture the raw framebuffer, gzipped on the device, and encode it on the host.
+
+    Returns:
+        The screenshot, or None to fall back to the PNG pull (capture
+        failed, e.g. a sensitive screen, or the device lacks gzip).
+    """
+    try:
+        result = run_command(
+            adb_prefix + ["exec-out", _COMPRESS_COMMAND],
+            capture_output=True,
+            timeout=timeout,
+        )
+    except DeviceTimeoutError:
+        # Falling back to the PNG pull would spend a second timeout on a slow link
+        raise
+    except OSError:
+        return None
+
+    if not result.stdout.startswith(_GZIP_MAGIC):
+        output = result.stdout + result.stderr
+        if b"not found" in output or b"inaccessible" in output:
+            transfer.mark_compression_unsupported(device_id)
+        return None
+    try:
+        raw = gzip.decompress(result.stdout)
+    except (OSError, EOFError, zlib.error):
+        return None
+
+    img = _decode_raw_frame(raw)
+    if img is None:
+        return None
+    transfer.record_compressed(device_id)
+
+    buffered = BytesIO()
+    img.save(buffered, format="PNG", compress_level=1)
+    return Screenshot(
+        base64_data=base64.b64encode(buffered.getvalue()).decode("utf-8"),
+        width=img.width,
+        height=img.height,
+        is_sensitive=False,
+    )
+
+
+def _decode_raw_frame(raw: bytes) -> Image.Image | None:
+    """
+    Decode `screencap` raw output: a width, height, format (and, since
+    Android 9, color space) header of 32-bit words followed by the pixels.
+    """
+    if len(raw) < 12:
+        return None
+    width, height, pixel_format = struct.unpack_from("<III", raw)
+    mode = _RAW_MODES.get(pixel_format)
+    header = len(raw) - width * height * 4
+    if mode is None or header not in (12, 16) or not width or not height:
+        return None
+    img = Image.frombuffer("RGBA", (width, height), raw[header:], "raw", mode, 0, 1)
+    return img.convert("RGB")
+
+
 def _get_adb_prefix(device_id: str | None) -> list:
     """Get ADB command prefix with optional device specifier."""
     if device_id:
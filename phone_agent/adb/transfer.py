@@ -0,0 +1,102 @@
+"""Screenshot transfer mode selection for WiFi and remote ADB links."""
+
+import os
+from dataclasses import dataclass
+
+from phone_agent.adb.connection import ConnectionType
+
+# "auto" picks per device from the connection type and measured throughput,
+# "png" always pulls the PNG, "compressed" always compresses on the device.
+TRANSFER_MODE = os.getenv("PHONE_AGENT_SCREENSHOT_TRANSFER", "auto").lower()
+
+# Links at least this fast (MB/s) pull PNGs even when they are WiFi or remote
+FAST_LINK_THROUGHPUT = float(os.getenv("PHONE_AGENT_FAST_LINK_MBPS", "20"))
+
+# Compressed captures between PNG pulls that re-measure the link
+PROBE_INTERVAL = 30
+
+# Weight of the newest measurement in the throughput average
+_SMOOTHING = 0.5
+
+
+@dataclass
+class LinkStats:
+    """Measured screenshot transfers of one device."""
+
+    throughput: float | None = None  # Smoothed bytes per second of PNG pulls
+    png_pulls: int = 0
+    compressed: int = 0  # Compressed captures
+    since_probe: int = 0  # Compressed captures since the last PNG pull
+    compression_supported: bool = True  # False once the device lacks the compressor
+
+
+# Per device ("" for the default device)
+_links: dict[str, LinkStats] = {}
+
+
+def connection_type(device_id: str | None) -> ConnectionType:
+    """
+    Infer the connection type from a device serial.
+
+    Wireless debugging devices found over mDNS are WIFI; host:port serials
+    (adb connect, tunnels) are REMOTE, as in ADBConnection.list_devices().
+    """
+    serial = device_id or os.getenv("ANDROID_SERIAL", "")
+    if "._adb-tls-connect." in serial or "._adb._tcp" in serial:
+        return ConnectionType.WIFI
+    if ":" in serial:
+        return ConnectionType.REMOTE
+    return ConnectionType.USB
+
+
+def link_stats(device_id: str | None) -> LinkStats:
+    """Transfer statistics of a device."""
+    return _links.setdefault(device_id or "", LinkStats())
+
+
+def use_compressed(device_id: str | None) -> bool:
+    """
+    Whether the next screenshot of a device should be compressed on the device.
+
+    In auto mode USB devices pull PNGs. WiFi and remote devices compress
+    unless their measured throughput reaches FAST_LINK_THROUGHPUT; every
+    PROBE_INTERVAL compressed captures one PNG pull re-measures the link.
+    Only PNG pulls are measured: they move a finished file, so their rate
+    is the link's, while compressed captures include device CPU time.
+    """
+    stats = link_stats(device_id)
+    if TRANSFER_MODE == "png" or not stats.compression_supported:
+        return False
+    if TRANSFER_MODE == "compressed":
+        return True
+    if connection_type(device_id) == ConnectionType.USB:
+        return False
+    if stats.throughput is not None and stats.throughput >= FAST_LINK_THROUGHPUT * 1e6:
+        return False
+    return stats.since_probe < PROBE_INTERVAL
+
+
+def record_png_pull(device_id: str | None, size: int, seconds: float) -> None:
+    """Add a PNG pull of `size` bytes to the throughput average."""
+    stats = link_stats(device_id)
+    stats.since_probe = 0
+    if size <= 0 or seconds <= 0:
+        return
+    measured = size / seconds
+    if stats.throughput is None:
+        stats.throughput = measured
+    else:
+        stats.throughput += _SMOOTHING * (measured - stats.throughput)
+    stats.png_pulls += 1
+
+
+def record_compressed(device_id: str | None) -> None:
+    """Count a compressed capture."""
+    stats = link_stats(device_id)
+    stats.compressed += 1
+    stats.since_probe += 1
+
+
+def mark_compression_unsupported(device_id: str | None) -> None:
+    """Fall back to PNG pulls for a device whose shell lacks the compressor."""
+    link_stats(device_id).compression_supported = False
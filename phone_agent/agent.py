@@ -7,10 +7,24 @@ from typing import Any, Callable
 
 from phone_agent.actions import ActionHandler
 from phone_agent.actions.handler import do, finish, parse_action
+from phone_agent.actions.verify import NO_CHANGE
+from phone_agent.checkpoint import Checkpoint, CheckpointWriter
 from phone_agent.config import get_messages, get_system_prompt
-from phone_agent.device_factory import get_device_factory
+from phone_agent.config.timing import TIMING_CONFIG
+from phone_agent.deadline import Deadline, DeviceTimeoutError
+from phone_agent.device_factory import DeviceFactory
 from phone_agent.model import ModelClient, ModelConfig
-from phone_agent.model.client import MessageBuilder
+from phone_agent.model.client import MessageBuilder, ModelResponse
+from phone_agent.progress import STUCK_POLICIES, ProgressMonitor
+from phone_agent.trajectory import (
+    DEFAULT_HASH_THRESHOLD,
+    ReplaySession,
+    TrajectoryCache,
+    TrajectoryStep,
+    screen_hash,
+    screen_thumbnail,
+)
+from phone_agent.ui_tree import UITree, observation_text, snap_action
 
 
 @dataclass
@@ -22,10 +36,23 @@ class AgentConfig:
     lang: str = "cn"
     system_prompt: str | None = None
     verbose: bool = True
+    checkpoint_dir: str | None = None  # Write resumable checkpoints here if set
+    trajectory_db: str | None = None  # Record/replay trajectories in this SQLite file if set
+    replay_threshold: int = DEFAULT_HASH_THRESHOLD  # Max screen hash distance for replay
+    stuck_policy: str = "hint"  # On no progress: "off", "hint", "takeover" or "abort"
+    stuck_hints: int = 1  # Hints to the model before a takeover or abort
+    verify_taps: bool = False  # Check taps for a visible effect and retry once locally
+    ui_tree: bool = False  # Add the compact UI hierarchy (diffed per step) to observations
+    snap_taps: bool = False  # Move taps near an element to its center (needs the UI hierarchy)
+    step_timeout: float | None = None  # Device time per step (None: TIMING_CONFIG.device.step_timeout)
 
     def __post_init__(self):
         if self.system_prompt is None:
             self.system_prompt = get_system_prompt(self.lang)
+        if self.stuck_policy not in STUCK_POLICIES:
+            raise ValueError(
+                f"stuck_policy must be one of {STUCK_POLICIES}, got {self.stuck_policy!r}"
+            )
 
 
 @dataclass
@@ -37,6 +64,10 @@ class StepResult:
     action: dict[str, Any] | None
     thinking: str
     message: str | None = None
+    replayed: bool = False  # Action came from a recorded trajectory, not the model
+    verification: str | None = None  # Tap effect check outcome (see actions.verify)
+    timed_out: bool = False  # A device command ran out of time (see phone_agent.deadline)
+    stopped: bool = False  # Interrupted by stop(); the step was discarded and the run can be resumed
 
 
 class PhoneAgent:
@@ -51,6 +82,9 @@ class PhoneAgent:
         agent_config: Configuration for the agent behavior.
         confirmation_callback: Optional callback for sensitive action confirmation.
         takeover_callback: Optional callback for takeover requests.
+        device_factory: Optional DeviceFactory for the device this agent drives.
+            Agents with their own factories can run side by side in one process
+            on different device types; without one the global factory is used.
 
     Example:
         >>> from phone_agent import PhoneAgent
@@ -67,19 +101,43 @@ class PhoneAgent:
         agent_config: AgentConfig | None = None,
         confirmation_callback: Callable[[str], bool] | None = None,
         takeover_callback: Callable[[str], None] | None = None,
+        device_factory: DeviceFactory | None = None,
     ):
         self.model_config = model_config or ModelConfig()
         self.agent_config = agent_config or AgentConfig()
+        if self.agent_config.device_id is None and device_factory is not None:
+            self.agent_config.device_id = device_factory.device_id
 
         self.model_client = ModelClient(self.model_config)
         self.action_handler = ActionHandler(
             device_id=self.agent_config.device_id,
             confirmation_callback=confirmation_callback,
             takeover_callback=takeover_callback,
+            device_factory=device_factory,
+            verify_taps=self.agent_config.verify_taps,
         )
+        self._init_state()
 
+    def _init_state(self) -> None:
+        """Set up the run state; shared with subclasses that build their own clients."""
         self._context: list[dict[str, Any]] = []
         self._step_count = 0
+        self._checkpoint: CheckpointWriter | None = None
+        self._trajectories: TrajectoryCache | None = None
+        self._replay: ReplaySession | None = None
+        self._observed: tuple[int, str] | None = None  # Screen hash and app of this step
+        self._thumbnail: str | None = None  # Screen thumbnail of this step (replay only)
+        self._replayed = False
+        self._action_note: str | None = None  # Action outcome for the next observation
+        self._ui_tree: UITree | None = None  # UI hierarchy of this step
+        self._sent_ui_tree: UITree | None = None  # Last UI hierarchy sent to the model
+        self._deadline: Deadline | None = None  # Time budget of the running step
+        self._reset_progress()
+
+    @property
+    def device_factory(self) -> DeviceFactory:
+        """DeviceFactory of the device this agent drives."""
+        return self.action_handler.device_factory
 
     def run(self, task: str) -> str:
         """
@@ -97,14 +155,55 @@ class PhoneAgent:
         # First step with user prompt
         result = self._execute_step(task, is_first=True)
 
-        if result.finished:
+        if result.finished or result.stopped:
             return result.message or "Task completed"
 
-        # Continue until finished or max steps reached
+        return self._continue_run()
+
+    def resume(self, checkpoint: Checkpoint) -> str:
+        """
+        Continue a checkpointed run until it finishes.
+
+        Args:
+            checkpoint: Checkpoint loaded with load_checkpoint() or
+                latest_checkpoint().
+
+        Returns:
+            Final message from the agent.
+        """
+        self.restore(checkpoint)
+        return self._continue_run()
+
+    def restore(self, checkpoint: Checkpoint) -> None:
+        """
+        Restore the context and step count of a checkpointed run.
+
+        Further steps are appended to the same checkpoint file, so the run
+        can be resumed again after another interruption. Use step() to
+        continue step by step, or resume() to run to completion.
+
+        Args:
+            checkpoint: Checkpoint to restore.
+        """
+        if checkpoint.device_id and checkpoint.device_id != self.agent_config.device_id:
+            print(
+                f"⚠️  Checkpoint was recorded on {checkpoint.device_id}, "
+                f"resuming on {self.agent_config.device_id or 'default device'}"
+            )
+        self._context = [dict(message) for message in checkpoint.context]
+        self._step_count = checkpoint.step_count
+        # The position in a recorded trajectory is unknown after a restart
+        self._replay = None
+        self._sent_ui_tree = None
+        self._reset_progress()
+        self._checkpoint = CheckpointWriter.reopen(checkpoint) if checkpoint.path else None
+
+    def _continue_run(self) -> str:
+        """Run steps until finished or max steps reached."""
         while self._step_count < self.agent_config.max_steps:
             result = self._execute_step(is_first=False)
 
-            if result.finished:
+            if result.finished or result.stopped:
                 return result.message or "Task completed"
 
         return "Max steps reached"
@@ -128,30 +227,99 @@ class PhoneAgent:
 
         return self._execute_step(task, is_first)
 
+    def stop(self) -> None:
+        """
+        Interrupt the running step (thread-safe).
+
+        The step's device commands are killed within a fraction of a second
+        and the step ends with a stopped result; a model request in flight
+        is not interrupted. The stopped step is dropped from the context,
+        the checkpoint, the recorded trajectory and progress tracking, so
+        the run can be resumed from the step before it.
+        """
+        if self._deadline is not None:
+            self._deadline.cancel()
+
     def reset(self) -> None:
         """Reset the agent state for a new task."""
         self._context = []
         self._step_count = 0
+        self._checkpoint = None
+        self._replay = None
+        self._sent_ui_tree = None
+        self._reset_progress()
 
     def _execute_step(
         self, user_prompt: str | None = None, is_first: bool = False
     ) -> StepResult:
         """Execute a single step of the agent loop."""
         self._step_count += 1
+        saved = self._save_step_state()
+
+        # Device commands of this step share one time budget
+        with self._start_deadline() as deadline:
+            # Capture current screen state
+            device_factory = self.device_factory
+            try:
+                screenshot = device_factory.get_screenshot(self.agent_config.device_id)
+                current_app = device_factory.get_current_app(self.agent_config.device_id)
+                self._ui_tree = self._get_ui_tree(device_factory, screenshot)
+            except DeviceTimeoutError as e:
+                return self._device_timeout(e, saved)
+
+            self._add_observation(screenshot, current_app, user_prompt, is_first)
+
+            # Get model response, unless the run is stuck or a recorded trajectory
+            # covers this screen
+            response = self._intervention_response() or self._replay_response()
+            if response is None:
+                try:
+                    self._print_thinking_header()
+                    with deadline.paused():
+                        response = self.model_client.request(self._context)
+                except Exception as e:
+                    return self._model_error(e)
+
+            action = self._snap_action(self._parse_model_action(response), screenshot)
+
+            # Execute action
+            try:
+                result = self.action_handler.execute(
+                    action, screenshot.width, screenshot.height, screenshot, self._ui_tree
+                )
+            except Exception as e:
+                if self.agent_config.verbose:
+                    traceback.print_exc()
+                result = self.action_handler.execute(
+                    finish(message=str(e)), screenshot.width, screenshot.height
+                )
 
-        # Capture current screen state
-        device_factory = get_device_factory()
-        screenshot = device_factory.get_screenshot(self.agent_config.device_id)
-        current_app = device_factory.get_current_app(self.agent_config.device_id)
+            if result.stopped:
+                return self._stopped(result.message, saved)
+            return self._complete_step(response, action, result)
 
-        # Build messages
+    def _add_observation(
+        self,
+        screenshot: Any,
+        current_app: str,
+        user_prompt: str | None = None,
+        is_first: bool = False,
+    ) -> None:
+        """Add the screen state (and the task on the first step) to the context."""
         if is_first:
+            self._start_checkpoint(user_prompt)
+            self._start_replay(user_prompt, screenshot)
+            self._reset_progress()
+            self._check_progress(screenshot, current_app)
             self._context.append(
                 MessageBuilder.create_system_message(self.agent_config.system_prompt)
             )
 
             screen_info = MessageBuilder.build_screen_info(current_app)
             text_content = f"{user_prompt}\n\n{screen_info}"
+            self._sent_ui_tree = None
+            if ui_text := self._ui_tree_text():
+                text_content += f"\n\n{ui_text}"
 
             self._context.append(
                 MessageBuilder.create_user_message(
@@ -159,8 +327,13 @@ class PhoneAgent:
                 )
             )
         else:
+            hint = self._check_progress(screenshot, current_app)
             screen_info = MessageBuilder.build_screen_info(current_app)
             text_content = f"** Screen Info **\n\n{screen_info}"
+            for note in (self._ui_tree_text(), self._action_note, hint):
+                if note:
+                    text_content += f"\n\n{note}"
+            self._action_note = None
 
             self._context.append(
                 MessageBuilder.create_user_message(
@@ -168,25 +341,108 @@ class PhoneAgent:
                 )
             )
 
-        # Get model response
-        try:
-            msgs = get_messages(self.agent_config.lang)
-            print("\n" + "=" * 50)
-            print(f"💭 {msgs['thinking']}:")
-            print("-" * 50)
-            response = self.model_client.request(self._context)
-        except Exception as e:
-            if self.agent_config.verbose:
-                traceback.print_exc()
-            return StepResult(
-                success=False,
-                finished=True,
-                action=None,
-                thinking="",
-                message=f"Model error: {e}",
-            )
+    def _start_deadline(self) -> Deadline:
+        budget = self.agent_config.step_timeout or TIMING_CONFIG.device.step_timeout
+        self._deadline = Deadline(budget)
+        return self._deadline
+
+    def _save_step_state(self) -> tuple:
+        """State that a stopped step changed before it was interrupted."""
+        return (
+            self._step_count - 1,
+            len(self._context),
+            self._sent_ui_tree,
+            self._action_note,
+            self._hints_given,
+            self._hints_pending,
+        )
+
+    def _stopped(self, message: str | None, saved: tuple) -> StepResult:
+        """Discard a step interrupted by stop() so the run stays resumable."""
+        (
+            self._step_count,
+            context_length,
+            self._sent_ui_tree,
+            self._action_note,
+            self._hints_given,
+            self._hints_pending,
+        ) = saved
+        del self._context[context_length:]
+        self._progress.discard_unacted()
+        if self._replay is not None:
+            # The replay position counted this step; like after a restore,
+            # the model takes over and the run is no longer recorded
+            self._replay = None
+        if self.agent_config.verbose:
+            print(f"🛑 {message}")
+        return StepResult(
+            success=False,
+            finished=False,
+            action=None,
+            thinking="",
+            message=message,
+            stopped=True,
+        )
+
+    def _device_timeout(self, error: DeviceTimeoutError, saved: tuple) -> StepResult:
+        """End the run when the screen cannot be observed in time."""
+        if error.cancelled:
+            return self._stopped(str(error), saved)
+        if self.agent_config.verbose:
+            print(f"⏱️  {error}")
+        return StepResult(
+            success=False,
+            finished=True,
+            action=None,
+            thinking="",
+            message=str(error),
+            timed_out=True,
+        )
 
-        # Parse action from response
+    def _get_ui_tree(self, device_factory: DeviceFactory, screenshot: Any) -> UITree | None:
+        """Fetch the UI hierarchy if observations or tap snapping use it."""
+        if not (self.agent_config.ui_tree or self.agent_config.snap_taps):
+            return None
+        return device_factory.get_ui_tree(
+            self.agent_config.device_id, width=screenshot.width, height=screenshot.height
+        )
+
+    def _ui_tree_text(self) -> str | None:
+        """UI elements section of the observation, diffed against the last one sent."""
+        if not self.agent_config.ui_tree or self._ui_tree is None:
+            return None
+        text = observation_text(self._ui_tree, self._sent_ui_tree)
+        self._sent_ui_tree = self._ui_tree
+        return text
+
+    def _snap_action(self, action: dict[str, Any], screenshot: Any) -> dict[str, Any]:
+        """Snap tap coordinates to the element under them if enabled."""
+        if not self.agent_config.snap_taps or self._ui_tree is None:
+            return action
+        snapped = snap_action(action, self._ui_tree, screenshot.width, screenshot.height)
+        if snapped is not action and self.agent_config.verbose:
+            print(f"📌 Snapped {action['element']} → {snapped['element']}")
+        return snapped
+
+    def _print_thinking_header(self) -> None:
+        msgs = get_messages(self.agent_config.lang)
+        print("\n" + "=" * 50)
+        print(f"💭 {msgs['thinking']}:")
+        print("-" * 50)
+
+    def _model_error(self, error: Exception) -> StepResult:
+        if self.agent_config.verbose:
+            traceback.print_exc()
+        return StepResult(
+            success=False,
+            finished=True,
+            action=None,
+            thinking="",
+            message=f"Model error: {error}",
+        )
+
+    def _parse_model_action(self, response: Any) -> dict[str, Any]:
+        """Parse the action from a model response and drop the screenshot from context."""
         try:
             action = parse_action(response.action)
         except ValueError:
@@ -196,6 +452,7 @@ class PhoneAgent:
 
         if self.agent_config.verbose:
             # Print thinking process
+            msgs = get_messages(self.agent_config.lang)
             print("-" * 50)
             print(f"🎯 {msgs['action']}:")
             print(json.dumps(action, ensure_ascii=False, indent=2))
@@ -204,18 +461,12 @@ class PhoneAgent:
         # Remove image from context to save space
         self._context[-1] = MessageBuilder.remove_images_from_message(self._context[-1])
 
-        # Execute action
-        try:
-            result = self.action_handler.execute(
-                action, screenshot.width, screenshot.height
-            )
-        except Exception as e:
-            if self.agent_config.verbose:
-                traceback.print_exc()
-            result = self.action_handler.execute(
-                finish(message=str(e)), screenshot.width, screenshot.height
-            )
+        return action
 
+    def _complete_step(
+        self, response: Any, action: dict[str, Any], result: Any
+    ) -> StepResult:
+        """Record the model response in the context and build the StepResult."""
         # Add assistant response to context
         self._context.append(
             MessageBuilder.create_assistant_message(
@@ -234,13 +485,195 @@ class PhoneAgent:
             )
             print("=" * 50 + "\n")
 
-        return StepResult(
-            success=result.success,
+        step_result = StepResult(
+            # An abort for lack of progress is not a successful finish
+            success=result.success and self._intervention != "abort",
             finished=finished,
             action=action,
             thinking=response.thinking,
             message=result.message or action.get("message"),
+            replayed=self._replayed,
+            verification=result.verification,
+            timed_out=result.timed_out,
+        )
+        if result.verification:
+            self._tap_stats[result.verification] = (
+                self._tap_stats.get(result.verification, 0) + 1
+            )
+        if action.get("action") == "Scroll" or result.verification == NO_CHANGE:
+            # Tell the model with the next screen how far a local scroll went
+            # or that a tap did nothing even after the local retry
+            self._action_note = result.message
+        if self._observed is not None:
+            self._progress.record_action(action)
+        if self._intervention == "takeover":
+            # The person fixed what the agent could not; start counting afresh
+            self._progress.clear()
+            self._hints_pending = self.agent_config.stuck_hints
+        self._record_step(response, action, step_result)
+        self._write_checkpoint(step_result)
+        return step_result
+
+    @property
+    def tap_stats(self) -> dict[str, int]:
+        """Counts of tap verification outcomes in the current run (see actions.verify)."""
+        return dict(self._tap_stats)
+
+    @property
+    def progress_stats(self) -> dict[str, int]:
+        """
+        No-progress metrics of the current run.
+
+        Returns:
+            Dict with "stalls" (detections), "hints" (hints sent to the model)
+            and "steps_saved" (step budget left unused by an early abort).
+        """
+        return {
+            "stalls": self._progress.detections,
+            "hints": self._hints_given,
+            "steps_saved": self._steps_saved,
+        }
+
+    def _reset_progress(self) -> None:
+        self._progress = ProgressMonitor()
+        self._intervention: str | None = None  # "takeover" / "abort" for this step
+        self._hints_given = 0
+        self._hints_pending = self.agent_config.stuck_hints  # Hints left before escalating
+        self._steps_saved = 0
+        self._tap_stats: dict[str, int] = {}
+
+    def _check_progress(self, screenshot: Any, current_app: str) -> str | None:
+        """
+        Hash the new screen and check whether the run is stuck.
+
+        Returns:
+            A hint to add to the observation, or None. Takeovers and aborts
+            are set as the step's intervention instead.
+        """
+        self._intervention = None
+        self._observed = None
+        self._thumbnail = None
+        policy = self.agent_config.stuck_policy
+        if policy == "off" and self._replay is None:
+            return None
+
+        self._observed = (screen_hash(screenshot.base64_data), current_app)
+        if self._replay is not None:
+            self._thumbnail = screen_thumbnail(screenshot.base64_data)
+        if policy == "off":
+            return None
+
+        stall = self._progress.observe(*self._observed)
+        if stall is None:
+            return None
+
+        msgs = get_messages(self.agent_config.lang)
+        print(f"🔁 {msgs['no_progress']}: {stall.detail}")
+        if policy == "hint" or self._hints_pending > 0:
+            self._hints_given += 1
+            self._hints_pending -= 1
+            return msgs[f"stuck_hint_{stall.kind}"]
+
+        self._intervention = policy
+        return None
+
+    def _intervention_response(self) -> ModelResponse | None:
+        """Stand-in model output that takes over or aborts a stuck run."""
+        if self._intervention is None:
+            return None
+
+        msgs = get_messages(self.agent_config.lang)
+        if self._intervention == "takeover":
+            action = f'do(action="Take_over", message="{msgs["stuck_takeover"]}")'
+        else:
+            self._steps_saved = max(0, self.agent_config.max_steps - self._step_count)
+            print(f"⛔ {msgs['stuck_abort']} ({self._steps_saved} steps saved)")
+            action = f'finish(message="{msgs["stuck_abort"]}")'
+        return ModelResponse(thinking=msgs["no_progress"], action=action, raw_content="")
+
+    @property
+    def model_calls_saved(self) -> int:
+        """Model calls skipped in the current run by replaying a recorded trajectory."""
+        return self._replay.calls_saved if self._replay else 0
+
+    def _start_replay(self, task: str | None, screenshot: Any) -> None:
+        self._replay = None
+        if not self.agent_config.trajectory_db or not task:
+            return
+        try:
+            if self._trajectories is None:
+                self._trajectories = TrajectoryCache(
+                    self.agent_config.trajectory_db, self.agent_config.replay_threshold
+                )
+            self._replay = self._trajectories.start(
+                task, f"{screenshot.width}x{screenshot.height}"
+            )
+        except Exception as e:
+            print(f"⚠️  Trajectory cache disabled: {e}")
+
+    def _replay_response(self) -> ModelResponse | None:
+        """Return the recorded model output for this screen, or None to ask the model."""
+        self._replayed = False
+        if self._replay is None or self._observed is None:
+            return None
+
+        step = self._replay.match(*self._observed, self._thumbnail)
+        if step is None:
+            self._replay.model_calls += 1
+            return None
+
+        self._replayed = True
+        print(f"📼 Replaying recorded step {self._replay.cursor} (model call skipped)")
+        return ModelResponse(thinking=step.thinking, action=step.action, raw_content="")
+
+    def _record_step(
+        self, response: Any, action: dict[str, Any], step_result: StepResult
+    ) -> None:
+        session = self._replay
+        if session is None or self._observed is None:
+            return
+
+        session.executed.append(
+            TrajectoryStep(
+                *self._observed, response.thinking, response.action, self._thumbnail or ""
+            )
         )
+        if self._replayed and not step_result.success:
+            # The recorded action did not work here; let the model continue
+            session.diverged = True
+
+        if step_result.finished:
+            success = action.get("_metadata") == "finish" and step_result.success
+            self._trajectories.finish(session, success)
+            total = session.calls_saved + session.model_calls
+            print(f"📼 Model calls saved this run: {session.calls_saved}/{total}")
+
+    def _start_checkpoint(self, task: str | None) -> None:
+        self._checkpoint = None
+        if not self.agent_config.checkpoint_dir:
+            return
+        try:
+            self._checkpoint = CheckpointWriter.create(
+                task or "",
+                device_type=self.device_factory.device_type.value,
+                device_id=self.agent_config.device_id,
+                directory=self.agent_config.checkpoint_dir,
+            )
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Checkpoints disabled: {e}")
+
+    def _write_checkpoint(self, step_result: StepResult) -> None:
+        if self._checkpoint is None:
+            return
+        try:
+            self._checkpoint.write_step(
+                self._context, self._step_count, step_result.action
+            )
+            if step_result.finished:
+                self._checkpoint.write_end(self._step_count, step_result.message)
+        except OSError as e:
+            # A full disk must not stop the run
+            print(f"⚠️  Checkpoint write failed: {e}")
 
     @property
     def context(self) -> list[dict[str, Any]]:
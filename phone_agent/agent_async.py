@@ -0,0 +1,192 @@
+"""Asyncio-native PhoneAgent for driving many devices from one event loop."""
+
+import asyncio
+import traceback
+from typing import Callable
+
+from phone_agent.actions.handler import finish
+from phone_agent.actions.handler_async import AsyncActionHandler
+from phone_agent.agent import AgentConfig, PhoneAgent, StepResult
+from phone_agent.async_device import AsyncDeviceFactory
+from phone_agent.checkpoint import Checkpoint
+from phone_agent.deadline import DeviceTimeoutError
+from phone_agent.device_factory import DeviceFactory, get_device_factory
+from phone_agent.model import AsyncModelClient, ModelConfig
+
+
+class AsyncPhoneAgent(PhoneAgent):
+    """
+    PhoneAgent whose device and model I/O never blocks the event loop.
+
+    Screenshots, input events and settle delays go through
+    AsyncDeviceFactory and model requests through AsyncOpenAI streaming, so
+    one event loop can run an agent per device instead of one OS thread
+    each. Context handling and output are shared with PhoneAgent.
+
+    Args:
+        model_config: Configuration for the AI model.
+        agent_config: Configuration for the agent behavior.
+        confirmation_callback: Optional callback for sensitive action confirmation.
+        takeover_callback: Optional callback for takeover requests.
+        device: AsyncDeviceFactory (or DeviceFactory) for the device. Defaults
+            to the global device type and agent_config.device_id.
+
+    Example:
+        >>> import asyncio
+        >>> from phone_agent.agent_async import AsyncPhoneAgent
+        >>> from phone_agent.async_device import AsyncDeviceFactory
+        >>>
+        >>> async def main():
+        ...     agents = [
+        ...         AsyncPhoneAgent(model_config, device=AsyncDeviceFactory(DeviceType.ADB, d))
+        ...         for d in ("emulator-5554", "emulator-5556")
+        ...     ]
+        ...     return await asyncio.gather(*(a.run("打开设置") for a in agents))
+        >>> asyncio.run(main())
+    """
+
+    def __init__(
+        self,
+        model_config: ModelConfig | None = None,
+        agent_config: AgentConfig | None = None,
+        confirmation_callback: Callable[[str], bool] | None = None,
+        takeover_callback: Callable[[str], None] | None = None,
+        device: AsyncDeviceFactory | DeviceFactory | None = None,
+    ):
+        self.model_config = model_config or ModelConfig()
+        self.agent_config = agent_config or AgentConfig()
+
+        if device is None:
+            device = get_device_factory().for_device(self.agent_config.device_id)
+        if isinstance(device, DeviceFactory):
+            device = AsyncDeviceFactory.from_factory(device)
+        if self.agent_config.device_id is None:
+            self.agent_config.device_id = device.device_id
+        elif device.device_id is None:
+            device = AsyncDeviceFactory(device.device_type, self.agent_config.device_id)
+        self.device = device
+
+        self.model_client = AsyncModelClient(self.model_config)
+        self.action_handler = AsyncActionHandler(
+            device,
+            confirmation_callback=confirmation_callback,
+            takeover_callback=takeover_callback,
+            verify_taps=self.agent_config.verify_taps,
+        )
+        self._init_state()
+
+    async def run(self, task: str) -> str:  # type: ignore[override]
+        """
+        Run the agent to complete a task.
+
+        Args:
+            task: Natural language description of the task.
+
+        Returns:
+            Final message from the agent.
+        """
+        self._context = []
+        self._step_count = 0
+
+        # First step with user prompt
+        result = await self._execute_step(task, is_first=True)
+
+        if result.finished or result.stopped:
+            return result.message or "Task completed"
+
+        return await self._continue_run()
+
+    async def resume(self, checkpoint: Checkpoint) -> str:  # type: ignore[override]
+        """
+        Continue a checkpointed run until it finishes.
+
+        Args:
+            checkpoint: Checkpoint to resume.
+
+        Returns:
+            Final message from the agent.
+        """
+        self.restore(checkpoint)
+        return await self._continue_run()
+
+    async def _continue_run(self) -> str:  # type: ignore[override]
+        """Run steps until finished or max steps reached."""
+        while self._step_count < self.agent_config.max_steps:
+            result = await self._execute_step(is_first=False)
+
+            if result.finished or result.stopped:
+                return result.message or "Task completed"
+
+        return "Max steps reached"
+
+    async def step(self, task: str | None = None) -> StepResult:  # type: ignore[override]
+        """
+        Execute a single step of the agent.
+
+        Args:
+            task: Task description (only needed for first step).
+
+        Returns:
+            StepResult with step details.
+        """
+        is_first = len(self._context) == 0
+
+        if is_first and not task:
+            raise ValueError("Task is required for the first step")
+
+        return await self._execute_step(task, is_first)
+
+    def run_sync(self, task: str) -> str:
+        """Run a task to completion from synchronous code (starts an event loop)."""
+        return asyncio.run(self.run(task))
+
+    async def _execute_step(  # type: ignore[override]
+        self, user_prompt: str | None = None, is_first: bool = False
+    ) -> StepResult:
+        """Execute a single step of the agent loop."""
+        self._step_count += 1
+        saved = self._save_step_state()
+
+        # Device commands of this step share one time budget
+        with self._start_deadline() as deadline:
+            # Capture current screen state concurrently
+            try:
+                screenshot, current_app = await asyncio.gather(
+                    self.device.get_screenshot(), self.device.get_current_app()
+                )
+                self._ui_tree = await asyncio.to_thread(
+                    self._get_ui_tree, self.device.sync, screenshot
+                )
+            except DeviceTimeoutError as e:
+                return self._device_timeout(e, saved)
+
+            self._add_observation(screenshot, current_app, user_prompt, is_first)
+
+            # Get model response, unless the run is stuck or a recorded trajectory
+            # covers this screen
+            response = self._intervention_response() or self._replay_response()
+            if response is None:
+                try:
+                    self._print_thinking_header()
+                    with deadline.paused():
+                        response = await self.model_client.request(self._context)
+                except Exception as e:
+                    return self._model_error(e)
+
+            action = self._snap_action(self._parse_model_action(response), screenshot)
+
+            # Execute action
+            try:
+                result = await self.action_handler.execute(
+                    action, screenshot.width, screenshot.height, screenshot, self._ui_tree
+                )
+            except Exception as e:
+                if self.agent_config.verbose:
+                    traceback.print_exc()
+                result = await self.action_handler.execute(
+                    finish(message=str(e)), screenshot.width, screenshot.height
+                )
+
+            if result.stopped:
+                return self._stopped(result.message, saved)
+            return self._complete_step(response, action, result)
@@ -10,7 +10,14 @@ from phone_agent.actions.handler_ios import IOSActionHandler
 from phone_agent.config import get_messages, get_system_prompt
 from phone_agent.model import ModelClient, ModelConfig
 from phone_agent.model.client import MessageBuilder
-from phone_agent.xctest import XCTestConnection, get_current_app, get_screenshot
+from phone_agent.ui_tree import UITree, observation_text, snap_action
+from phone_agent.xctest import (
+    IOSDeviceContext,
+    get_current_app,
+    get_screenshot,
+    get_ui_tree,
+    start_frame_source,
+)
 
 
 @dataclass
@@ -21,9 +28,12 @@ class IOSAgentConfig:
     wda_url: str = "http://localhost:8100"
     session_id: str | None = None
     device_id: str | None = None  # iOS device UDID
+    mjpeg_url: str | None = None  # WDA MJPEG server, e.g. http://localhost:9100
     lang: str = "cn"
     system_prompt: str | None = None
     verbose: bool = True
+    ui_tree: bool = False  # Add the compact UI hierarchy (diffed per step) to observations
+    snap_taps: bool = False  # Move taps near an element to its center (needs the UI hierarchy)
 
     def __post_init__(self):
         if self.system_prompt is None:
@@ -76,19 +86,31 @@ class IOSPhoneAgent:
 
         self.model_client = ModelClient(self.model_config)
 
-        # Initialize WDA connection and create session if needed
-        self.wda_connection = XCTestConnection(wda_url=self.agent_config.wda_url)
+        # Device context caches geometry and keeps the WDA session alive
+        self.device_context = IOSDeviceContext(
+            wda_url=self.agent_config.wda_url,
+            session_id=self.agent_config.session_id,
+            verbose=self.agent_config.verbose,
+        )
+        self.wda_connection = self.device_context.connection
 
         # Auto-create session if not provided
         if self.agent_config.session_id is None:
-            success, session_id = self.wda_connection.start_wda_session()
-            if success and session_id != "session_started":
+            session_id = self.device_context.ensure_session()
+            if session_id:
                 self.agent_config.session_id = session_id
                 if self.agent_config.verbose:
                     print(f"✅ Created WDA session: {session_id}")
             elif self.agent_config.verbose:
                 print(f"⚠️  Using default WDA session (no explicit session ID)")
 
+        # Continuous frame source; get_screenshot falls back to /screenshot
+        self.frame_source = None
+        if self.agent_config.mjpeg_url:
+            self.frame_source = start_frame_source(
+                self.agent_config.wda_url, self.agent_config.mjpeg_url
+            )
+
         self.action_handler = IOSActionHandler(
             wda_url=self.agent_config.wda_url,
             session_id=self.agent_config.session_id,
@@ -98,6 +120,7 @@ class IOSPhoneAgent:
 
         self._context: list[dict[str, Any]] = []
         self._step_count = 0
+        self._sent_ui_tree: UITree | None = None  # Last UI hierarchy sent to the model
 
     def run(self, task: str) -> str:
         """
@@ -150,6 +173,7 @@ class IOSPhoneAgent:
         """Reset the agent state for a new task."""
         self._context = []
         self._step_count = 0
+        self._sent_ui_tree = None
 
     def _execute_step(
         self, user_prompt: str | None = None, is_first: bool = False
@@ -157,7 +181,16 @@ class IOSPhoneAgent:
         """Execute a single step of the agent loop."""
         self._step_count += 1
 
-        # Capture current screen state
+        # Recreate the WDA session transparently if it expired
+        session_id = self.device_context.ensure_session()
+        if session_id and session_id != self.agent_config.session_id:
+            self.agent_config.session_id = session_id
+            self.action_handler.session_id = session_id
+
+        # Capture current screen state, waiting briefly for the UI to settle
+        # when frames are streamed
+        if self.frame_source is not None:
+            self.frame_source.wait_until_stable(stable_time=0.3, timeout=1.0)
         screenshot = get_screenshot(
             wda_url=self.agent_config.wda_url,
             session_id=self.agent_config.session_id,
@@ -167,29 +200,40 @@ class IOSPhoneAgent:
             wda_url=self.agent_config.wda_url, session_id=self.agent_config.session_id
         )
 
+        # Refreshes window size and scale only when the orientation changed
+        self.device_context.geometry(screenshot.width, screenshot.height)
+
+        ui_tree = None
+        if self.agent_config.ui_tree or self.agent_config.snap_taps:
+            ui_tree = get_ui_tree(
+                wda_url=self.agent_config.wda_url,
+                session_id=self.agent_config.session_id,
+                width=screenshot.width,
+                height=screenshot.height,
+            )
+
         # Build messages
         if is_first:
             self._context.append(
                 MessageBuilder.create_system_message(self.agent_config.system_prompt)
             )
+            self._sent_ui_tree = None
 
             screen_info = MessageBuilder.build_screen_info(current_app)
             text_content = f"{user_prompt}\n\n{screen_info}"
-
-            self._context.append(
-                MessageBuilder.create_user_message(
-                    text=text_content, image_base64=screenshot.base64_data
-                )
-            )
         else:
             screen_info = MessageBuilder.build_screen_info(current_app)
             text_content = f"** Screen Info **\n\n{screen_info}"
 
-            self._context.append(
-                MessageBuilder.create_user_message(
-                    text=text_content, image_base64=screenshot.base64_data
-                )
+        if self.agent_config.ui_tree and ui_tree is not None:
+            text_content += f"\n\n{observation_text(ui_tree, self._sent_ui_tree)}"
+            self._sent_ui_tree = ui_tree
+
+        self._context.append(
+            MessageBuilder.create_user_message(
+                text=text_content, image_base64=screenshot.base64_data
             )
+        )
 
         # Get model response
         try:
@@ -228,6 +272,9 @@ class IOSPhoneAgent:
         # Remove image from context to save space
         self._context[-1] = MessageBuilder.remove_images_from_message(self._context[-1])
 
+        if self.agent_config.snap_taps and ui_tree is not None:
+            action = snap_action(action, ui_tree, screenshot.width, screenshot.height)
+
         # Execute action
         try:
             result = self.action_handler.execute(
@@ -0,0 +1,383 @@
+"""Per-device index of installed apps for resolving Launch targets."""
+
+import contextvars
+import difflib
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from phone_agent.deadline import DeviceTimeoutError, run_command
+from phone_agent.device_factory import DeviceType
+
+# Groups of names for the same app. The static tables already cover most
+# Chinese and English names; these add pinyin and informal names the model
+# tends to use. Once any name of a group matches an installed package, every
+# name in the group resolves to it.
+APP_ALIASES: list[tuple[str, ...]] = [
+    ("微信", "wechat", "weixin"),
+    ("微信读书", "weread", "wechat read"),
+    ("支付宝", "alipay", "zhifubao"),
+    ("淘宝", "taobao"),
+    ("京东", "jd", "jingdong"),
+    ("拼多多", "pinduoduo", "pdd"),
+    ("小红书", "xiaohongshu", "rednote", "xhs"),
+    ("抖音", "douyin", "tiktok", "aweme"),
+    ("快手", "kuaishou"),
+    ("美团", "meituan"),
+    ("饿了么", "eleme"),
+    ("大众点评", "dianping"),
+    ("高德地图", "高德", "gaode", "amap"),
+    ("百度地图", "baidu map"),
+    ("滴滴出行", "滴滴", "didi"),
+    ("携程", "ctrip"),
+    ("知乎", "zhihu"),
+    ("微博", "weibo"),
+    ("bilibili", "b站", "哔哩哔哩"),
+    ("Settings", "设置", "系统设置"),
+]
+
+# Minimum difflib ratio for a fuzzy name match
+FUZZY_CUTOFF = 0.75
+
+# Package-name tokens too generic to identify an app
+_GENERIC_TOKENS = {
+    "com", "cn", "android", "app", "apps", "mobile", "client", "phone",
+    "hm", "hmos", "huawei", "ohos", "main", "activity", "activitys", "view",
+}
+
+_PACKAGE_RE = re.compile(r"^[A-Za-z][\w]*(\.[\w]+)+$")
+
+
+def normalize_app_name(name: str) -> str:
+    """Normalize an app name for matching: lowercase, no spaces/dashes/underscores."""
+    return re.sub(r"[\s\-_·.]+", "", name).lower()
+
+
+def is_package_name(name: str) -> bool:
+    """Whether a string looks like an Android package / HarmonyOS bundle name."""
+    return bool(_PACKAGE_RE.match(name))
+
+
+class AppIndex:
+    """
+    Installed apps of one device with the names they can be launched by.
+
+    The index lists installed packages once and maps every name from the
+    static app table, APP_ALIASES and the package name's own tokens to a
+    package, keeping only packages that are actually installed. A package
+    token is only a name when exactly one installed package has it, so
+    "tencent" or "google" never picks one of several apps. On a miss the
+    package list is re-read, at most once per min_refresh_interval, and the
+    names are rebuilt if it changed, so apps installed while the agent runs
+    are picked up.
+
+    Android exposes no shell command for localized app labels, so labels
+    come from the static tables; HarmonyOS labels are read from `bm dump`
+    (when they are plain strings) the first time a lookup misses.
+
+    Args:
+        device_type: ADB or HDC.
+        device_id: Optional device ID.
+        min_refresh_interval: Minimum seconds between refreshes on a miss.
+
+    Example:
+        >>> index = get_app_index(DeviceType.ADB)
+        >>> index.resolve("WeChat")
+        'com.tencent.mm'
+    """
+
+    def __init__(
+        self,
+        device_type: DeviceType = DeviceType.ADB,
+        device_id: str | None = None,
+        min_refresh_interval: float = 30.0,
+    ):
+        self.device_type = device_type
+        self.device_id = device_id
+        self.min_refresh_interval = min_refresh_interval
+
+        self._packages: set[str] = set()
+        self._names: dict[str, str] = {}  # normalized name -> package
+        self._labels: dict[str, str] = {}  # package -> device label (HarmonyOS)
+        self._labeled: set[str] = set()
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def packages(self) -> set[str]:
+        """Installed package names (empty until the first refresh)."""
+        with self._lock:
+            return set(self._packages)
+
+    def _static_packages(self) -> dict[str, str]:
+        if self.device_type == DeviceType.HDC:
+            from phone_agent.config.apps_harmonyos import APP_PACKAGES
+        else:
+            from phone_agent.config.apps import APP_PACKAGES
+        return APP_PACKAGES
+
+    def refresh(self) -> tuple[int, int]:
+        """
+        Re-list installed packages and rebuild the names if they changed.
+
+        Returns:
+            Tuple of (added, removed) package counts.
+
+        Raises:
+            DeviceTimeoutError: If listing timed out or the step was stopped.
+        """
+        installed = self._list_packages()
+        if installed is None:
+            return 0, 0
+
+        with self._lock:
+            added = installed - self._packages
+            removed = self._packages - installed
+            self._last_refresh = time.time()
+            if not added and not removed:
+                return 0, 0
+            labels = {p: label for p, label in self._labels.items() if p in installed}
+
+        # Token uniqueness depends on every installed package, so the names
+        # are rebuilt as a whole; only listing the packages costs a command.
+        names = self._index_packages(installed, labels)
+        with self._lock:
+            self._packages = installed
+            self._labels = labels
+            self._names = names
+
+        return len(added), len(removed)
+
+    def _index_packages(self, packages: set[str], labels: dict[str, str]) -> dict[str, str]:
+        """Build the name -> package entries of the installed packages."""
+        names: dict[str, str] = {}
+        static = self._static_packages()
+
+        # Names from the static table win over derived ones
+        for name, package in static.items():
+            if package in packages:
+                names[normalize_app_name(name)] = package
+
+        ordered = sorted(packages)
+        owners: dict[str, set[str]] = {}
+        for package in ordered:
+            for token in re.split(r"[._]", package.lower()):
+                if len(token) >= 3 and token not in _GENERIC_TOKENS:
+                    owners.setdefault(token, set()).add(package)
+
+        for package in ordered:
+            names.setdefault(package.lower(), package)
+            label = labels.get(package)
+            if label:
+                names.setdefault(normalize_app_name(label), package)
+        for token, token_packages in sorted(owners.items()):
+            if len(token_packages) == 1:
+                names.setdefault(token, next(iter(token_packages)))
+
+        # Spread a match of any alias to the whole group. A group also matches
+        # a package-name token starting with one of its names, e.g. "alipay"
+        # matches com.eg.android.AlipayGphone, if only one package has such a
+        # token.
+        for group in APP_ALIASES:
+            keys = [normalize_app_name(name) for name in group]
+            package = next((names[key] for key in keys if key in names), None)
+            if package is None:
+                matches = {
+                    next(iter(token_packages))
+                    for key in keys
+                    if len(key) >= 4
+                    for token, token_packages in owners.items()
+                    if len(token_packages) == 1 and token.startswith(key)
+                }
+                package = matches.pop() if len(matches) == 1 else None
+            if package:
+                for key in keys:
+                    names.setdefault(key, package)
+
+        return names
+
+    def resolve(self, app_name: str) -> str | None:
+        """
+        Resolve an app name to an installed package.
+
+        Tries an exact (normalized) match, then names containing the query,
+        then a fuzzy match; a substring or fuzzy match that fits more than
+        one package is treated as a miss. On a miss the index is refreshed
+        (rate-limited) and, on HarmonyOS, device labels are loaded before
+        the lookup is retried.
+
+        Args:
+            app_name: App name as given by the model, in any language.
+
+        Returns:
+            The package name, or None if no installed app, or several, match.
+
+        Raises:
+            DeviceTimeoutError: If listing timed out or the step was stopped.
+        """
+        if not app_name:
+            return None
+
+        if not self._packages:
+            self.refresh()
+        package = self._lookup(app_name)
+
+        if package is None and time.time() - self._last_refresh >= self.min_refresh_interval:
+            self.refresh()
+            package = self._lookup(app_name)
+
+        if package is None and self._load_labels():
+            package = self._lookup(app_name)
+
+        return package
+
+    def _load_labels(self) -> bool:
+        """
+        Read HarmonyOS labels of packages not in the static table.
+
+        This costs one `bm dump -n` per bundle, so it only runs after a
+        lookup missed everything else, in parallel, and at most once per
+        package.
+
+        Returns:
+            True if new labels were added.
+        """
+        if self.device_type != DeviceType.HDC:
+            return False
+
+        static = set(self._static_packages().values())
+        with self._lock:
+            pending = [p for p in self._packages - self._labeled if p not in static]
+            self._labeled.update(pending)
+        if not pending:
+            return False
+
+        # Run each read in a copy of this context so the step deadline applies
+        contexts = [contextvars.copy_context() for _ in pending]
+        with ThreadPoolExecutor(max_workers=min(16, len(pending))) as pool:
+            labels = list(
+                pool.map(
+                    lambda context, bundle: context.run(self._read_hdc_label, bundle),
+                    contexts,
+                    pending,
+                )
+            )
+
+        added = False
+        with self._lock:
+            for package, label in zip(pending, labels):
+                if label and package in self._packages:
+                    self._labels[package] = label
+                    self._names.setdefault(normalize_app_name(label), package)
+                    added = True
+        return added
+
+    def _lookup(self, app_name: str) -> str | None:
+        if is_package_name(app_name):
+            with self._lock:
+                return app_name if app_name in self._packages else None
+
+        query = normalize_app_name(app_name)
+        with self._lock:
+            names = dict(self._names)
+
+        if query in names:
+            return names[query]
+
+        # Names containing the query (e.g. "高德" -> "高德地图"). A query that
+        # merely contains a name ("微信读书" contains "微信") is a different app.
+        if len(query) >= 2:
+            candidates = {package for name, package in names.items() if query in name}
+            if candidates:
+                return candidates.pop() if len(candidates) == 1 else None
+
+        matches = difflib.get_close_matches(query, sorted(names), n=3, cutoff=FUZZY_CUTOFF)
+        candidates = {names[match] for match in matches}
+        return candidates.pop() if len(candidates) == 1 else None
+
+    def _list_packages(self) -> set[str] | None:
+        if self.device_type == DeviceType.HDC:
+            from phone_agent.hdc.connection import _run_hdc_command
+
+            prefix = ["hdc", "-t", self.device_id] if self.device_id else ["hdc"]
+            try:
+                result = _run_hdc_command(
+                    prefix + ["shell", "bm", "dump", "-a"],
+                    capture_output=True,
+                    text=True,
+                    encoding="utf-8",
+                    errors="replace",
+                    timeout=15,
+                )
+            except DeviceTimeoutError:
+                raise
+            except Exception:
+                return None
+            return {
+                line.strip()
+                for line in result.stdout.splitlines()
+                if is_package_name(line.strip())
+            } or None
+
+        prefix = ["adb", "-s", self.device_id] if self.device_id else ["adb"]
+        try:
+            result = run_command(
+                prefix + ["shell", "pm", "list", "packages"],
+                capture_output=True,
+                text=True,
+                timeout=15,
+            )
+        except DeviceTimeoutError:
+            raise
+        except Exception:
+            return None
+        return {
+            line.strip()[len("package:"):]
+            for line in result.stdout.splitlines()
+            if line.strip().startswith("package:")
+        } or None
+
+    def _read_hdc_label(self, bundle: str) -> str | None:
+        from phone_agent.hdc.connection import _run_hdc_command
+
+        prefix = ["hdc", "-t", self.device_id] if self.device_id else ["hdc"]
+        try:
+            result = _run_hdc_command(
+                prefix + ["shell", "bm", "dump", "-n", bundle],
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                timeout=10,
+            )
+        except Exception:
+            return None
+        match = re.search(r'"label"\s*:\s*"([^"$][^"]*)"', result.stdout)
+        return match.group(1) if match else None
+
+
+_indexes: dict[tuple[DeviceType, str], AppIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_app_index(
+    device_type: DeviceType = DeviceType.ADB, device_id: str | None = None
+) -> AppIndex:
+    """
+    Get the shared AppIndex for a device, creating it on first use.
+
+    Args:
+        device_type: ADB or HDC.
+        device_id: Optional device ID.
+
+    Returns:
+        AppIndex for the device.
+    """
+    key = (device_type, device_id or "")
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = AppIndex(device_type, device_id)
+            _indexes[key] = index
+        return index
@@ -0,0 +1,245 @@
+"""Non-blocking device access for ADB and HDC devices using asyncio subprocesses."""
+
+import asyncio
+import base64
+from io import BytesIO
+
+from PIL import Image
+
+from phone_agent.config.timing import TIMING_CONFIG
+from phone_agent.deadline import DeviceTimeoutError, command_timeout
+from phone_agent.device_factory import DeviceFactory, DeviceType
+
+_PNG_MAGIC = b"\x89PNG"
+
+
+class AsyncDeviceFactory:
+    """
+    Async counterpart of DeviceFactory for one ADB or HDC device.
+
+    Screen reads and input events run as asyncio subprocesses and settle
+    delays use asyncio.sleep, so a single event loop can drive many devices.
+    Less frequent operations with more involved host-side logic (app
+    launch, keyboard switching and typing, HDC screenshots) reuse the
+    synchronous backend in a worker thread via asyncio.to_thread.
+
+    Args:
+        device_type: ADB or HDC.
+        device_id: Optional device ID.
+        timeout: Default timeout in seconds for one device command.
+
+    Example:
+        >>> device = AsyncDeviceFactory(DeviceType.ADB, "emulator-5554")
+        >>> screenshot = await device.get_screenshot()
+        >>> await device.tap(500, 1000)
+    """
+
+    def __init__(
+        self,
+        device_type: DeviceType = DeviceType.ADB,
+        device_id: str | None = None,
+        timeout: float = 10.0,
+    ):
+        if device_type not in (DeviceType.ADB, DeviceType.HDC):
+            raise ValueError(f"Unsupported device type for async access: {device_type}")
+        self.device_type = device_type
+        self.device_id = device_id
+        self.timeout = timeout
+        self.sync = DeviceFactory(device_type, device_id)
+
+    @classmethod
+    def from_factory(cls, factory: DeviceFactory) -> "AsyncDeviceFactory":
+        """Create an async handle for the same device as a DeviceFactory."""
+        return cls(factory.device_type, factory.device_id)
+
+    def _prefix(self) -> list[str]:
+        if self.device_type == DeviceType.HDC:
+            return ["hdc", "-t", self.device_id] if self.device_id else ["hdc"]
+        return ["adb", "-s", self.device_id] if self.device_id else ["adb"]
+
+    async def _run(self, *args: str, timeout: float | None = None) -> tuple[int, bytes, bytes]:
+        """
+        Run a device command without blocking the event loop.
+
+        Returns:
+            Tuple of (returncode, stdout, stderr). The process is killed and
+            DeviceTimeoutError raised if it does not finish within the
+            timeout, capped by the active step deadline.
+        """
+        cmd = [*self._prefix(), *args]
+        limit = command_timeout(timeout or self.timeout, cmd)
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), limit)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise DeviceTimeoutError(cmd, limit) from None
+        return process.returncode, stdout, stderr
+
+    async def _input(self, *args: str) -> None:
+        if self.device_type == DeviceType.HDC:
+            await self._run("shell", "uitest", "uiInput", *args)
+        else:
+            await self._run("shell", "input", *args)
+
+    async def get_screenshot(self, timeout: int = 10):
+        """
+        Capture a screenshot.
+
+        ADB devices stream the PNG over `exec-out screencap -p` without a
+        temporary file on the device or host. WiFi and remote links, and
+        devices set to compressed transfer, go through the synchronous
+        capture, which measures the link and compresses the frame on the
+        device while it is slow (see phone_agent.adb.transfer).
+        """
+        if self.device_type == DeviceType.HDC:
+            return await asyncio.to_thread(self.sync.get_screenshot, None, timeout)
+
+        from phone_agent.adb import transfer
+        from phone_agent.adb.connection import ConnectionType
+
+        if (
+            transfer.use_compressed(self.device_id)
+            or transfer.connection_type(self.device_id) != ConnectionType.USB
+        ):
+            return await asyncio.to_thread(self.sync.get_screenshot, None, timeout)
+
+        from phone_agent.adb.screenshot import Screenshot, _create_fallback_screenshot
+
+        try:
+            _, data, stderr = await self._run("exec-out", "screencap", "-p", timeout=timeout)
+        except DeviceTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Screenshot error: {e}")
+            return _create_fallback_screenshot(is_sensitive=False)
+
+        if not data.startswith(_PNG_MAGIC):
+            output = (data + stderr).decode("utf-8", errors="replace")
+            sensitive = "Status: -1" in output or "Failed" in output
+            return _create_fallback_screenshot(is_sensitive=sensitive)
+
+        width, height = await asyncio.to_thread(_image_size, data)
+        return Screenshot(
+            base64_data=base64.b64encode(data).decode("utf-8"),
+            width=width,
+            height=height,
+            is_sensitive=False,
+        )
+
+    async def get_current_app(self) -> str:
+        """Get current app name."""
+        if self.device_type == DeviceType.HDC:
+            from phone_agent.hdc.device import _parse_current_app
+
+            command = ("shell", "hidumper", "-s", "WindowManagerService", "-a", "-a")
+            source = "hidumper"
+        else:
+            from phone_agent.adb.device import _parse_current_app
+
+            command = ("shell", "dumpsys", "window")
+            source = "dumpsys window"
+
+        _, stdout, _ = await self._run(*command)
+        output = stdout.decode("utf-8", errors="replace")
+        if not output:
+            raise ValueError(f"No output from {source}")
+        return _parse_current_app(output)
+
+    async def tap(self, x: int, y: int, delay: float | None = None) -> None:
+        """Tap at coordinates."""
+        if delay is None:
+            delay = TIMING_CONFIG.device.default_tap_delay
+        if self.device_type == DeviceType.HDC:
+            await self._input("click", str(x), str(y))
+        else:
+            await self._input("tap", str(x), str(y))
+        await asyncio.sleep(delay)
+
+    async def double_tap(self, x: int, y: int, delay: float | None = None) -> None:
+        """Double tap at coordinates."""
+        if delay is None:
+            delay = TIMING_CONFIG.device.default_double_tap_delay
+        if self.device_type == DeviceType.HDC:
+            await self._input("doubleClick", str(x), str(y))
+        else:
+            await self._input("tap", str(x), str(y))
+            await asyncio.sleep(TIMING_CONFIG.device.double_tap_interval)
+            await self._input("tap", str(x), str(y))
+        await asyncio.sleep(delay)
+
+    async def long_press(
+        self, x: int, y: int, duration_ms: int = 3000, delay: float | None = None
+    ) -> None:
+        """Long press at coordinates."""
+        if delay is None:
+            delay = TIMING_CONFIG.device.default_long_press_delay
+        if self.device_type == DeviceType.HDC:
+            await self._input("longClick", str(x), str(y))
+        else:
+            await self._input("swipe", str(x), str(y), str(x), str(y), str(duration_ms))
+        await asyncio.sleep(delay)
+
+    async def swipe(
+        self,
+        start_x: int,
+        start_y: int,
+        end_x: int,
+        end_y: int,
+        duration_ms: int | None = None,
+        delay: float | None = None,
+    ) -> None:
+        """Swipe from start to end."""
+        if delay is None:
+            delay = TIMING_CONFIG.device.default_swipe_delay
+        if duration_ms is None:
+            if self.device_type == DeviceType.HDC:
+                from phone_agent.hdc.device import _swipe_duration
+            else:
+                from phone_agent.adb.device import _swipe_duration
+            duration_ms = _swipe_duration(start_x, start_y, end_x, end_y)
+
+        # The subprocess returns once the swipe gesture has been injected
+        await self._input(
+            "swipe",
+            str(start_x),
+            str(start_y),
+            str(end_x),
+            str(end_y),
+            str(duration_ms),
+        )
+        await asyncio.sleep(delay)
+
+    async def back(self, delay: float | None = None) -> None:
+        """Press back button."""
+        if delay is None:
+            delay = TIMING_CONFIG.device.default_back_delay
+        if self.device_type == DeviceType.HDC:
+            await self._input("keyEvent", "Back")
+        else:
+            await self._input("keyevent", "4")
+        await asyncio.sleep(delay)
+
+    async def home(self, delay: float | None = None) -> None:
+        """Press home button."""
+        if delay is None:
+            delay = TIMING_CONFIG.device.default_home_delay
+        if self.device_type == DeviceType.HDC:
+            await self._input("keyEvent", "Home")
+        else:
+            await self._input("keyevent", "KEYCODE_HOME")
+        await asyncio.sleep(delay)
+
+    async def launch_app(self, app_name: str, delay: float | None = None) -> bool:
+        """Launch an app (runs the synchronous launcher in a worker thread)."""
+        return await asyncio.to_thread(self.sync.launch_app, app_name, None, delay)
+
+
+def _image_size(data: bytes) -> tuple[int, int]:
+    with Image.open(BytesIO(data)) as img:
+        return img.size
@@ -0,0 +1,259 @@
+"""Append-only checkpoints of agent runs for resuming after crashes or restarts."""
+
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+# Default directory for checkpoint files (one JSONL file per run)
+DEFAULT_CHECKPOINT_DIR = os.getenv("PHONE_AGENT_CHECKPOINT_DIR", "checkpoints")
+
+
+@dataclass
+class Checkpoint:
+    """State of an agent run as of its last checkpointed step."""
+
+    run_id: str
+    task: str
+    context: list[dict[str, Any]] = field(default_factory=list)
+    step_count: int = 0
+    last_action: dict[str, Any] | None = None
+    device_type: str | None = None  # "adb" / "hdc"
+    device_id: str | None = None
+    started_at: float = 0.0
+    updated_at: float = 0.0
+    finished: bool = False
+    message: str | None = None
+    path: str | None = None
+
+
+class CheckpointWriter:
+    """
+    Appends the progress of one run to a JSONL checkpoint file.
+
+    The file starts with a "start" record (task and device binding). Each
+    step appends only the context messages added since the previous record,
+    with images stripped, plus the step count and last action, so a write
+    costs one short line no matter how long the run is. If the context was
+    rewritten rather than extended, a full "snapshot" record is appended
+    instead. An "end" record marks the run as finished.
+
+    Args:
+        path: Checkpoint file path.
+        fsync: Whether to fsync after every record (survives power loss, slower).
+    """
+
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync
+        self._written: list[dict[str, Any]] = []
+
+    @classmethod
+    def create(
+        cls,
+        task: str,
+        device_type: str | None = None,
+        device_id: str | None = None,
+        directory: str = DEFAULT_CHECKPOINT_DIR,
+        fsync: bool = False,
+    ) -> "CheckpointWriter":
+        """
+        Start a checkpoint file for a new run.
+
+        Args:
+            task: Task description.
+            device_type: Device type value ("adb" / "hdc").
+            device_id: Device ID the run is bound to.
+            directory: Directory for checkpoint files.
+            fsync: Whether to fsync after every record.
+
+        Returns:
+            CheckpointWriter for the new run.
+        """
+        os.makedirs(directory, exist_ok=True)
+        run_id = time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+        writer = cls(os.path.join(directory, f"{run_id}.jsonl"), fsync=fsync)
+        writer._append(
+            {
+                "type": "start",
+                "run_id": run_id,
+                "task": task,
+                "device_type": device_type,
+                "device_id": device_id,
+                "time": time.time(),
+            }
+        )
+        return writer
+
+    @classmethod
+    def reopen(cls, checkpoint: Checkpoint, fsync: bool = False) -> "CheckpointWriter":
+        """Continue appending to the file of a loaded checkpoint."""
+        writer = cls(checkpoint.path, fsync=fsync)
+        writer._written = [_compact(message) for message in checkpoint.context]
+        return writer
+
+    def write_step(
+        self,
+        context: list[dict[str, Any]],
+        step_count: int,
+        last_action: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Record the state after a step.
+
+        Args:
+            context: Full agent context.
+            step_count: Steps executed so far.
+            last_action: The action of the step.
+        """
+        written = len(self._written)
+        if len(context) < written or not self._prefix_unchanged(context):
+            # Context was rewritten (e.g. reset or trimmed): store it in full
+            self._written = [_compact(message) for message in context]
+            self._append(
+                {
+                    "type": "snapshot",
+                    "step": step_count,
+                    "messages": self._written,
+                    "action": last_action,
+                    "time": time.time(),
+                }
+            )
+            return
+
+        compacted = [_compact(message) for message in context[written:]]
+        self._written.extend(compacted)
+        self._append(
+            {
+                "type": "step",
+                "step": step_count,
+                "messages": compacted,
+                "action": last_action,
+                "time": time.time(),
+            }
+        )
+
+    def write_end(self, step_count: int, message: str | None = None) -> None:
+        """Mark the run as finished so it is no longer offered for resuming."""
+        self._append(
+            {"type": "end", "step": step_count, "message": message, "time": time.time()}
+        )
+
+    def _prefix_unchanged(self, context: list[dict[str, Any]]) -> bool:
+        # Messages are only appended; checking the last written one is enough
+        # to notice a rewritten context without comparing everything.
+        if not self._written:
+            return True
+        index = len(self._written) - 1
+        return _compact(context[index]) == self._written[index]
+
+    def _append(self, record: dict[str, Any]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+
+def load_checkpoint(path: str) -> Checkpoint | None:
+    """
+    Rebuild a run's state from its checkpoint file.
+
+    A truncated last line (crash while writing) is ignored.
+
+    Args:
+        path: Checkpoint file path.
+
+    Returns:
+        Checkpoint, or None if the file has no valid start record.
+    """
+    checkpoint = None
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+
+        kind = record.get("type")
+        if kind == "start":
+            checkpoint = Checkpoint(
+                run_id=record["run_id"],
+                task=record["task"],
+                device_type=record.get("device_type"),
+                device_id=record.get("device_id"),
+                started_at=record.get("time", 0.0),
+                updated_at=record.get("time", 0.0),
+                path=path,
+            )
+        elif checkpoint is None:
+            continue
+        elif kind in ("step", "snapshot"):
+            if kind == "snapshot":
+                checkpoint.context = list(record["messages"])
+            else:
+                checkpoint.context.extend(record["messages"])
+            checkpoint.step_count = record["step"]
+            checkpoint.last_action = record.get("action")
+            checkpoint.updated_at = record.get("time", checkpoint.updated_at)
+        elif kind == "end":
+            checkpoint.finished = True
+            checkpoint.message = record.get("message")
+            checkpoint.updated_at = record.get("time", checkpoint.updated_at)
+
+    return checkpoint
+
+
+def list_checkpoints(
+    directory: str = DEFAULT_CHECKPOINT_DIR, include_finished: bool = False
+) -> list[Checkpoint]:
+    """
+    List checkpointed runs, most recently updated first.
+
+    Args:
+        directory: Directory with checkpoint files.
+        include_finished: Also list runs that finished.
+
+    Returns:
+        List of Checkpoint.
+    """
+    if not os.path.isdir(directory):
+        return []
+
+    checkpoints = []
+    for name in os.listdir(directory):
+        if not name.endswith(".jsonl"):
+            continue
+        checkpoint = load_checkpoint(os.path.join(directory, name))
+        if checkpoint is None or not checkpoint.context:
+            continue
+        if checkpoint.finished and not include_finished:
+            continue
+        checkpoints.append(checkpoint)
+
+    checkpoints.sort(key=lambda c: c.updated_at, reverse=True)
+    return checkpoints
+
+
+def latest_checkpoint(directory: str = DEFAULT_CHECKPOINT_DIR) -> Checkpoint | None:
+    """Get the most recently updated unfinished run, or None."""
+    checkpoints = list_checkpoints(directory)
+    return checkpoints[0] if checkpoints else None
+
+
+def _compact(message: dict[str, Any]) -> dict[str, Any]:
+    """Copy of a message without image parts."""
+    content = message.get("content")
+    if isinstance(content, list):
+        return {
+            **message,
+            "content": [item for item in content if item.get("type") == "text"],
+        }
+    return message
@@ -23,6 +23,11 @@ MESSAGES_ZH = {
     "time_to_first_token": "首 Token 延迟 (TTFT)",
     "time_to_thinking_end": "思考完成延迟",
     "total_inference_time": "总推理时间",
+    "no_progress": "任务没有进展",
+    "stuck_hint_no_op": "注意：最近几次操作后屏幕没有任何变化，重复同样的操作不会有效果。请换一种方式（例如点击其他位置、返回、滑动或重新打开应用）；如果任务无法完成，请结束任务并说明原因。",
+    "stuck_hint_cycle": "注意：最近的操作在几个页面之间来回循环，任务没有进展。请不要再重复这组操作，换一种方式继续；如果任务无法完成，请结束任务并说明原因。",
+    "stuck_takeover": "代理多次操作没有进展，请手动处理当前页面",
+    "stuck_abort": "多次操作没有进展，已提前结束任务",
 }
 
 # English messages
@@ -48,6 +53,11 @@ MESSAGES_EN = {
     "time_to_first_token": "Time to First Token (TTFT)",
     "time_to_thinking_end": "Time to Thinking End",
     "total_inference_time": "Total Inference Time",
+    "no_progress": "No progress",
+    "stuck_hint_no_op": "Note: the screen did not change after the last few actions, so repeating them will not help. Try something different (tap elsewhere, go back, scroll or relaunch the app); if the task cannot be completed, finish and explain why.",
+    "stuck_hint_cycle": "Note: the last actions keep cycling between the same pages without progress. Do not repeat this sequence; try a different approach, or finish and explain why if the task cannot be completed.",
+    "stuck_takeover": "The agent is not making progress, please handle the current screen manually",
+    "stuck_abort": "No progress after repeated actions, task stopped early",
 }
 
 
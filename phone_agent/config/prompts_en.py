@@ -44,6 +44,12 @@ Your output should STRICTLY follow the format:
   <answer>
   do(action="Swipe", start=[x1,y1], end=[x2,y2])
   </answer>
+- **Scroll**
+  Scroll the current list repeatedly without deciding on every swipe. direction is the direction the content scrolls (up, down, left, right); max_swipes is the maximum number of swipes. Scrolling stops at the end of the list (the screen no longer changes) or after max_swipes, and you receive the final screenshot with the number of swipes and whether the end was reached. Use it to get to the top or bottom of a list; use Swipe when you need to look at every page. The optional target="xxx" stops scrolling as soon as that text is on screen, e.g. do(action="Scroll", direction="down", target="Settings").
+  **Example**:
+  <answer>
+  do(action="Scroll", direction="down", max_swipes=5)
+  </answer>
 - **Long Press**
   Perform a long press action on a specified screen area.
   You can add the element to the action to specify the long press area. The element is a list of 2 integers, representing the coordinates of the long press point.
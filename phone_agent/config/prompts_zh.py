@@ -35,6 +35,8 @@ SYSTEM_PROMPT = (
     Interact是当有多个满足条件的选项时而触发的交互操作，询问用户如何选择。
 - do(action="Swipe", start=[x1,y1], end=[x2,y2])  
     Swipe是滑动操作，通过从起始坐标拖动到结束坐标来执行滑动手势。可用于滚动内容、在屏幕之间导航、下拉通知栏以及项目栏或进行基于手势的导航。坐标系统从左上角 (0,0) 开始到右下角（999,999)结束。滑动持续时间会自动调整以实现自然的移动。此操作完成后，您将自动收到结果状态的截图。
+- do(action="Scroll", direction="down", max_swipes=5)  
+    Scroll是连续滚动操作，在本地连续滑动当前列表，无需每次滑动都重新决策。direction 为内容滚动方向（up、down、left、right），max_swipes 为最多滑动次数。到达列表末尾（滑动后画面不再变化）或达到次数上限时停止，您将收到最终状态的截图以及滑动次数、是否已到末尾的说明。适用于需要滚动到列表顶部或底部等不需要查看中间页面的场景；需要逐页查找内容时请使用 Swipe。可选参数 target="xxx" 为要查找的文字，该文字出现在屏幕上时立即停止滚动，例如 do(action="Scroll", direction="down", target="设置")。
 - do(action="Note", message="True")  
     记录当前页面内容以便后续总结。
 - do(action="Call_API", instruction="xxx")  
@@ -18,6 +18,10 @@ class ActionTimingConfig:
     text_input_delay: float = 1.0  # Delay after typing text
     keyboard_restore_delay: float = 1.0  # Delay after restoring original keyboard
 
+    # Tap verification (before retrying a tap that changed nothing)
+    tap_verify_settle: float = 0.5  # Extra wait before re-checking the screen
+    tap_retry_offset: int = 0  # Pixels to shift the retried tap down and right
+
     def __post_init__(self):
         """Load values from environment variables if present."""
         self.keyboard_switch_delay = float(
@@ -32,6 +36,12 @@ class ActionTimingConfig:
         self.keyboard_restore_delay = float(
             os.getenv("PHONE_AGENT_KEYBOARD_RESTORE_DELAY", self.keyboard_restore_delay)
         )
+        self.tap_verify_settle = float(
+            os.getenv("PHONE_AGENT_TAP_VERIFY_SETTLE", self.tap_verify_settle)
+        )
+        self.tap_retry_offset = int(
+            os.getenv("PHONE_AGENT_TAP_RETRY_OFFSET", self.tap_retry_offset)
+        )
 
 
 @dataclass
@@ -47,6 +57,21 @@ class DeviceTimingConfig:
     default_back_delay: float = 1.0  # Default delay after back button
     default_home_delay: float = 1.0  # Default delay after home button
     default_launch_delay: float = 1.0  # Default delay after launching app
+    launch_settle_delay: float = 0.3  # Delay after a launch whose timing was measured
+
+    # Swipe gesture durations (ADB): distance / speed, clamped to [min, max]
+    swipe_speed: float = 2.0  # Pixels per millisecond for long swipes
+    swipe_min_duration: int = 400  # Short drags stay slow enough to be precise (ms)
+    swipe_max_duration: int = 1000  # Upper bound for long swipes (ms)
+
+    # Local scrolling (Scroll action)
+    scroll_settle_delay: float = 0.3  # Delay between frames while waiting for content to settle
+    scroll_settle_timeout: float = 2.0  # Max time to wait for content to settle after a swipe
+    scroll_max_swipes: int = 10  # Upper bound on swipes per Scroll action
+
+    # Bounds on device commands (see phone_agent.deadline)
+    command_timeout: float = 10.0  # Timeout of a single adb/hdc command without its own
+    step_timeout: float = 60.0  # Device time per agent step, excluding the model request
 
     def __post_init__(self):
         """Load values from environment variables if present."""
@@ -74,6 +99,31 @@ class DeviceTimingConfig:
         self.default_launch_delay = float(
             os.getenv("PHONE_AGENT_LAUNCH_DELAY", self.default_launch_delay)
         )
+        self.launch_settle_delay = float(
+            os.getenv("PHONE_AGENT_LAUNCH_SETTLE_DELAY", self.launch_settle_delay)
+        )
+        self.swipe_speed = float(os.getenv("PHONE_AGENT_SWIPE_SPEED", self.swipe_speed))
+        self.swipe_min_duration = int(
+            os.getenv("PHONE_AGENT_SWIPE_MIN_DURATION", self.swipe_min_duration)
+        )
+        self.swipe_max_duration = int(
+            os.getenv("PHONE_AGENT_SWIPE_MAX_DURATION", self.swipe_max_duration)
+        )
+        self.scroll_settle_delay = float(
+            os.getenv("PHONE_AGENT_SCROLL_SETTLE_DELAY", self.scroll_settle_delay)
+        )
+        self.scroll_settle_timeout = float(
+            os.getenv("PHONE_AGENT_SCROLL_SETTLE_TIMEOUT", self.scroll_settle_timeout)
+        )
+        self.scroll_max_swipes = int(
+            os.getenv("PHONE_AGENT_SCROLL_MAX_SWIPES", self.scroll_max_swipes)
+        )
+        self.command_timeout = float(
+            os.getenv("PHONE_AGENT_COMMAND_TIMEOUT", self.command_timeout)
+        )
+        self.step_timeout = float(
+            os.getenv("PHONE_AGENT_STEP_TIMEOUT", self.step_timeout)
+        )
 
 
 @dataclass
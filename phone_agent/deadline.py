@@ -0,0 +1,194 @@
+"""Per-step deadlines that bound every device command run during a step."""
+
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+# How often a running command checks whether its deadline was cancelled
+_POLL_INTERVAL = 0.2
+
+_current: ContextVar["Deadline | None"] = ContextVar("phone_agent_deadline", default=None)
+
+
+class DeviceTimeoutError(subprocess.TimeoutExpired):
+    """
+    A device command ran out of time.
+
+    Subclasses subprocess.TimeoutExpired, so code that already handles
+    command timeouts handles deadline timeouts too.
+
+    Attributes:
+        cmd: The command (argument list, or "WDA endpoint" for HTTP calls).
+        timeout: Seconds the command was allowed.
+        cancelled: True if the deadline was cancelled (the run was stopped)
+            rather than exhausted.
+    """
+
+    def __init__(self, cmd, timeout: float, cancelled: bool = False, output=None, stderr=None):
+        super().__init__(cmd, timeout, output, stderr)
+        self.cancelled = cancelled
+
+    @property
+    def command(self) -> str:
+        """The command as one string."""
+        return self.cmd if isinstance(self.cmd, str) else " ".join(map(str, self.cmd))
+
+    def __str__(self) -> str:
+        if self.cancelled:
+            return f"Device command '{self.command}' was stopped"
+        if not self.timeout:
+            return f"Device command '{self.command}' not run: step deadline exhausted"
+        return f"Device command '{self.command}' timed out after {self.timeout:.1f}s"
+
+
+class Deadline:
+    """
+    Time budget shared by the device commands of one agent step.
+
+    While a deadline is active (`with deadline:`), run_command() and
+    command_timeout() give each call at most the remaining budget, so a
+    wedged adb/hdc server or WDA cannot hold a step longer than the budget.
+    cancel() makes running and further commands fail right away, which is
+    how a stop request interrupts a step. The active deadline is kept in a
+    context variable, so threads and asyncio tasks each see their own.
+
+    Args:
+        budget: Seconds available to the step's device commands.
+
+    Example:
+        >>> with Deadline(30) as deadline:
+        ...     run_command(["adb", "shell", "dumpsys", "window"], timeout=10)
+        ...     with deadline.paused():
+        ...         response = model_client.request(context)
+    """
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self._expires = time.monotonic() + budget
+        self._cancelled = threading.Event()
+        self._tokens: list = []
+
+    def __enter__(self) -> "Deadline":
+        self._tokens.append(_current.set(self))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _current.reset(self._tokens.pop())
+
+    def remaining(self) -> float:
+        """Seconds left (0 once expired or cancelled)."""
+        if self._cancelled.is_set():
+            return 0.0
+        return max(0.0, self._expires - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether no time is left."""
+        return self.remaining() <= 0
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() was called."""
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Stop running commands and fail further ones (thread-safe)."""
+        self._cancelled.set()
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Do not count the time spent in the block (e.g. the model request)."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._expires += time.monotonic() - started
+
+
+def current_deadline() -> Deadline | None:
+    """The deadline active in this thread or task, if any."""
+    return _current.get()
+
+
+@contextmanager
+def pause_deadline() -> Iterator[None]:
+    """Pause the active deadline, if any, while waiting on a person or the model."""
+    deadline = _current.get()
+    if deadline is None:
+        yield
+        return
+    with deadline.paused():
+        yield
+
+
+def command_timeout(timeout: float | None, cmd="device command") -> float | None:
+    """
+    Timeout for one device call: its own timeout capped by the active deadline.
+
+    Args:
+        timeout: The call's own timeout in seconds (None for no limit).
+        cmd: Command description for the error.
+
+    Returns:
+        Seconds the call may take.
+
+    Raises:
+        DeviceTimeoutError: If the active deadline has expired or was cancelled.
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return timeout
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise DeviceTimeoutError(cmd, 0.0, cancelled=deadline.cancelled)
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def run_command(
+    cmd: list, timeout: float | None = None, capture_output: bool = False, **kwargs
+) -> subprocess.CompletedProcess:
+    """
+    Run a command like subprocess.run, bounded by its timeout and the active deadline.
+
+    The command is killed when either runs out, and within _POLL_INTERVAL of
+    the deadline being cancelled.
+
+    Args:
+        cmd: Command list to execute.
+        timeout: The command's own timeout in seconds.
+        capture_output: Capture stdout and stderr.
+        **kwargs: Additional arguments for subprocess.Popen (text, encoding, ...).
+
+    Returns:
+        CompletedProcess result.
+
+    Raises:
+        DeviceTimeoutError: If the command timed out or the deadline was cancelled.
+    """
+    limit = command_timeout(timeout, cmd)
+    if capture_output:
+        kwargs["stdout"] = kwargs["stderr"] = subprocess.PIPE
+
+    deadline = _current.get()
+    started = time.monotonic()
+    with subprocess.Popen(cmd, **kwargs) as process:
+        while True:
+            wait = None if limit is None else max(0.0, limit - (time.monotonic() - started))
+            if deadline is not None:
+                wait = _POLL_INTERVAL if wait is None else min(wait, _POLL_INTERVAL)
+            try:
+                stdout, stderr = process.communicate(timeout=wait)
+                break
+            except subprocess.TimeoutExpired:
+                timed_out = limit is not None and time.monotonic() - started >= limit
+                cancelled = deadline is not None and deadline.cancelled
+                if timed_out or cancelled:
+                    process.kill()
+                    stdout, stderr = process.communicate()
+                    raise DeviceTimeoutError(
+                        cmd, limit or 0.0, cancelled=cancelled, output=stdout, stderr=stderr
+                    ) from None
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
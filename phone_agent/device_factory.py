@@ -17,18 +17,47 @@ class DeviceFactory:
     Factory class for getting device-specific implementations.
 
     This allows the system to work with both Android (ADB) and HarmonyOS (HDC) devices.
+
+    A factory created with a device_id is a handle for that one device: calls
+    that do not pass a device_id go to it. Each PhoneAgent can be given its
+    own handle, so one process can drive ADB and HDC devices side by side.
+
+    Example:
+        >>> android = DeviceFactory(DeviceType.ADB, "emulator-5554")
+        >>> harmony = DeviceFactory(DeviceType.HDC, "FMR0223C13000649")
+        >>> android.tap(500, 1000)
+        >>> harmony.get_screenshot()
     """
 
-    def __init__(self, device_type: DeviceType = DeviceType.ADB):
+    def __init__(
+        self, device_type: DeviceType = DeviceType.ADB, device_id: str | None = None
+    ):
         """
         Initialize the device factory.
 
         Args:
             device_type: The type of device to use (ADB or HDC).
+            device_id: Optional device ID used when a call does not pass one.
         """
         self.device_type = device_type
+        self.device_id = device_id
         self._module = None
 
+    def __repr__(self) -> str:
+        return f"DeviceFactory({self.device_type}, device_id={self.device_id!r})"
+
+    def for_device(self, device_id: str | None) -> "DeviceFactory":
+        """
+        Get a handle of the same device type bound to another device.
+
+        Args:
+            device_id: Device ID for the new handle.
+
+        Returns:
+            A new DeviceFactory bound to device_id.
+        """
+        return DeviceFactory(self.device_type, device_id)
+
     @property
     def module(self):
         """Get the appropriate device module (adb or hdc)."""
@@ -45,25 +74,38 @@ class DeviceFactory:
                 raise ValueError(f"Unknown device type: {self.device_type}")
         return self._module
 
+    def _resolve(self, device_id: str | None) -> str | None:
+        return device_id or self.device_id
+
     def get_screenshot(self, device_id: str | None = None, timeout: int = 10):
         """Get screenshot from device."""
-        return self.module.get_screenshot(device_id, timeout)
+        return self.module.get_screenshot(self._resolve(device_id), timeout)
 
     def get_current_app(self, device_id: str | None = None) -> str:
         """Get current app name."""
-        return self.module.get_current_app(device_id)
+        return self.module.get_current_app(self._resolve(device_id))
+
+    def get_ui_tree(
+        self,
+        device_id: str | None = None,
+        timeout: int = 10,
+        width: int = 0,
+        height: int = 0,
+    ):
+        """Get the compacted UI hierarchy, or None if it cannot be dumped."""
+        return self.module.get_ui_tree(self._resolve(device_id), timeout, width, height)
 
     def tap(
         self, x: int, y: int, device_id: str | None = None, delay: float | None = None
     ):
         """Tap at coordinates."""
-        return self.module.tap(x, y, device_id, delay)
+        return self.module.tap(x, y, self._resolve(device_id), delay)
 
     def double_tap(
         self, x: int, y: int, device_id: str | None = None, delay: float | None = None
     ):
         """Double tap at coordinates."""
-        return self.module.double_tap(x, y, device_id, delay)
+        return self.module.double_tap(x, y, self._resolve(device_id), delay)
 
     def long_press(
         self,
@@ -74,7 +116,7 @@ class DeviceFactory:
         delay: float | None = None,
     ):
         """Long press at coordinates."""
-        return self.module.long_press(x, y, duration_ms, device_id, delay)
+        return self.module.long_press(x, y, duration_ms, self._resolve(device_id), delay)
 
     def swipe(
         self,
@@ -88,38 +130,38 @@ class DeviceFactory:
     ):
         """Swipe from start to end."""
         return self.module.swipe(
-            start_x, start_y, end_x, end_y, duration_ms, device_id, delay
+            start_x, start_y, end_x, end_y, duration_ms, self._resolve(device_id), delay
         )
 
     def back(self, device_id: str | None = None, delay: float | None = None):
         """Press back button."""
-        return self.module.back(device_id, delay)
+        return self.module.back(self._resolve(device_id), delay)
 
     def home(self, device_id: str | None = None, delay: float | None = None):
         """Press home button."""
-        return self.module.home(device_id, delay)
+        return self.module.home(self._resolve(device_id), delay)
 
     def launch_app(
         self, app_name: str, device_id: str | None = None, delay: float | None = None
     ) -> bool:
         """Launch an app."""
-        return self.module.launch_app(app_name, device_id, delay)
+        return self.module.launch_app(app_name, self._resolve(device_id), delay)
 
     def type_text(self, text: str, device_id: str | None = None):
         """Type text."""
-        return self.module.type_text(text, device_id)
+        return self.module.type_text(text, self._resolve(device_id))
 
     def clear_text(self, device_id: str | None = None):
         """Clear text."""
-        return self.module.clear_text(device_id)
+        return self.module.clear_text(self._resolve(device_id))
 
     def detect_and_set_adb_keyboard(self, device_id: str | None = None) -> str:
         """Detect and set keyboard."""
-        return self.module.detect_and_set_adb_keyboard(device_id)
+        return self.module.detect_and_set_adb_keyboard(self._resolve(device_id))
 
     def restore_keyboard(self, ime: str, device_id: str | None = None):
         """Restore keyboard."""
-        return self.module.restore_keyboard(ime, device_id)
+        return self.module.restore_keyboard(ime, self._resolve(device_id))
 
     def list_devices(self):
         """List connected devices."""
@@ -147,6 +189,10 @@ def set_device_type(device_type: DeviceType):
     """
     Set the global device type.
 
+    Kept for compatibility: code that does not inject a DeviceFactory into
+    PhoneAgent/ActionHandler uses the global one. Prefer creating one
+    DeviceFactory per device.
+
     Args:
         device_type: The device type to use (ADB or HDC).
     """
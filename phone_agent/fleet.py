@@ -0,0 +1,405 @@
+"""Fleet runner for executing a queue of tasks across many devices."""
+
+import json
+import threading
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable
+
+from phone_agent.actions import verify
+from phone_agent.agent import AgentConfig, PhoneAgent
+from phone_agent.device_factory import DeviceFactory, DeviceType
+from phone_agent.model import ModelClient, ModelConfig
+
+
+@dataclass
+class FleetTask:
+    """A task for the fleet, optionally pinned to a device or device type."""
+
+    task: str
+    task_id: str | None = None
+    device_id: str | None = None  # Run only on this device
+    device_type: DeviceType | None = None  # Run only on devices of this type
+    max_steps: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "FleetTask":
+        """Create a task from a JSON object like {"task": ..., "device_type": "hdc"}."""
+        device_type = data.get("device_type")
+        return cls(
+            task=data["task"],
+            task_id=data.get("task_id") or data.get("id"),
+            device_id=data.get("device_id"),
+            device_type=DeviceType(device_type.lower()) if device_type else None,
+            max_steps=data.get("max_steps"),
+        )
+
+    def accepts(self, device: "FleetDevice") -> bool:
+        """Whether the task may run on a device."""
+        if self.device_id and self.device_id != device.device_id:
+            return False
+        if self.device_type and self.device_type != device.device_type:
+            return False
+        return True
+
+
+@dataclass
+class FleetDevice:
+    """A device in the fleet."""
+
+    device_id: str
+    device_type: DeviceType
+    model: str | None = None
+
+
+@dataclass
+class TaskResult:
+    """Outcome of one fleet task, written as one JSONL line."""
+
+    task_id: str
+    task: str
+    device_id: str | None
+    device_type: str | None
+    success: bool
+    message: str
+    steps: int = 0
+    started_at: float = 0.0
+    elapsed: float = 0.0  # Wall-clock seconds for the whole task
+    model_time: float = 0.0  # Seconds spent in model requests
+    model_wait: float = 0.0  # Seconds spent waiting for a model slot
+    model_calls_saved: int = 0  # Steps replayed from a recorded trajectory
+    stalls: int = 0  # Times the agent was detected making no progress
+    steps_saved: int = 0  # Step budget left unused by stopping a stuck task early
+    tap_retries: int = 0  # Taps repeated locally because they had no visible effect
+    taps_recovered: int = 0  # Taps that took effect after waiting longer or the retry
+    timeouts: int = 0  # Steps in which a device command ran out of time
+    actions: list[str] = field(default_factory=list)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+
+def discover_devices(
+    device_types: list[DeviceType] | None = None,
+    device_ids: list[str] | None = None,
+) -> list[FleetDevice]:
+    """
+    List online devices of the given types.
+
+    Args:
+        device_types: Device types to look for (default: ADB and HDC).
+        device_ids: Optional allow-list of device IDs.
+
+    Returns:
+        Devices that are online, in listing order.
+    """
+    devices = []
+    for device_type in device_types or [DeviceType.ADB, DeviceType.HDC]:
+        try:
+            listed = DeviceFactory(device_type).get_connection_class()().list_devices()
+        except Exception as e:
+            print(f"[Fleet] Could not list {device_type.value} devices: {e}")
+            continue
+        for info in listed:
+            if info.status != "device":
+                continue
+            if device_ids and info.device_id not in device_ids:
+                continue
+            devices.append(FleetDevice(info.device_id, device_type, info.model))
+    return devices
+
+
+class _ThrottledModelClient:
+    """ModelClient proxy that limits concurrent requests with a shared semaphore."""
+
+    def __init__(self, client: ModelClient, semaphore: threading.Semaphore):
+        self._client = client
+        self._semaphore = semaphore
+        self.model_time = 0.0
+        self.model_wait = 0.0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def request(self, messages: list[dict[str, Any]]):
+        start = time.time()
+        with self._semaphore:
+            acquired = time.time()
+            self.model_wait += acquired - start
+            try:
+                return self._client.request(messages)
+            finally:
+                self.model_time += time.time() - acquired
+
+
+class FleetRunner:
+    """
+    Runs a shared queue of tasks on many devices, one agent per device.
+
+    Every device gets a worker thread that repeatedly takes the first queued
+    task it is allowed to run (device affinity or device type), drives a
+    PhoneAgent step by step and reports the outcome. Model requests from all
+    devices share a semaphore so at most max_model_concurrency requests hit
+    the endpoint at once; screenshots and actions keep running in parallel.
+
+    Args:
+        model_config: Model configuration shared by all agents.
+        devices: Devices to run on (see discover_devices()).
+        max_model_concurrency: Maximum concurrent model requests.
+        max_steps: Default step limit per task.
+        lang: Prompt language.
+        verbose: Whether agents print their steps.
+        results_path: Optional JSONL file that results are appended to.
+        auto_confirm: Answer sensitive-action confirmations with yes instead
+            of no (there is nobody to ask in an unattended fleet).
+        on_result: Optional callback called with each TaskResult.
+        trajectory_db: Optional SQLite file for recording successful task
+            trajectories and replaying them on later runs of the same task.
+
+    Example:
+        >>> runner = FleetRunner(ModelConfig(), discover_devices())
+        >>> results = runner.run([FleetTask("打开微信"), FleetTask("打开设置")])
+    """
+
+    def __init__(
+        self,
+        model_config: ModelConfig,
+        devices: list[FleetDevice],
+        max_model_concurrency: int = 4,
+        max_steps: int = 100,
+        lang: str = "cn",
+        verbose: bool = False,
+        results_path: str | None = None,
+        auto_confirm: bool = False,
+        on_result: Callable[[TaskResult], None] | None = None,
+        trajectory_db: str | None = None,
+    ):
+        self.model_config = model_config
+        self.devices = devices
+        self.max_steps = max_steps
+        self.lang = lang
+        self.verbose = verbose
+        self.results_path = results_path
+        self.auto_confirm = auto_confirm
+        self.on_result = on_result
+        self.trajectory_db = trajectory_db
+
+        self._model_slots = threading.Semaphore(max(1, max_model_concurrency))
+        self._queue: list[FleetTask] = []
+        self._queue_lock = threading.Lock()
+        self._results: list[TaskResult] = []
+        self._results_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._running: set[PhoneAgent] = set()  # Agents with a task in progress
+
+    def stop(self) -> None:
+        """Stop taking new tasks and interrupt the current step of running tasks."""
+        self._stop.set()
+        with self._results_lock:
+            for agent in self._running:
+                agent.stop()
+
+    def run(self, tasks: list[FleetTask]) -> list[TaskResult]:
+        """
+        Run all tasks and wait until they are done.
+
+        Tasks that no device can run are reported as failed without running.
+
+        Args:
+            tasks: Tasks to run, in priority order.
+
+        Returns:
+            One TaskResult per task, in completion order.
+        """
+        self._results = []
+        self._stop.clear()
+
+        for number, task in enumerate(tasks, 1):
+            task.task_id = task.task_id or str(number)
+            if any(task.accepts(device) for device in self.devices):
+                self._queue.append(task)
+            else:
+                self._report(
+                    TaskResult(
+                        task.task_id,
+                        task.task,
+                        task.device_id,
+                        task.device_type.value if task.device_type else None,
+                        False,
+                        "No matching device",
+                    )
+                )
+
+        workers = [
+            threading.Thread(
+                target=self._worker, args=(device,), name=f"fleet-{device.device_id}", daemon=True
+            )
+            for device in self.devices
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        # Left over only after stop()
+        with self._queue_lock:
+            remaining, self._queue = self._queue, []
+        for task in remaining:
+            self._report(
+                TaskResult(
+                    task.task_id,
+                    task.task,
+                    task.device_id,
+                    task.device_type.value if task.device_type else None,
+                    False,
+                    "Not started",
+                )
+            )
+
+        return list(self._results)
+
+    def _next_task(self, device: FleetDevice) -> FleetTask | None:
+        """
+        Take the next queued task this device may run.
+
+        Tasks pinned to this device come first, then tasks for its device
+        type, then unconstrained ones, so a device does not spend its time on
+        work any other device could do while tasks only it can run wait.
+        """
+        with self._queue_lock:
+            if self._stop.is_set():
+                return None
+            candidates = [
+                (0 if task.device_id else 1 if task.device_type else 2, index)
+                for index, task in enumerate(self._queue)
+                if task.accepts(device)
+            ]
+            if not candidates:
+                return None
+            return self._queue.pop(min(candidates)[1])
+
+    def _worker(self, device: FleetDevice) -> None:
+        factory = DeviceFactory(device.device_type, device.device_id)
+        while True:
+            task = self._next_task(device)
+            if task is None:
+                break
+            self._report(self._run_task(task, device, factory))
+
+    def _run_task(
+        self, task: FleetTask, device: FleetDevice, factory: DeviceFactory
+    ) -> TaskResult:
+        takeovers: list[str] = []
+        agent = PhoneAgent(
+            model_config=self.model_config,
+            agent_config=AgentConfig(
+                max_steps=task.max_steps or self.max_steps,
+                device_id=device.device_id,
+                lang=self.lang,
+                verbose=self.verbose,
+                trajectory_db=self.trajectory_db,
+            ),
+            confirmation_callback=lambda message: self.auto_confirm,
+            takeover_callback=takeovers.append,
+            device_factory=factory,
+        )
+        model = _ThrottledModelClient(agent.model_client, self._model_slots)
+        agent.model_client = model
+
+        result = TaskResult(
+            task.task_id,
+            task.task,
+            device.device_id,
+            device.device_type.value,
+            False,
+            "Max steps reached",
+            started_at=time.time(),
+        )
+        print(f"[Fleet] {device.device_id}: start #{task.task_id} {task.task}")
+
+        with self._results_lock:
+            self._running.add(agent)
+        try:
+            step = agent.step(task.task)
+            while True:
+                result.timeouts += step.timed_out
+                if step.action and step.action.get("action"):
+                    result.actions.append(step.action["action"])
+                if step.finished:
+                    result.success = step.success
+                    result.message = step.message or "Task completed"
+                    break
+                if takeovers:
+                    result.message = f"Takeover requested: {takeovers[-1]}"
+                    break
+                if self._stop.is_set():
+                    result.message = "Stopped"
+                    break
+                if agent.step_count >= agent.agent_config.max_steps:
+                    break
+                step = agent.step()
+        except Exception as e:
+            if self.verbose:
+                traceback.print_exc()
+            result.message = f"Error: {e}"
+        finally:
+            with self._results_lock:
+                self._running.discard(agent)
+
+        result.steps = agent.step_count
+        result.elapsed = time.time() - result.started_at
+        result.model_time = model.model_time
+        result.model_wait = model.model_wait
+        result.model_calls_saved = agent.model_calls_saved
+        progress = agent.progress_stats
+        result.stalls = progress["stalls"]
+        result.steps_saved = progress["steps_saved"]
+        taps = agent.tap_stats
+        result.tap_retries = taps.get(verify.CHANGED_AFTER_RETRY, 0) + taps.get(
+            verify.NO_CHANGE, 0
+        )
+        result.taps_recovered = taps.get(verify.CHANGED_AFTER_SETTLE, 0) + taps.get(
+            verify.CHANGED_AFTER_RETRY, 0
+        )
+        return result
+
+    def _report(self, result: TaskResult) -> None:
+        with self._results_lock:
+            self._results.append(result)
+            if self.results_path:
+                with open(self.results_path, "a", encoding="utf-8") as f:
+                    f.write(result.to_json() + "\n")
+        status = "✅" if result.success else "❌"
+        print(
+            f"[Fleet] {status} #{result.task_id} on {result.device_id or '-'} "
+            f"{result.steps} steps {result.elapsed:.1f}s: {result.message}"
+        )
+        if self.on_result:
+            self.on_result(result)
+
+
+def load_tasks(path: str) -> list[FleetTask]:
+    """
+    Load tasks from a file.
+
+    Each non-empty line is either a JSON object (see FleetTask.from_dict) or
+    a plain task description. Lines starting with # are ignored.
+
+    Args:
+        path: Path to the task file.
+
+    Returns:
+        List of FleetTask.
+    """
+    tasks = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                tasks.append(FleetTask.from_dict(json.loads(line)))
+            else:
+                tasks.append(FleetTask(line))
+    return tasks
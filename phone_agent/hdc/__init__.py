@@ -1,5 +1,6 @@
 """HDC utilities for HarmonyOS device interaction."""
 
+from phone_agent.hdc.batch import BatchResult, BatchTimeoutError, OperationResult, UitestBatch
 from phone_agent.hdc.connection import (
     HDCConnection,
     ConnectionType,
@@ -18,12 +19,19 @@ from phone_agent.hdc.device import (
     swipe,
     tap,
 )
+from phone_agent.hdc.hierarchy import get_ui_tree
 from phone_agent.hdc.input import (
     clear_text,
     detect_and_set_adb_keyboard,
     restore_keyboard,
+    send_key_events,
     type_text,
 )
+from phone_agent.hdc.launcher import (
+    LaunchResult,
+    get_launch_stats,
+    launch_bundle,
+)
 from phone_agent.hdc.screenshot import get_screenshot
 
 __all__ = [
@@ -34,6 +42,14 @@ __all__ = [
     "clear_text",
     "detect_and_set_adb_keyboard",
     "restore_keyboard",
+    "send_key_events",
+    # Batched uitest operations
+    "UitestBatch",
+    "BatchResult",
+    "BatchTimeoutError",
+    "OperationResult",
+    # UI hierarchy
+    "get_ui_tree",
     # Device control
     "get_current_app",
     "tap",
@@ -43,6 +59,10 @@ __all__ = [
     "double_tap",
     "long_press",
     "launch_app",
+    # Launcher
+    "launch_bundle",
+    "get_launch_stats",
+    "LaunchResult",
     # Connection management
     "HDCConnection",
     "DeviceInfo",
@@ -0,0 +1,242 @@
+"""Batched uitest operations over a single hdc shell invocation."""
+
+import shlex
+from dataclasses import dataclass, field
+
+from phone_agent.config.timing import TIMING_CONFIG
+from phone_agent.deadline import DeviceTimeoutError
+from phone_agent.hdc.connection import _run_hdc_command
+
+# HarmonyOS key codes used by the input helpers
+KEY_ENTER = "2054"
+KEY_DELETE = "2055"
+KEY_CTRL_LEFT = "2072"
+KEY_A = "2017"
+
+_BEGIN = "__PA_OP_BEGIN_{}__"
+_END = "__PA_OP_END_{}__"
+
+# Time allowed per operation on top of the command timeout, and per typed
+# character for text operations (uitest types text key by key)
+_OPERATION_SECONDS = 1.0
+_TEXT_SECONDS_PER_CHAR = 0.05
+
+
+@dataclass
+class OperationResult:
+    """Result of one operation in a batch."""
+
+    index: int
+    args: list[str]
+    success: bool
+    exit_code: int | None
+    output: str = ""
+
+
+@dataclass
+class BatchResult:
+    """Per-operation report of a batch run."""
+
+    operations: list[OperationResult] = field(default_factory=list)
+    returncode: int | None = None
+
+    @property
+    def success(self) -> bool:
+        """True if every operation ran and succeeded."""
+        return bool(self.operations) and all(op.success for op in self.operations)
+
+    @property
+    def failed(self) -> list[OperationResult]:
+        """Operations that failed or did not run."""
+        return [op for op in self.operations if not op.success]
+
+
+class BatchTimeoutError(DeviceTimeoutError):
+    """
+    A batch ran out of time or was stopped partway through.
+
+    Attributes:
+        result: BatchResult parsed from the output received before the
+            batch was killed; operations that did not finish have
+            exit_code None.
+    """
+
+    def __init__(self, error: DeviceTimeoutError, result: BatchResult):
+        super().__init__(error.cmd, error.timeout, error.cancelled, error.output, error.stderr)
+        self.result = result
+
+    @property
+    def command(self) -> str:
+        return "hdc shell uitest batch"
+
+    def __str__(self) -> str:
+        operations = self.result.operations
+        done = sum(op.exit_code is not None for op in operations)
+        message = f"{super().__str__()}; {done} of {len(operations)} operations completed"
+        if done < len(operations):
+            args = operations[done].args
+            message += f" (interrupted: {' '.join(args[2:])[:40]})"
+        return message
+
+
+class UitestBatch:
+    """
+    Composes a sequence of uitest operations into one hdc shell command.
+
+    Every `hdc shell` call costs a host-device round trip, so typing a
+    multi-line message line by line used to start one process per line and
+    per ENTER key. A batch sends all operations in a single shell script and
+    brackets each with markers so its exit code and output can be reported
+    separately.
+
+    Args:
+        device_id: Optional HDC device ID for multi-device setups.
+        stop_on_error: Skip the remaining operations after the first failure.
+
+    Example:
+        >>> batch = UitestBatch()
+        >>> batch.text("first line").key_event(KEY_ENTER).text("second line")
+        >>> result = batch.run()
+        >>> result.success
+        True
+    """
+
+    def __init__(self, device_id: str | None = None, stop_on_error: bool = False):
+        self.device_id = device_id
+        self.stop_on_error = stop_on_error
+        self._operations: list[list[str]] = []
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def add(self, *args: str) -> "UitestBatch":
+        """Add a raw `uitest uiInput` operation, e.g. add("click", "100", "200")."""
+        self._operations.append(["uitest", "uiInput", *map(str, args)])
+        return self
+
+    def text(self, text: str) -> "UitestBatch":
+        """Type text into the focused field (empty text is skipped)."""
+        if text:
+            self.add("text", text)
+        return self
+
+    def key_event(self, *codes: str) -> "UitestBatch":
+        """Send a key event; several codes form a key combination."""
+        return self.add("keyEvent", *codes)
+
+    def click(self, x: int, y: int) -> "UitestBatch":
+        """Tap at the given coordinates."""
+        return self.add("click", str(x), str(y))
+
+    def build_script(self) -> str:
+        """Build the device shell script for the queued operations."""
+        return _build_script(self._operations, self.stop_on_error)
+
+    def timeout(self) -> float:
+        """
+        Default timeout for the queued operations.
+
+        The command timeout plus a share per operation and per typed
+        character, so a long multi-line Type is not cut off halfway.
+        """
+        seconds = TIMING_CONFIG.device.command_timeout
+        for args in self._operations:
+            seconds += _OPERATION_SECONDS
+            if args[2] == "text":
+                seconds += _TEXT_SECONDS_PER_CHAR * len(args[3])
+        return seconds
+
+    def run(self, timeout: float | None = None) -> BatchResult:
+        """
+        Run all queued operations in one hdc shell invocation.
+
+        Args:
+            timeout: Timeout in seconds for the whole batch (default:
+                timeout(), scaled with the operations).
+
+        Returns:
+            BatchResult with one OperationResult per queued operation.
+            Operations that did not run are reported with exit_code None.
+
+        Raises:
+            BatchTimeoutError: If the batch timed out or the step was
+                stopped; its result tells which operations completed.
+        """
+        if timeout is None:
+            timeout = self.timeout()
+        operations, self._operations = self._operations, []
+        if not operations:
+            return BatchResult()
+
+        script = _build_script(operations, self.stop_on_error)
+        prefix = ["hdc", "-t", self.device_id] if self.device_id else ["hdc"]
+        try:
+            result = _run_hdc_command(
+                prefix + ["shell", script],
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                timeout=timeout,
+            )
+        except DeviceTimeoutError as e:
+            output = e.output or ""
+            if isinstance(output, bytes):
+                output = output.decode("utf-8", errors="replace")
+            raise BatchTimeoutError(e, BatchResult(_parse_report(operations, output))) from None
+        except Exception as e:
+            return BatchResult(
+                [OperationResult(i, args, False, None, str(e)) for i, args in enumerate(operations)]
+            )
+
+        return BatchResult(
+            _parse_report(operations, result.stdout or ""), result.returncode
+        )
+
+
+def _build_script(operations: list[list[str]], stop_on_error: bool) -> str:
+    """Join operations into one shell script, each bracketed by markers."""
+    parts = []
+    for index, args in enumerate(operations):
+        command = " ".join(shlex.quote(arg) for arg in args)
+        parts.append(
+            f"echo {_BEGIN.format(index)}; {command} 2>&1; "
+            f"rc=$?; echo {_END.format(index)} $rc"
+        )
+        if stop_on_error:
+            parts.append('[ "$rc" -eq 0 ] || exit $rc')
+    return "; ".join(parts)
+
+
+def _parse_report(operations: list[list[str]], output: str) -> list[OperationResult]:
+    """Split batch output into per-operation results using the markers."""
+    results = []
+    lines = output.replace("\r\n", "\n").split("\n")
+    position = 0
+
+    for index, args in enumerate(operations):
+        begin, end = _BEGIN.format(index), _END.format(index)
+        exit_code, captured = None, []
+
+        try:
+            position = lines.index(begin, position) + 1
+        except ValueError:
+            results.append(OperationResult(index, args, False, None))
+            continue
+
+        while position < len(lines):
+            line = lines[position]
+            position += 1
+            if line.startswith(end):
+                try:
+                    exit_code = int(line[len(end):].strip())
+                except ValueError:
+                    exit_code = None
+                break
+            captured.append(line)
+
+        text = "\n".join(captured).strip()
+        success = exit_code == 0 and "fail" not in text.lower()
+        results.append(OperationResult(index, args, success, exit_code, text))
+
+    return results
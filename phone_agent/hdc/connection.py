@@ -8,6 +8,7 @@ from enum import Enum
 from typing import Optional
 
 from phone_agent.config.timing import TIMING_CONFIG
+from phone_agent.deadline import run_command
 
 
 # Global flag to control HDC command output
@@ -18,17 +19,24 @@ def _run_hdc_command(cmd: list, **kwargs) -> subprocess.CompletedProcess:
     """
     Run HDC command with optional verbose output.
 
+    Commands without a timeout get TIMING_CONFIG.device.command_timeout, and
+    all are bounded by the active step deadline (see phone_agent.deadline).
+
     Args:
         cmd: Command list to execute.
         **kwargs: Additional arguments for subprocess.run.
 
     Returns:
         CompletedProcess result.
+
+    Raises:
+        DeviceTimeoutError: If the command timed out or the deadline was cancelled.
     """
     if _HDC_VERBOSE:
         print(f"[HDC] Running command: {' '.join(cmd)}")
 
-    result = subprocess.run(cmd, **kwargs)
+    kwargs.setdefault("timeout", TIMING_CONFIG.device.command_timeout)
+    result = run_command(cmd, **kwargs)
 
     if _HDC_VERBOSE and result.returncode != 0:
         print(f"[HDC] Command failed with return code {result.returncode}")
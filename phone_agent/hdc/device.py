@@ -5,9 +5,11 @@ import subprocess
 import time
 from typing import List, Optional, Tuple
 
-from phone_agent.config.apps_harmonyos import APP_ABILITIES, APP_PACKAGES
+from phone_agent.app_index import is_package_name
+from phone_agent.config.apps_harmonyos import APP_PACKAGES
 from phone_agent.config.timing import TIMING_CONFIG
 from phone_agent.hdc.connection import _run_hdc_command
+from phone_agent.hdc.launcher import launch_bundle
 
 
 def get_current_app(device_id: str | None = None) -> str:
@@ -32,7 +34,11 @@ def get_current_app(device_id: str | None = None) -> str:
     if not output:
         raise ValueError("No output from hidumper")
 
-    # Parse window focus info
+    return _parse_current_app(output)
+
+
+def _parse_current_app(output: str) -> str:
+    """Find the focused app in `hidumper -s WindowManagerService` output."""
     for line in output.split("\n"):
         if "focused" in line.lower() or "current" in line.lower():
             for app_name, package in APP_PACKAGES.items():
@@ -150,10 +156,7 @@ def swipe(
     hdc_prefix = _get_hdc_prefix(device_id)
 
     if duration_ms is None:
-        # Calculate duration based on distance
-        dist_sq = (start_x - end_x) ** 2 + (start_y - end_y) ** 2
-        duration_ms = int(dist_sq / 1000)
-        duration_ms = max(500, min(duration_ms, 1000))  # Clamp between 500-1000ms
+        duration_ms = _swipe_duration(start_x, start_y, end_x, end_y)
 
     # HarmonyOS uses uitest uiInput swipe
     # Format: swipe startX startY endX endY duration
@@ -224,45 +227,35 @@ def launch_app(
     Launch an app by name.
 
     Args:
-        app_name: The app name (must be in APP_PACKAGES).
+        app_name: The app name (in APP_PACKAGES) or a bundle name.
         device_id: Optional HDC device ID.
-        delay: Delay in seconds after launching. If None, uses configured default.
+        delay: Delay in seconds after launching. If None, uses the short
+            settle delay when an already running app was brought to the
+            front, otherwise the configured default.
 
     Returns:
         True if app was launched, False if app not found.
     """
-    if delay is None:
-        delay = TIMING_CONFIG.device.default_launch_delay
-
-    if app_name not in APP_PACKAGES:
+    bundle = APP_PACKAGES.get(app_name)
+    if bundle is None and is_package_name(app_name):
+        bundle = app_name
+    if bundle is None:
         print(f"[HDC] App '{app_name}' not found in HarmonyOS app list")
         print(f"[HDC] Available apps: {', '.join(sorted(APP_PACKAGES.keys())[:10])}...")
         return False
 
-    hdc_prefix = _get_hdc_prefix(device_id)
-    bundle = APP_PACKAGES[app_name]
-
-    # Get the ability name for this bundle
-    # Default to "EntryAbility" if not specified in APP_ABILITIES
-    ability = APP_ABILITIES.get(bundle, "EntryAbility")
+    # HarmonyOS uses 'aa start -b {bundle} -a {ability}'; the ability name is
+    # resolved once per device and cached
+    result = launch_bundle(bundle, device_id)
 
-    # HarmonyOS uses 'aa start' command to launch apps
-    # Format: aa start -b {bundle} -a {ability}
-    _run_hdc_command(
-        hdc_prefix
-        + [
-            "shell",
-            "aa",
-            "start",
-            "-b",
-            bundle,
-            "-a",
-            ability,
-        ],
-        capture_output=True,
-    )
+    if delay is None:
+        delay = (
+            TIMING_CONFIG.device.launch_settle_delay
+            if result.timed
+            else TIMING_CONFIG.device.default_launch_delay
+        )
     time.sleep(delay)
-    return True
+    return result.success
 
 
 def _get_hdc_prefix(device_id: str | None) -> list:
@@ -270,3 +263,9 @@ def _get_hdc_prefix(device_id: str | None) -> list:
     if device_id:
         return ["hdc", "-t", device_id]
     return ["hdc"]
+
+
+def _swipe_duration(start_x: int, start_y: int, end_x: int, end_y: int) -> int:
+    """Calculate swipe duration in milliseconds based on distance."""
+    dist_sq = (start_x - end_x) ** 2 + (start_y - end_y) ** 2
+    return max(500, min(int(dist_sq / 1000), 1000))  # Clamp between 500-1000ms
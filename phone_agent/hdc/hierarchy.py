@@ -0,0 +1,57 @@
+"""UI hierarchy dumps from HarmonyOS devices via uitest dumpLayout."""
+
+import subprocess
+
+from phone_agent.hdc.connection import _run_hdc_command
+from phone_agent.ui_tree import UITree, parse_harmony_json
+
+# dumpLayout can only write to a file; it is read back in the same shell call
+_REMOTE_PATH = "/data/local/tmp/ui_layout.json"
+
+
+def get_ui_tree(
+    device_id: str | None = None, timeout: int = 10, width: int = 0, height: int = 0
+) -> UITree | None:
+    """
+    Dump and compact the current UI hierarchy.
+
+    Args:
+        device_id: Optional HDC device ID.
+        timeout: Timeout in seconds for the dump.
+        width: Screen width in pixels (0 to take it from the layout).
+        height: Screen height in pixels.
+
+    Returns:
+        The compacted UITree, or None if the dump failed.
+    """
+    hdc_prefix = _get_hdc_prefix(device_id)
+    try:
+        result = _run_hdc_command(
+            hdc_prefix
+            + [
+                "shell",
+                f"uitest dumpLayout -p {_REMOTE_PATH} > /dev/null && cat {_REMOTE_PATH}",
+            ],
+            capture_output=True,
+            timeout=timeout,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"UI hierarchy error: {e}")
+        return None
+
+    start = result.stdout.find(b"{")
+    if start < 0:
+        return None
+    try:
+        tree = parse_harmony_json(result.stdout[start:], width, height)
+    except ValueError as e:
+        print(f"UI hierarchy error: {e}")
+        return None
+    return tree if tree.nodes else None
+
+
+def _get_hdc_prefix(device_id: str | None) -> list:
+    """Get HDC command prefix with optional device specifier."""
+    if device_id:
+        return ["hdc", "-t", device_id]
+    return ["hdc"]
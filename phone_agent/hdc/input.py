@@ -4,10 +4,18 @@ import base64
 import subprocess
 from typing import Optional
 
+from phone_agent.hdc.batch import (
+    KEY_A,
+    KEY_CTRL_LEFT,
+    KEY_DELETE,
+    KEY_ENTER,
+    BatchResult,
+    UitestBatch,
+)
 from phone_agent.hdc.connection import _run_hdc_command
 
 
-def type_text(text: str, device_id: str | None = None) -> None:
+def type_text(text: str, device_id: str | None = None) -> BatchResult:
     """
     Type text into the currently focused input field.
 
@@ -15,80 +23,72 @@ def type_text(text: str, device_id: str | None = None) -> None:
         text: The text to type. Supports multi-line text with newline characters.
         device_id: Optional HDC device ID for multi-device setups.
 
+    Returns:
+        BatchResult with one entry per uitest operation.
+
     Note:
         HarmonyOS uses: hdc shell uitest uiInput text "文本内容"
         This command works without coordinates when input field is focused.
-        For multi-line text, the function splits by newlines and sends ENTER keyEvents.
+        For multi-line text, the text is split by newlines with an ENTER
+        keyEvent between lines; all operations run in one hdc shell call.
         ENTER key code in HarmonyOS: 2054
         Recommendation: Click on the input field first to focus it, then use this function.
     """
-    hdc_prefix = _get_hdc_prefix(device_id)
+    batch = UitestBatch(device_id)
 
-    # Handle multi-line text by splitting on newlines
-    if '\n' in text:
-        lines = text.split('\n')
-        for i, line in enumerate(lines):
-            if line:  # Only process non-empty lines
-                # Escape special characters for shell
-                escaped_line = line.replace('"', '\\"').replace("$", "\\$")
-
-                _run_hdc_command(
-                    hdc_prefix + ["shell", "uitest", "uiInput", "text", escaped_line],
-                    capture_output=True,
-                    text=True,
-                )
-
-            # Send ENTER key event after each line except the last one
-            if i < len(lines) - 1:
-                try:
-                    _run_hdc_command(
-                        hdc_prefix + ["shell", "uitest", "uiInput", "keyEvent", "2054"],
-                        capture_output=True,
-                        text=True,
-                    )
-                except Exception as e:
-                    print(f"[HDC] ENTER keyEvent failed: {e}")
-    else:
-        # Single line text - original logic
-        # Escape special characters for shell (keep quotes for proper text handling)
-        # The text will be wrapped in quotes in the command
-        escaped_text = text.replace('"', '\\"').replace("$", "\\$")
-
-        # HarmonyOS uitest uiInput text command
-        # Format: hdc shell uitest uiInput text "文本内容"
-        _run_hdc_command(
-            hdc_prefix + ["shell", "uitest", "uiInput", "text", escaped_text],
-            capture_output=True,
-            text=True,
-        )
+    lines = text.split("\n")
+    for i, line in enumerate(lines):
+        batch.text(line)
+        # Send ENTER key event after each line except the last one
+        if i < len(lines) - 1:
+            batch.key_event(KEY_ENTER)
+
+    result = batch.run()
+    for op in result.failed:
+        print(f"[HDC] uitest {op.args[2]} failed: {op.output or op.exit_code}")
+    return result
 
 
-def clear_text(device_id: str | None = None) -> None:
+def clear_text(device_id: str | None = None) -> BatchResult:
     """
     Clear text in the currently focused input field.
 
     Args:
         device_id: Optional HDC device ID for multi-device setups.
 
+    Returns:
+        BatchResult with one entry per uitest operation.
+
     Note:
-        This method uses repeated delete key events to clear text.
-        For HarmonyOS, you might also use select all + delete for better efficiency.
+        Selects all (Ctrl+A) and deletes, in one hdc shell call.
     """
-    hdc_prefix = _get_hdc_prefix(device_id)
     # Ctrl+A to select all (key code 2072 for Ctrl, 2017 for A)
     # Then delete
-    _run_hdc_command(
-        hdc_prefix + ["shell", "uitest", "uiInput", "keyEvent", "2072", "2017"],
-        capture_output=True,
-        text=True,
-    )
-    _run_hdc_command(
-        hdc_prefix + ["shell", "uitest", "uiInput", "keyEvent", "2055"],  # Delete key
-        capture_output=True,
-        text=True,
+    return (
+        UitestBatch(device_id)
+        .key_event(KEY_CTRL_LEFT, KEY_A)
+        .key_event(KEY_DELETE)
+        .run()
     )
 
 
+def send_key_events(codes: list[str], device_id: str | None = None) -> BatchResult:
+    """
+    Send a sequence of HarmonyOS key events in one hdc shell call.
+
+    Args:
+        codes: HarmonyOS key codes, e.g. ["2054"] for ENTER.
+        device_id: Optional HDC device ID for multi-device setups.
+
+    Returns:
+        BatchResult with one entry per key event.
+    """
+    batch = UitestBatch(device_id)
+    for code in codes:
+        batch.key_event(code)
+    return batch.run()
+
+
 def detect_and_set_adb_keyboard(device_id: str | None = None) -> str:
     """
     Detect current keyboard and switch to ADB Keyboard if available.
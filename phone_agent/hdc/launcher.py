@@ -0,0 +1,184 @@
+"""App launcher for HarmonyOS using cached main ability names and aa start."""
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from phone_agent.config.apps_harmonyos import APP_ABILITIES
+from phone_agent.hdc.connection import _run_hdc_command
+
+_DEFAULT_ABILITY = "EntryAbility"
+
+# Main ability per (device, bundle)
+_abilities: dict[tuple[str, str], str] = {}
+# Launch timings per (device, bundle), see get_launch_stats()
+_launch_stats: dict[tuple[str, str], list["LaunchResult"]] = {}
+_lock = threading.Lock()
+
+
+@dataclass
+class LaunchResult:
+    """Outcome of an app launch."""
+
+    bundle: str
+    ability: str
+    success: bool
+    launch_state: str | None = None  # COLD / WARM (whether the app was running)
+    elapsed: float = 0.0  # Wall-clock seconds for aa start
+
+    @property
+    def timed(self) -> bool:
+        """
+        Whether no fixed sleep is needed after the launch.
+
+        aa start returns before the first frame is drawn, so only warm
+        launches of an already running app are treated as complete.
+        """
+        return self.success and self.launch_state == "WARM"
+
+
+def resolve_main_ability(
+    bundle: str, device_id: str | None = None, refresh: bool = False
+) -> str:
+    """
+    Resolve a bundle's main ability once and cache it per device.
+
+    APP_ABILITIES is used first; otherwise the ability is read from
+    `bm dump -n <bundle>`, falling back to "EntryAbility".
+
+    Args:
+        bundle: HarmonyOS bundle name.
+        device_id: Optional HDC device ID.
+        refresh: Ignore the cached value and resolve again.
+
+    Returns:
+        Ability name.
+    """
+    key = (device_id or "", bundle)
+    if not refresh:
+        with _lock:
+            if key in _abilities:
+                return _abilities[key]
+
+    ability = None if refresh else APP_ABILITIES.get(bundle)
+    if ability is None:
+        try:
+            result = _run_hdc_command(
+                _get_hdc_prefix(device_id) + ["shell", "bm", "dump", "-n", bundle],
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                timeout=10,
+            )
+            match = re.search(r'"mainAbility"\s*:\s*"([^"]+)"', result.stdout) or re.search(
+                r'"mainElementName"\s*:\s*"([^"]+)"', result.stdout
+            )
+            ability = match.group(1) if match else None
+        except Exception:
+            ability = None
+
+    ability = ability or APP_ABILITIES.get(bundle, _DEFAULT_ABILITY)
+    with _lock:
+        _abilities[key] = ability
+    return ability
+
+
+def launch_bundle(bundle: str, device_id: str | None = None) -> LaunchResult:
+    """
+    Launch a bundle with `aa start` using the cached main ability.
+
+    aa start returns once the ability has been started, so its wall-clock
+    time is used as the launch time. If the cached ability is rejected it is
+    resolved again from the device and the launch is retried once.
+
+    Args:
+        bundle: HarmonyOS bundle name.
+        device_id: Optional HDC device ID.
+
+    Returns:
+        LaunchResult describing the launch.
+    """
+    state = "WARM" if _is_running(bundle, device_id) else "COLD"
+    ability = resolve_main_ability(bundle, device_id)
+
+    start = time.time()
+    success = _aa_start(bundle, ability, device_id)
+    if not success:
+        refreshed = resolve_main_ability(bundle, device_id, refresh=True)
+        if refreshed != ability:
+            ability = refreshed
+            success = _aa_start(bundle, ability, device_id)
+
+    result = LaunchResult(bundle, ability, success, state, time.time() - start)
+    with _lock:
+        _launch_stats.setdefault((device_id or "", bundle), []).append(result)
+    print(f"[Launch] {bundle} {state} {result.elapsed * 1000:.0f}ms")
+    return result
+
+
+def _aa_start(bundle: str, ability: str, device_id: str | None) -> bool:
+    try:
+        result = _run_hdc_command(
+            _get_hdc_prefix(device_id) + ["shell", "aa", "start", "-b", bundle, "-a", ability],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=30,
+        )
+    except Exception:
+        return False
+    output = (result.stdout + result.stderr).lower()
+    return "successfully" in output or ("error" not in output and "fail" not in output)
+
+
+def _is_running(bundle: str, device_id: str | None) -> bool:
+    try:
+        result = _run_hdc_command(
+            _get_hdc_prefix(device_id) + ["shell", "pidof", bundle],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        return bool(result.stdout.strip())
+    except Exception:
+        return False
+
+
+def get_launch_stats(device_id: str | None = None) -> dict[str, dict[str, list[int]]]:
+    """
+    Get recorded launch times per bundle, grouped by launch state.
+
+    Args:
+        device_id: Optional HDC device ID.
+
+    Returns:
+        Dictionary like {"com.huawei.hmos.meetime": {"COLD": [912]}}, with
+        times in milliseconds.
+    """
+    stats: dict[str, dict[str, list[int]]] = {}
+    with _lock:
+        for (device, bundle), results in _launch_stats.items():
+            if device != (device_id or ""):
+                continue
+            for result in results:
+                stats.setdefault(bundle, {}).setdefault(
+                    result.launch_state or "UNKNOWN", []
+                ).append(int(result.elapsed * 1000))
+    return stats
+
+
+def clear_launch_cache(device_id: str | None = None) -> None:
+    """Forget resolved abilities for a device."""
+    with _lock:
+        for key in [k for k in _abilities if k[0] == (device_id or "")]:
+            del _abilities[key]
+
+
+def _get_hdc_prefix(device_id: str | None) -> list:
+    """Get HDC command prefix with optional device specifier."""
+    if device_id:
+        return ["hdc", "-t", device_id]
+    return ["hdc"]
@@ -2,14 +2,12 @@
 
 import base64
 import os
-import subprocess
 import tempfile
-import uuid
 from dataclasses import dataclass
 from io import BytesIO
-from typing import Tuple
 
 from PIL import Image
+from phone_agent.deadline import DeviceTimeoutError
 from phone_agent.hdc.connection import _run_hdc_command
 
 
@@ -23,6 +21,24 @@ class Screenshot:
     is_sensitive: bool = False
 
 
+# Payload format sent to the model: "jpeg" forwards the device JPEG as-is,
+# "png" re-encodes it (only needed for models that reject JPEG input).
+SCREENSHOT_FORMAT = os.getenv("PHONE_AGENT_HDC_SCREENSHOT_FORMAT", "jpeg").lower()
+
+# Capture commands in probe order; {path} is the remote JPEG path.
+_CAPTURE_METHODS = {
+    "screenshot": ["shell", "screenshot", "{path}"],
+    "snapshot_display": ["shell", "snapshot_display", "-f", "{path}"],
+}
+
+# Consecutive failures of a memoized method before it is probed again
+_MAX_METHOD_FAILURES = 3
+
+# Working capture method per device ("" for the default device)
+_capture_methods: dict[str, str] = {}
+_method_failures: dict[str, int] = {}
+
+
 def get_screenshot(device_id: str | None = None, timeout: int = 10) -> Screenshot:
     """
     Capture a screenshot from the connected HarmonyOS device.
@@ -37,70 +53,116 @@ def get_screenshot(device_id: str | None = None, timeout: int = 10) -> Screensho
     Note:
         If the screenshot fails (e.g., on sensitive screens like payment pages),
         a black fallback image is returned with is_sensitive=True.
+        The capture method that works is remembered per device, and the
+        device JPEG is forwarded without decoding unless SCREENSHOT_FORMAT
+        asks for PNG.
     """
-    temp_path = os.path.join(tempfile.gettempdir(), f"screenshot_{uuid.uuid4()}.png")
     hdc_prefix = _get_hdc_prefix(device_id)
+    key = device_id or ""
 
     try:
-        # Execute screenshot command
         # HarmonyOS HDC only supports JPEG format
         remote_path = "/data/local/tmp/tmp_screenshot.jpeg"
 
-        # Try method 1: hdc shell screenshot (newer HarmonyOS versions)
-        result = _run_hdc_command(
-            hdc_prefix + ["shell", "screenshot", remote_path],
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
-
-        # Check for screenshot failure (sensitive screen)
-        output = result.stdout + result.stderr
-        if "fail" in output.lower() or "error" in output.lower() or "not found" in output.lower():
-            # Try method 2: snapshot_display (older versions or different devices)
-            result = _run_hdc_command(
-                hdc_prefix + ["shell", "snapshot_display", "-f", remote_path],
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-            )
-            output = result.stdout + result.stderr
-            if "fail" in output.lower() or "error" in output.lower():
-                return _create_fallback_screenshot(is_sensitive=True)
-
-        # Pull screenshot to local temp path
-        # Note: remote file is JPEG, but PIL can open it regardless of local extension
-        _run_hdc_command(
-            hdc_prefix + ["file", "recv", remote_path, temp_path],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
+        if not _capture(hdc_prefix, key, remote_path, timeout):
+            return _create_fallback_screenshot(is_sensitive=True)
 
-        if not os.path.exists(temp_path):
+        data = _receive_file(hdc_prefix, remote_path)
+        if not data:
             return _create_fallback_screenshot(is_sensitive=False)
 
-        # Read JPEG image and convert to PNG for model inference
-        # PIL automatically detects the image format from file content
-        img = Image.open(temp_path)
+        # Only the header is parsed to get the size; pixels are not decoded
+        img = Image.open(BytesIO(data))
         width, height = img.size
 
-        buffered = BytesIO()
-        img.save(buffered, format="PNG")
-        base64_data = base64.b64encode(buffered.getvalue()).decode("utf-8")
-
-        # Cleanup
-        os.remove(temp_path)
+        if SCREENSHOT_FORMAT == "png" and img.format != "PNG":
+            buffered = BytesIO()
+            img.save(buffered, format="PNG")
+            data = buffered.getvalue()
 
         return Screenshot(
-            base64_data=base64_data, width=width, height=height, is_sensitive=False
+            base64_data=base64.b64encode(data).decode("utf-8"),
+            width=width,
+            height=height,
+            is_sensitive=False,
         )
 
+    except DeviceTimeoutError:
+        # Out of time for this step (or stopped): a black frame would mislead the model
+        raise
     except Exception as e:
         print(f"Screenshot error: {e}")
         return _create_fallback_screenshot(is_sensitive=False)
 
 
+def _capture(hdc_prefix: list, key: str, remote_path: str, timeout: int) -> bool:
+    """
+    Capture the screen to remote_path, using the memoized method if known.
+
+    A memoized method that fails is not re-probed right away, since that is
+    usually a sensitive screen; after _MAX_METHOD_FAILURES consecutive
+    failures the methods are probed again.
+
+    Returns:
+        True if the capture succeeded.
+    """
+    method = _capture_methods.get(key)
+    if method is not None:
+        if _run_capture(hdc_prefix, method, remote_path, timeout):
+            _method_failures[key] = 0
+            return True
+        _method_failures[key] = _method_failures.get(key, 0) + 1
+        if _method_failures[key] < _MAX_METHOD_FAILURES:
+            return False
+        del _capture_methods[key]
+
+    for method in _CAPTURE_METHODS:
+        if _run_capture(hdc_prefix, method, remote_path, timeout):
+            _capture_methods[key] = method
+            _method_failures[key] = 0
+            return True
+    return False
+
+
+def _run_capture(hdc_prefix: list, method: str, remote_path: str, timeout: int) -> bool:
+    args = [arg.format(path=remote_path) for arg in _CAPTURE_METHODS[method]]
+    result = _run_hdc_command(
+        hdc_prefix + args,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    output = (result.stdout + result.stderr).lower()
+    return not ("fail" in output or "error" in output or "not found" in output)
+
+
+def _receive_file(hdc_prefix: list, remote_path: str) -> bytes | None:
+    """
+    Pull a remote file and return its bytes.
+
+    HDC can only receive into a local file, so the bytes are read back once
+    and the local copy is removed right away.
+    """
+    fd, temp_path = tempfile.mkstemp(suffix=".jpeg")
+    os.close(fd)
+    try:
+        _run_hdc_command(
+            hdc_prefix + ["file", "recv", remote_path, temp_path],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        with open(temp_path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+    finally:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
 def _get_hdc_prefix(device_id: str | None) -> list:
     """Get HDC command prefix with optional device specifier."""
     if device_id:
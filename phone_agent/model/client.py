@@ -63,12 +63,14 @@ class ModelClient:
         Raises:
             ValueError: If the response cannot be parsed.
         """
-        # Start timing
-        start_time = time.time()
-        time_to_first_token = None
-        time_to_thinking_end = None
+        printer = _StreamPrinter()
+        stream = self.client.chat.completions.create(**self._request_kwargs(messages))
+        for chunk in stream:
+            printer.feed(chunk)
+        return self._build_response(printer)
 
-        stream = self.client.chat.completions.create(
+    def _request_kwargs(self, messages: list[dict[str, Any]]) -> dict[str, Any]:
+        return dict(
             messages=messages,
             model=self.config.model_name,
             max_tokens=self.config.max_tokens,
@@ -79,71 +81,15 @@ class ModelClient:
             stream=True,
         )
 
-        raw_content = ""
-        buffer = ""  # Buffer to hold content that might be part of a marker
-        action_markers = ["finish(message=", "do(action="]
-        in_action_phase = False  # Track if we've entered the action phase
-        first_token_received = False
-
-        for chunk in stream:
-            if len(chunk.choices) == 0:
-                continue
-            if chunk.choices[0].delta.content is not None:
-                content = chunk.choices[0].delta.content
-                raw_content += content
-
-                # Record time to first token
-                if not first_token_received:
-                    time_to_first_token = time.time() - start_time
-                    first_token_received = True
-
-                if in_action_phase:
-                    # Already in action phase, just accumulate content without printing
-                    continue
-
-                buffer += content
-
-                # Check if any marker is fully present in buffer
-                marker_found = False
-                for marker in action_markers:
-                    if marker in buffer:
-                        # Marker found, print everything before it
-                        thinking_part = buffer.split(marker, 1)[0]
-                        print(thinking_part, end="", flush=True)
-                        print()  # Print newline after thinking is complete
-                        in_action_phase = True
-                        marker_found = True
-
-                        # Record time to thinking end
-                        if time_to_thinking_end is None:
-                            time_to_thinking_end = time.time() - start_time
-
-                        break
-
-                if marker_found:
-                    continue  # Continue to collect remaining content
-
-                # Check if buffer ends with a prefix of any marker
-                # If so, don't print yet (wait for more content)
-                is_potential_marker = False
-                for marker in action_markers:
-                    for i in range(1, len(marker)):
-                        if buffer.endswith(marker[:i]):
-                            is_potential_marker = True
-                            break
-                    if is_potential_marker:
-                        break
-
-                if not is_potential_marker:
-                    # Safe to print the buffer
-                    print(buffer, end="", flush=True)
-                    buffer = ""
-
+    def _build_response(self, printer: "_StreamPrinter") -> ModelResponse:
+        """Parse the streamed content and print performance metrics."""
         # Calculate total time
-        total_time = time.time() - start_time
+        total_time = time.time() - printer.start_time
+        time_to_first_token = printer.time_to_first_token
+        time_to_thinking_end = printer.time_to_thinking_end
 
         # Parse thinking and action from response
-        thinking, action = self._parse_response(raw_content)
+        thinking, action = self._parse_response(printer.raw_content)
 
         # Print performance metrics
         lang = self.config.lang
@@ -167,7 +113,7 @@ class ModelClient:
         return ModelResponse(
             thinking=thinking,
             action=action,
-            raw_content=raw_content,
+            raw_content=printer.raw_content,
             time_to_first_token=time_to_first_token,
             time_to_thinking_end=time_to_thinking_end,
             total_time=total_time,
@@ -216,6 +162,103 @@ class ModelClient:
         return "", content
 
 
+class AsyncModelClient(ModelClient):
+    """
+    Client for OpenAI-compatible models using AsyncOpenAI streaming.
+
+    Shares response parsing and metrics with ModelClient; request() is a
+    coroutine, so many agents can wait on the model from one event loop.
+
+    Args:
+        config: Model configuration.
+    """
+
+    def __init__(self, config: ModelConfig | None = None):
+        from openai import AsyncOpenAI
+
+        self.config = config or ModelConfig()
+        self.client = AsyncOpenAI(
+            base_url=self.config.base_url, api_key=self.config.api_key
+        )
+
+    async def request(self, messages: list[dict[str, Any]]) -> ModelResponse:
+        """
+        Send a request to the model.
+
+        Args:
+            messages: List of message dictionaries in OpenAI format.
+
+        Returns:
+            ModelResponse containing thinking and action.
+        """
+        printer = _StreamPrinter()
+        stream = await self.client.chat.completions.create(
+            **self._request_kwargs(messages)
+        )
+        async for chunk in stream:
+            printer.feed(chunk)
+        return self._build_response(printer)
+
+
+class _StreamPrinter:
+    """Prints the thinking part of a streamed response and records its timing."""
+
+    action_markers = ["finish(message=", "do(action="]
+
+    def __init__(self):
+        self.start_time = time.time()
+        self.time_to_first_token: float | None = None
+        self.time_to_thinking_end: float | None = None
+        self.raw_content = ""
+        self._buffer = ""  # Buffer to hold content that might be part of a marker
+        self._in_action_phase = False  # Track if we've entered the action phase
+
+    def feed(self, chunk: Any) -> None:
+        """Process one streamed chunk."""
+        if len(chunk.choices) == 0:
+            return
+        content = chunk.choices[0].delta.content
+        if content is None:
+            return
+
+        self.raw_content += content
+
+        # Record time to first token
+        if self.time_to_first_token is None:
+            self.time_to_first_token = time.time() - self.start_time
+
+        if self._in_action_phase:
+            # Already in action phase, just accumulate content without printing
+            return
+
+        self._buffer += content
+
+        # Check if any marker is fully present in buffer
+        for marker in self.action_markers:
+            if marker in self._buffer:
+                # Marker found, print everything before it
+                thinking_part = self._buffer.split(marker, 1)[0]
+                print(thinking_part, end="", flush=True)
+                print()  # Print newline after thinking is complete
+                self._in_action_phase = True
+
+                # Record time to thinking end
+                if self.time_to_thinking_end is None:
+                    self.time_to_thinking_end = time.time() - self.start_time
+                return
+
+        # Check if buffer ends with a prefix of any marker
+        # If so, don't print yet (wait for more content)
+        for marker in self.action_markers:
+            for i in range(1, len(marker)):
+                if self._buffer.endswith(marker[:i]):
+                    return
+
+        # Safe to print the buffer
+        print(self._buffer, end="", flush=True)
+        self._buffer = ""
+
+
 class MessageBuilder:
     """Helper class for building conversation messages."""
 
@@ -241,10 +284,12 @@ class MessageBuilder:
         content = []
 
         if image_base64:
+            # JPEG data (e.g. MJPEG stream frames) starts with "/9j/" in base64
+            mime = "image/jpeg" if image_base64.startswith("/9j/") else "image/png"
             content.append(
                 {
                     "type": "image_url",
-                    "image_url": {"url": f"data:image/png;base64,{image_base64}"},
+                    "image_url": {"url": f"data:{mime};base64,{image_base64}"},
                 }
             )
 
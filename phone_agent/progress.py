@@ -0,0 +1,184 @@
+"""Detection of agent runs that stopped making progress (no-op actions and loops)."""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from phone_agent.trajectory import hamming
+
+# Maximum screen hash distance for two screens to count as unchanged. Stricter
+# than the replay threshold: replay tolerates small differences to find a
+# recorded screen, while different pages of a uniform list can hash within a
+# few bits of each other and must not look like a stalled run.
+PROGRESS_HASH_THRESHOLD = 2
+
+# Actions that move content within the same layout. Their screens can hash
+# alike even when the content changed, so hash similarity alone does not make
+# them no-ops or a cycle.
+SCROLL_ACTIONS = {"Swipe", "Scroll"}
+
+# What to do when no progress is detected, from mildest to strongest. Hints
+# come first for every policy; "takeover" and "abort" follow once the hints
+# did not help.
+STUCK_POLICIES = ("off", "hint", "takeover", "abort")
+
+
+@dataclass
+class Stall:
+    """A detected lack of progress."""
+
+    kind: str  # "no_op" (action did not change the screen) or "cycle"
+    steps: int  # Number of recent steps without progress
+    detail: str
+
+
+@dataclass
+class _State:
+    screen_hash: int
+    current_app: str
+    signature: str | None = None  # Action taken on this screen
+
+
+@dataclass
+class ProgressMonitor:
+    """
+    Tracks screens and actions over a sliding window to spot stuck runs.
+
+    Call observe() with each new screen and record_action() with the action
+    taken on it. observe() returns a Stall when either:
+
+    - the last `no_op_limit` actions all left the screen unchanged (the same
+      tap on a dead button, Wait while a spinner keeps spinning), or
+    - the (screen, action) sequence has repeated with a period of 2 to
+      `max_period` steps `cycle_repeats` times and the new screen starts
+      the cycle again (e.g. alternating Back and Launch).
+
+    Runs of Swipe/Scroll actions are left out of the no-op check, and cycles
+    made of them only are ignored: scrolling a uniform list changes the
+    content but barely the hash.
+
+    Args:
+        window: Number of recent steps kept.
+        threshold: Maximum screen hash distance for two screens to be equal.
+        no_op_limit: Consecutive unchanged screens that count as a stall.
+        cycle_repeats: Repetitions of a cycle that count as a stall.
+        max_period: Longest cycle looked for.
+    """
+
+    window: int = 12
+    threshold: int = PROGRESS_HASH_THRESHOLD
+    no_op_limit: int = 3
+    cycle_repeats: int = 2
+    max_period: int = 4
+    detections: int = 0
+    _states: list[_State] = field(default_factory=list, repr=False)
+
+    def clear(self) -> None:
+        """Forget the recent steps (e.g. after a takeover), keeping the counters."""
+        self._states = []
+
+    def observe(self, screen_hash: int, current_app: str) -> Stall | None:
+        """
+        Add a new screen and check the window for a stall.
+
+        Args:
+            screen_hash: Hash of the screenshot (see trajectory.screen_hash).
+            current_app: Current foreground app.
+
+        Returns:
+            Stall if the run is stuck, otherwise None.
+        """
+        state = _State(screen_hash, current_app)
+        stall = self._check_no_op(state) or self._check_cycle(state)
+        if stall:
+            # Restart the window so a further stall needs fresh evidence
+            self.detections += 1
+            self.clear()
+        self._states.append(state)
+        del self._states[: -self.window]
+        return stall
+
+    def discard_unacted(self) -> None:
+        """Forget the most recent screen if no action was recorded on it (stopped step)."""
+        if self._states and self._states[-1].signature is None:
+            self._states.pop()
+
+    def record_action(self, action: dict[str, Any]) -> None:
+        """Record the action taken on the most recently observed screen."""
+        if self._states:
+            self._states[-1].signature = action_signature(action)
+
+    def _same_screen(self, a: _State, b: _State) -> bool:
+        return (
+            a.current_app == b.current_app
+            and hamming(a.screen_hash, b.screen_hash) <= self.threshold
+        )
+
+    def _check_no_op(self, new: _State) -> Stall | None:
+        recent = self._states[-self.no_op_limit :]
+        if len(recent) < self.no_op_limit or any(s.signature is None for s in recent):
+            return None
+        if any(_is_scroll(s) for s in recent):
+            return None
+
+        screens = recent + [new]
+        if not all(self._same_screen(a, b) for a, b in zip(screens, screens[1:])):
+            return None
+
+        actions = sorted({s.signature.split(" ")[0] for s in recent})
+        return Stall(
+            "no_op",
+            len(recent),
+            f"{len(recent)} actions ({', '.join(actions)}) left the screen unchanged",
+        )
+
+    def _check_cycle(self, new: _State) -> Stall | None:
+        states = self._states
+        for period in range(2, self.max_period + 1):
+            length = period * self.cycle_repeats
+            if len(states) < length:
+                break
+            recent = states[-length:]
+            if any(s.signature is None for s in recent):
+                continue
+            if all(_is_scroll(s) for s in recent):
+                continue
+            if not self._same_screen(new, states[-period]):
+                continue
+            if all(
+                recent[i].signature == recent[i + period].signature
+                and self._same_screen(recent[i], recent[i + period])
+                for i in range(length - period)
+            ):
+                actions = " → ".join(s.signature.split(" ")[0] for s in recent[-period:])
+                return Stall(
+                    "cycle",
+                    length,
+                    f"the last {length} steps repeat the cycle {actions}",
+                )
+        return None
+
+
+def _is_scroll(state: _State) -> bool:
+    return state.signature is not None and state.signature.split(" ")[0] in SCROLL_ACTIONS
+
+
+def action_signature(action: dict[str, Any]) -> str:
+    """
+    Summarize an action for loop detection.
+
+    Coordinates are rounded to a coarse grid (relative 0-999 units / 50) so
+    taps on the same control compare equal.
+    """
+    if action.get("_metadata") == "finish":
+        return "finish"
+
+    name = action.get("action", "?")
+    parts = [name.replace(" ", "_")]
+    for key in ("element", "start", "end"):
+        point = action.get(key)
+        if isinstance(point, (list, tuple)) and len(point) >= 2:
+            parts.append(f"{key}={int(point[0]) // 50},{int(point[1]) // 50}")
+    for key in ("app", "text"):
+        if action.get(key):
+            parts.append(f"{key}={action[key]}")
+    return " ".join(parts)
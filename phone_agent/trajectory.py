@@ -0,0 +1,286 @@
+"""Record-and-replay cache of successful agent trajectories keyed by screen hashes."""
+
+import base64
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass, field
+from io import BytesIO
+
+from PIL import Image, ImageChops, ImageStat
+
+# Maximum Hamming distance (of 64 bits) for two screens to count as the same
+DEFAULT_HASH_THRESHOLD = 6
+
+# The 8x8 hash cannot tell apart screens that share a layout (list pages,
+# chat threads, settings sub-pages), so a hash match is confirmed on a
+# grayscale thumbnail of this width before a step is replayed.
+THUMBNAIL_WIDTH = 48
+# Maximum mean absolute grayscale difference (0-255) of matching thumbnails
+THUMBNAIL_THRESHOLD = 3.0
+
+# Actions that need a person or the model's judgment and are never replayed
+_NO_REPLAY_ACTIONS = {"Take_over", "Interact", "Call_API", "Note"}
+
+_ACTION_NAME = re.compile(r'do\(\s*action\s*=\s*"([^"]+)"')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trajectories (
+    task_key TEXT NOT NULL,
+    screen TEXT NOT NULL,
+    steps TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    replays INTEGER NOT NULL DEFAULT 0,
+    calls_saved INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (task_key, screen)
+);
+"""
+
+
+def screen_hash(base64_data: str) -> int:
+    """
+    Compute a 64-bit difference hash (dHash) of a screenshot.
+
+    The image is reduced to 9x8 grayscale and each bit records whether a
+    pixel is brighter than its right neighbour, so small changes such as the
+    status bar clock flip few or no bits while a different page flips many.
+
+    Args:
+        base64_data: Base64-encoded screenshot.
+
+    Returns:
+        The hash as an integer.
+    """
+    with Image.open(BytesIO(base64.b64decode(base64_data))) as img:
+        pixels = list(img.convert("L").resize((9, 8), Image.BILINEAR).getdata())
+
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = value << 1 | (left > right)
+    return value
+
+
+def screen_thumbnail(base64_data: str) -> str:
+    """
+    Encode a small grayscale thumbnail of a screenshot for storage.
+
+    Args:
+        base64_data: Base64-encoded screenshot.
+
+    Returns:
+        "WxH:" followed by the base64 of the zlib-compressed pixels.
+    """
+    with Image.open(BytesIO(base64.b64decode(base64_data))) as img:
+        height = max(1, round(img.height * THUMBNAIL_WIDTH / img.width))
+        small = img.convert("L").resize((THUMBNAIL_WIDTH, height), Image.BILINEAR)
+    pixels = base64.b64encode(zlib.compress(small.tobytes(), 9)).decode("ascii")
+    return f"{small.width}x{small.height}:{pixels}"
+
+
+def thumbnail_diff(a: str, b: str) -> float:
+    """Mean absolute grayscale difference (0-255) of two screen_thumbnail() values."""
+    images = []
+    for value in (a, b):
+        size, _, pixels = value.partition(":")
+        width, height = (int(n) for n in size.split("x"))
+        images.append(Image.frombytes("L", (width, height), zlib.decompress(base64.b64decode(pixels))))
+    if images[0].size != images[1].size:
+        return 255.0
+    return ImageStat.Stat(ImageChops.difference(*images)).mean[0]
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+def normalize_task_key(task: str) -> str:
+    """Normalize a task description for use as a cache key."""
+    return re.sub(r"\s+", " ", task).strip().lower()
+
+
+@dataclass
+class TrajectoryStep:
+    """One recorded step: the screen it ran on and the model output it used."""
+
+    screen_hash: int
+    current_app: str
+    thinking: str
+    action: str  # Raw action text as returned by the model
+    thumbnail: str = ""  # screen_thumbnail() of the screen, confirms hash matches
+
+
+@dataclass
+class ReplaySession:
+    """
+    Replay state for one run.
+
+    Steps are replayed in order while each new screen matches the recorded
+    one. The first mismatch ends the replay for the rest of the run and the
+    model takes over. Every step actually executed is recorded, so a run that
+    diverged and still succeeded replaces the stored trajectory.
+    """
+
+    task_key: str
+    screen: str  # Screen size "WxH"; trajectories are kept per resolution
+    threshold: int = DEFAULT_HASH_THRESHOLD
+    recorded: list[TrajectoryStep] = field(default_factory=list)
+    executed: list[TrajectoryStep] = field(default_factory=list)
+    cursor: int = 0
+    diverged: bool = False
+    model_calls: int = 0
+    calls_saved: int = 0
+
+    @property
+    def replaying(self) -> bool:
+        return bool(self.recorded) and not self.diverged
+
+    def match(
+        self, hash_value: int, current_app: str, thumbnail: str | None = None
+    ) -> TrajectoryStep | None:
+        """
+        Get the recorded step to replay on this screen, or None.
+
+        A mismatch (different app, screen hash beyond the threshold, or
+        thumbnails further apart than THUMBNAIL_THRESHOLD) marks the session
+        as diverged. Steps recorded without a thumbnail cannot be confirmed
+        and are not replayed.
+        """
+        if not self.replaying:
+            return None
+        if self.cursor >= len(self.recorded):
+            self.diverged = True
+            return None
+
+        step = self.recorded[self.cursor]
+        if (
+            step.current_app != current_app
+            or hamming(step.screen_hash, hash_value) > self.threshold
+        ):
+            print(
+                f"🔀 Replay diverged at step {self.cursor + 1} "
+                f"(distance {hamming(step.screen_hash, hash_value)}), using the model"
+            )
+            self.diverged = True
+            return None
+
+        if not step.thumbnail or not thumbnail:
+            self.diverged = True
+            return None
+        difference = thumbnail_diff(step.thumbnail, thumbnail)
+        if difference > THUMBNAIL_THRESHOLD:
+            print(
+                f"🔀 Replay diverged at step {self.cursor + 1} "
+                f"(same layout, thumbnail difference {difference:.1f}), using the model"
+            )
+            self.diverged = True
+            return None
+
+        if not is_replayable(step.action):
+            self.diverged = True
+            return None
+
+        self.cursor += 1
+        self.calls_saved += 1
+        return step
+
+
+class TrajectoryCache:
+    """
+    SQLite store of the latest successful trajectory per task and screen size.
+
+    Args:
+        path: SQLite database path.
+        threshold: Maximum screen hash distance for replaying a step.
+
+    Example:
+        >>> cache = TrajectoryCache("trajectories.db")
+        >>> session = cache.start("打开小红书，进入发现页", "1080x2400")
+        >>> step = session.match(
+        ...     screen_hash(screenshot.base64_data), "小红书", screen_thumbnail(screenshot.base64_data)
+        ... )
+    """
+
+    def __init__(self, path: str = "trajectories.db", threshold: int = DEFAULT_HASH_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def start(self, task: str, screen: str) -> ReplaySession:
+        """Begin a run, loading the recorded trajectory for the task if any."""
+        key = normalize_task_key(task)
+        session = ReplaySession(key, screen, self.threshold)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT steps FROM trajectories WHERE task_key = ? AND screen = ?",
+                (key, screen),
+            ).fetchone()
+        if row:
+            session.recorded = [TrajectoryStep(**step) for step in json.loads(row[0])]
+            print(f"📼 Recorded trajectory found: {len(session.recorded)} steps")
+        return session
+
+    def finish(self, session: ReplaySession, success: bool) -> None:
+        """
+        End a run: store its trajectory if it succeeded and update stats.
+
+        Args:
+            session: The run's ReplaySession.
+            success: Whether the task finished successfully.
+        """
+        with self._lock:
+            if success and session.executed and (session.diverged or not session.recorded):
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO trajectories "
+                    "(task_key, screen, steps, recorded_at) VALUES (?, ?, ?, ?)",
+                    (
+                        session.task_key,
+                        session.screen,
+                        json.dumps([asdict(step) for step in session.executed], ensure_ascii=False),
+                        time.time(),
+                    ),
+                )
+            elif not success and session.recorded and not session.diverged:
+                # The recording led to a failure without any divergence: drop it
+                self._conn.execute(
+                    "DELETE FROM trajectories WHERE task_key = ? AND screen = ?",
+                    (session.task_key, session.screen),
+                )
+            if session.calls_saved:
+                self._conn.execute(
+                    "UPDATE trajectories SET replays = replays + 1, "
+                    "calls_saved = calls_saved + ? WHERE task_key = ? AND screen = ?",
+                    (session.calls_saved, session.task_key, session.screen),
+                )
+            self._conn.commit()
+
+    def stats(self) -> dict[str, int]:
+        """Totals over all trajectories: count, replays and model calls saved."""
+        with self._lock:
+            count, replays, saved = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(replays), 0), COALESCE(SUM(calls_saved), 0) "
+                "FROM trajectories"
+            ).fetchone()
+        return {"trajectories": count, "replays": replays, "calls_saved": saved}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def is_replayable(action_text: str) -> bool:
+    """Whether a recorded action (raw model text) may be replayed without the model."""
+    text = action_text.strip()
+    if text.startswith("finish"):
+        return True
+    match = _ACTION_NAME.match(text)
+    return bool(match) and match.group(1) not in _NO_REPLAY_ACTIONS
@@ -0,0 +1,451 @@
+"""Compact UI hierarchy (accessibility tree) parsing, diffing and tap snapping."""
+
+import json
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+# Maximum number of elements described to the model per screen
+_MAX_NODES = 150
+
+# Taps farther than this (relative to screen width) from every element stay put
+SNAP_DISTANCE = 0.04
+
+# Actions whose element coordinates can be snapped
+_SNAP_ACTIONS = ("Tap", "Double Tap", "Long Press")
+
+_BOUNDS_RE = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+# WDA element types that are interactive even without accessible="true"
+_WDA_INTERACTIVE = {
+    "Button",
+    "Cell",
+    "CheckBox",
+    "Key",
+    "Link",
+    "MenuItem",
+    "SearchField",
+    "SecureTextField",
+    "SegmentedControl",
+    "Slider",
+    "Switch",
+    "Tab",
+    "TextField",
+    "TextView",
+}
+
+
+@dataclass(frozen=True)
+class UINode:
+    """One visible element of the compacted tree. Bounds are in screen pixels."""
+
+    cls: str  # Short class / type name, e.g. "Button", "EditText"
+    label: str  # Text, content description or (for containers) first child text
+    resource_id: str
+    bounds: tuple[int, int, int, int]  # left, top, right, bottom
+    clickable: bool = False
+    scrollable: bool = False
+    editable: bool = False
+    checked: bool | None = None
+
+    @property
+    def center(self) -> tuple[int, int]:
+        left, top, right, bottom = self.bounds
+        return (left + right) // 2, (top + bottom) // 2
+
+    @property
+    def interactive(self) -> bool:
+        return self.clickable or self.scrollable or self.editable
+
+    def contains(self, x: int, y: int) -> bool:
+        left, top, right, bottom = self.bounds
+        return left <= x < right and top <= y < bottom
+
+    def line(self, width: int, height: int) -> str:
+        """One-line description with the center in the model's 0-999 coordinates."""
+        x, y = self.center
+        parts = [self.cls]
+        if self.label:
+            parts.append(json.dumps(self.label[:60], ensure_ascii=False))
+        if self.resource_id:
+            parts.append(f"#{self.resource_id.rsplit('/', 1)[-1]}")
+        parts.append(f"[{x * 1000 // max(width, 1)},{y * 1000 // max(height, 1)}]")
+        flags = [
+            name
+            for name, on in (
+                ("click", self.clickable),
+                ("scroll", self.scrollable),
+                ("edit", self.editable),
+                ("checked", self.checked),
+            )
+            if on
+        ]
+        if flags:
+            parts.append(" ".join(flags))
+        return " ".join(parts)
+
+
+@dataclass
+class UITree:
+    """
+    Compacted UI hierarchy of one screen.
+
+    Only visible nodes that are interactive (clickable, scrollable,
+    editable) or carry a label are kept; an unlabeled clickable container
+    takes the text of its first labeled descendant, which is then dropped.
+
+    Args:
+        nodes: Compacted nodes in document order.
+        width: Screen width in pixels.
+        height: Screen height in pixels.
+    """
+
+    nodes: list[UINode] = field(default_factory=list)
+    width: int = 0
+    height: int = 0
+
+    def lines(self) -> list[str]:
+        return [node.line(self.width, self.height) for node in self.nodes[:_MAX_NODES]]
+
+    def to_text(self) -> str:
+        """Full tree, one element per line."""
+        return "\n".join(self.lines())
+
+    def diff_text(self, previous: "UITree | None") -> str:
+        """
+        Describe this tree relative to the previous step's tree.
+
+        Returns the full tree when there is no previous tree or when the diff
+        would not be shorter, "(unchanged)" when nothing changed, and
+        otherwise only the removed ("- ") and added ("+ ") elements.
+        """
+        current = self.lines()
+        if previous is None:
+            return "\n".join(current)
+
+        before = previous.lines()
+        before_set, current_set = set(before), set(current)
+        removed = [line for line in before if line not in current_set]
+        added = [line for line in current if line not in before_set]
+        if not removed and not added:
+            return "(unchanged)"
+        if len(removed) + len(added) >= len(current):
+            return "\n".join(current)
+        return "\n".join([f"- {line}" for line in removed] + [f"+ {line}" for line in added])
+
+    def find(self, text: str) -> UINode | None:
+        """First node whose label or resource ID contains the text (case-insensitive)."""
+        needle = text.strip().lower()
+        if not needle:
+            return None
+        for node in self.nodes:
+            if needle in node.label.lower() or needle in node.resource_id.lower():
+                return node
+        return None
+
+    def snap(self, x: int, y: int, max_distance: int) -> tuple[int, int]:
+        """
+        Move a tap point to the center of the element it was meant for.
+
+        The smallest interactive element containing the point wins; otherwise
+        the interactive element whose center is nearest, if within
+        max_distance pixels. Without a match the point is returned unchanged.
+        """
+        candidates = [node for node in self.nodes if node.clickable or node.editable]
+        containing = [node for node in candidates if node.contains(x, y)]
+        if containing:
+            return min(containing, key=_area).center
+
+        best, best_distance = None, max_distance**2
+        for node in candidates:
+            cx, cy = node.center
+            distance = (cx - x) ** 2 + (cy - y) ** 2
+            if distance <= best_distance:
+                best, best_distance = node, distance
+        return best.center if best else (x, y)
+
+    def toggles_at(self, x: int, y: int) -> bool:
+        """
+        Whether a tap at the point may flip a checkbox, switch or radio button.
+
+        True if a checkable element contains the point, or the smallest
+        clickable element containing it (e.g. a settings row) holds one.
+        """
+        containing = [node for node in self.nodes if node.contains(x, y)]
+        if any(node.checked is not None for node in containing):
+            return True
+        clickable = [node for node in containing if node.clickable]
+        if not clickable:
+            return False
+        left, top, right, bottom = min(clickable, key=_area).bounds
+        return any(
+            node.checked is not None
+            and left <= node.bounds[0]
+            and top <= node.bounds[1]
+            and node.bounds[2] <= right
+            and node.bounds[3] <= bottom
+            for node in self.nodes
+        )
+
+
+def observation_text(tree: UITree, previous: UITree | None) -> str:
+    """UI elements section for a model message (diffed against the previous step)."""
+    return f"** UI Elements **\n\n{tree.diff_text(previous)}"
+
+
+def snap_action(action: dict[str, Any], tree: UITree, width: int, height: int) -> dict[str, Any]:
+    """
+    Snap the element of a Tap / Double Tap / Long Press action to the UI tree.
+
+    Args:
+        action: Parsed action with relative (0-999) coordinates.
+        tree: UI tree of the screen the action was decided on.
+        width: Screen width in pixels.
+        height: Screen height in pixels.
+
+    Returns:
+        The action, or a copy with the element moved to the center of the
+        element it was meant for.
+    """
+    element = action.get("element")
+    if action.get("action") not in _SNAP_ACTIONS or not element or not width or not height:
+        return action
+
+    x, y = int(element[0] / 1000 * width), int(element[1] / 1000 * height)
+    snapped = tree.snap(x, y, int(SNAP_DISTANCE * width))
+    if snapped == (x, y):
+        return action
+    return {**action, "element": [snapped[0] * 1000 // width, snapped[1] * 1000 // height]}
+
+
+def parse_android_xml(
+    chunks: Iterable[bytes], width: int = 0, height: int = 0
+) -> UITree:
+    """
+    Parse `uiautomator dump` XML incrementally as it arrives.
+
+    Args:
+        chunks: XML bytes in pieces (e.g. read from a subprocess pipe).
+            Anything after the closing root tag is ignored.
+        width: Screen width in pixels (0 to take it from the root node).
+        height: Screen height in pixels.
+
+    Returns:
+        The compacted UITree.
+    """
+
+    def to_node(attrs: dict[str, str]) -> dict[str, Any] | None:
+        bounds = _parse_bounds(attrs.get("bounds", ""))
+        if bounds is None or attrs.get("visible-to-user", "true") != "true":
+            return None
+        cls = attrs.get("class", "").rsplit(".", 1)[-1]
+        checkable = attrs.get("checkable") == "true"
+        return {
+            "cls": cls,
+            "label": attrs.get("text") or attrs.get("content-desc") or "",
+            "resource_id": attrs.get("resource-id", ""),
+            "bounds": bounds,
+            "clickable": attrs.get("clickable") == "true"
+            or attrs.get("long-clickable") == "true"
+            or checkable,
+            "scrollable": attrs.get("scrollable") == "true",
+            "editable": "EditText" in cls,
+            "checked": attrs.get("checked") == "true" if checkable else None,
+        }
+
+    return _parse_xml(chunks, "node", to_node, width, height)
+
+
+def parse_wda_xml(
+    chunks: Iterable[bytes], scale: float = 1.0, width: int = 0, height: int = 0
+) -> UITree:
+    """
+    Parse WebDriverAgent `/source` XML incrementally.
+
+    Args:
+        chunks: XML bytes in pieces.
+        scale: Pixels per point; WDA reports bounds in points.
+        width: Screen width in pixels (0 to take it from the root element).
+        height: Screen height in pixels.
+
+    Returns:
+        The compacted UITree with bounds in pixels.
+    """
+
+    def to_node(attrs: dict[str, str]) -> dict[str, Any] | None:
+        if attrs.get("visible", "true") != "true":
+            return None
+        try:
+            x, y = float(attrs["x"]) * scale, float(attrs["y"]) * scale
+            w, h = float(attrs["width"]) * scale, float(attrs["height"]) * scale
+        except (KeyError, ValueError):
+            return None
+        cls = attrs.get("type", "").replace("XCUIElementType", "")
+        label = attrs.get("label") or attrs.get("value") or ""
+        name = attrs.get("name", "")
+        return {
+            "cls": cls,
+            "label": label,
+            "resource_id": name if name != label else "",
+            "bounds": (int(x), int(y), int(x + w), int(y + h)),
+            "clickable": cls in _WDA_INTERACTIVE and attrs.get("enabled") != "false",
+            "scrollable": cls in ("ScrollView", "Table", "CollectionView"),
+            "editable": cls in ("TextField", "SecureTextField", "SearchField", "TextView"),
+            "checked": attrs.get("value") == "1" if cls in ("Switch", "CheckBox") else None,
+        }
+
+    return _parse_xml(chunks, None, to_node, width, height)
+
+
+def parse_harmony_json(data: str | bytes, width: int = 0, height: int = 0) -> UITree:
+    """
+    Parse HarmonyOS `uitest dumpLayout` JSON.
+
+    Args:
+        data: The layout JSON.
+        width: Screen width in pixels (0 to take it from the root node).
+        height: Screen height in pixels.
+
+    Returns:
+        The compacted UITree.
+    """
+    builder = _TreeBuilder(width, height)
+
+    def visit(element: dict[str, Any]) -> None:
+        attrs = element.get("attributes", {})
+        bounds = _parse_bounds(attrs.get("bounds", ""))
+        node = None
+        if bounds is not None and attrs.get("visible", "true") == "true":
+            cls = attrs.get("type", "")
+            checkable = attrs.get("checkable") == "true"
+            node = {
+                "cls": cls,
+                "label": attrs.get("text") or attrs.get("description") or "",
+                "resource_id": attrs.get("id") or attrs.get("key") or "",
+                "bounds": bounds,
+                "clickable": attrs.get("clickable") == "true"
+                or attrs.get("longClickable") == "true"
+                or checkable,
+                "scrollable": attrs.get("scrollable") == "true",
+                "editable": cls in ("TextInput", "TextArea", "Search"),
+                "checked": attrs.get("checked") == "true" if checkable else None,
+            }
+        builder.start()
+        for child in element.get("children", []):
+            visit(child)
+        builder.end(node)
+
+    visit(json.loads(data))
+    return builder.tree()
+
+
+def _parse_xml(
+    chunks: Iterable[bytes],
+    tag: str | None,
+    to_node,
+    width: int,
+    height: int,
+) -> UITree:
+    """Feed XML chunks to a pull parser (iterparse without blocking on a file)."""
+    builder = _TreeBuilder(width, height)
+    parser = ET.XMLPullParser(events=("start", "end"))
+
+    def drain() -> bool:
+        try:
+            for event, element in parser.read_events():
+                if tag is not None and element.tag != tag:
+                    continue
+                if event == "start":
+                    builder.start()
+                else:
+                    builder.end(to_node(element.attrib))
+                    element.clear()
+        except ET.ParseError:
+            # Output after the document (e.g. "UI hierchary dumped to: ...")
+            # or a truncated dump: keep what was parsed
+            return False
+        return True
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        if not drain():
+            break
+    else:
+        parser.close()
+        drain()
+
+    return builder.tree()
+
+
+class _TreeBuilder:
+    """Collects compacted nodes from start/end events of a depth-first walk."""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self._extent = (0, 0)  # Right and bottom edges of all nodes seen
+        self._stack: list[list[dict[str, Any]]] = [[]]
+
+    def start(self) -> None:
+        self._stack.append([])
+
+    def end(self, node: dict[str, Any] | None) -> None:
+        descendants = self._stack.pop()
+        parent = self._stack[-1]
+        if node is None:
+            parent.extend(descendants)
+            return
+
+        self._extent = (
+            max(self._extent[0], node["bounds"][2]),
+            max(self._extent[1], node["bounds"][3]),
+        )
+
+        if not node["label"] and node["clickable"]:
+            # Name an unlabeled button after its first labeled descendant
+            for child in descendants:
+                if child["label"] and not _is_interactive(child):
+                    node["label"] = child["label"]
+                    descendants = [d for d in descendants if d is not child]
+                    break
+
+        parent.append(node)
+        parent.extend(descendants)
+
+    def tree(self) -> UITree:
+        if not (self.width and self.height):
+            # The root node spans the screen
+            self.width, self.height = self._extent
+        nodes = []
+        for item in self._stack[0]:
+            if not (item["label"] or _is_interactive(item)):
+                continue
+            node = UINode(**item)
+            if self._on_screen(node):
+                nodes.append(node)
+        return UITree(nodes, self.width, self.height)
+
+    def _on_screen(self, node: UINode) -> bool:
+        left, top, right, bottom = node.bounds
+        if right <= left or bottom <= top:
+            return False
+        if self.width and self.height:
+            return right > 0 and bottom > 0 and left < self.width and top < self.height
+        return True
+
+
+def _is_interactive(item: dict[str, Any]) -> bool:
+    return item["clickable"] or item["scrollable"] or item["editable"]
+
+
+def _parse_bounds(value: str) -> tuple[int, int, int, int] | None:
+    match = _BOUNDS_RE.search(value)
+    if not match:
+        return None
+    return tuple(int(v) for v in match.groups())  # type: ignore[return-value]
+
+
+def _area(node: UINode) -> int:
+    left, top, right, bottom = node.bounds
+    return (right - left) * (bottom - top)
@@ -1,5 +1,12 @@
 """XCTest utilities for iOS device interaction via WebDriverAgent/XCUITest."""
 
+from phone_agent.xctest.client import (
+    AsyncWDAClient,
+    WDAClient,
+    WDAResponse,
+    close_wda_clients,
+    get_wda_client,
+)
 from phone_agent.xctest.connection import (
     ConnectionType,
     DeviceInfo,
@@ -7,28 +14,48 @@ from phone_agent.xctest.connection import (
     list_devices,
     quick_connect,
 )
+from phone_agent.xctest.context import DeviceGeometry, IOSDeviceContext
 from phone_agent.xctest.device import (
     back,
     double_tap,
     get_current_app,
+    get_scale_factor,
     home,
     launch_app,
     long_press,
+    set_scale_factor,
     swipe,
     tap,
 )
+from phone_agent.xctest.hierarchy import get_ui_tree
 from phone_agent.xctest.input import (
+    TypingResult,
     clear_text,
+    fast_type_text,
     type_text,
 )
 from phone_agent.xctest.screenshot import get_screenshot
+from phone_agent.xctest.stream import (
+    MJPEGFrameSource,
+    get_frame_source,
+    start_frame_source,
+    stop_frame_source,
+)
 
 __all__ = [
     # Screenshot
     "get_screenshot",
+    "MJPEGFrameSource",
+    "start_frame_source",
+    "get_frame_source",
+    "stop_frame_source",
     # Input
     "type_text",
+    "fast_type_text",
+    "TypingResult",
     "clear_text",
+    # UI hierarchy
+    "get_ui_tree",
     # Device control
     "get_current_app",
     "tap",
@@ -38,6 +65,17 @@ __all__ = [
     "double_tap",
     "long_press",
     "launch_app",
+    "get_scale_factor",
+    "set_scale_factor",
+    # Device context
+    "IOSDeviceContext",
+    "DeviceGeometry",
+    # HTTP client
+    "WDAClient",
+    "AsyncWDAClient",
+    "WDAResponse",
+    "get_wda_client",
+    "close_wda_clients",
     # Connection management
     "XCTestConnection",
     "DeviceInfo",
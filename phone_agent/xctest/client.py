@@ -0,0 +1,275 @@
+"""Pooled HTTP client for WebDriverAgent."""
+
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from phone_agent.deadline import command_timeout
+
+# Connect timeout used for every WDA call; the per-call timeout bounds the read.
+CONNECT_TIMEOUT = 3.0
+
+
+class WDAClient:
+    """
+    Keep-alive HTTP client bound to a single WebDriverAgent URL.
+
+    All xctest helpers share one client per WDA URL (see get_wda_client), so
+    the several WDA calls made during one agent step reuse the same TCP
+    connections instead of opening a new one per request.
+
+    Args:
+        wda_url: WebDriverAgent URL.
+        pool_size: Maximum number of pooled connections to the WDA host.
+        connect_timeout: Connect timeout in seconds applied to every call.
+    """
+
+    def __init__(
+        self,
+        wda_url: str = "http://localhost:8100",
+        pool_size: int = 4,
+        connect_timeout: float = CONNECT_TIMEOUT,
+    ):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.wda_url = wda_url.rstrip("/")
+        self.connect_timeout = connect_timeout
+        self.session = requests.Session()
+        self.session.verify = False
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url(self, endpoint: str, session_id: str | None = None) -> str:
+        """
+        Build the full URL for an endpoint.
+
+        Args:
+            endpoint: Endpoint path, e.g. "actions" or "wda/keys".
+            session_id: Optional WDA session ID. When given, the endpoint is
+                scoped to the session.
+
+        Returns:
+            Full URL for the endpoint.
+        """
+        endpoint = endpoint.lstrip("/")
+        if session_id:
+            return f"{self.wda_url}/session/{session_id}/{endpoint}"
+        return f"{self.wda_url}/{endpoint}"
+
+    def _timeout(self, timeout: float | None, endpoint: str) -> tuple[float, float] | None:
+        # Capped by the active step deadline (see phone_agent.deadline)
+        timeout = command_timeout(timeout, f"WDA {endpoint}")
+        if timeout is None:
+            return None
+        return (min(self.connect_timeout, timeout), timeout)
+
+    def get(
+        self,
+        endpoint: str,
+        session_id: str | None = None,
+        timeout: float | None = 10,
+        **kwargs: Any,
+    ):
+        """
+        Send a GET request to WDA.
+
+        Args:
+            endpoint: Endpoint path.
+            session_id: Optional WDA session ID.
+            timeout: Read timeout in seconds for this call.
+            **kwargs: Additional arguments for requests.Session.get.
+
+        Returns:
+            requests.Response object.
+        """
+        return self.session.get(
+            self.url(endpoint, session_id), timeout=self._timeout(timeout, endpoint), **kwargs
+        )
+
+    def post(
+        self,
+        endpoint: str,
+        json: Any = None,
+        session_id: str | None = None,
+        timeout: float | None = 10,
+        **kwargs: Any,
+    ):
+        """
+        Send a POST request to WDA.
+
+        Args:
+            endpoint: Endpoint path.
+            json: Optional JSON payload.
+            session_id: Optional WDA session ID.
+            timeout: Read timeout in seconds for this call.
+            **kwargs: Additional arguments for requests.Session.post.
+
+        Returns:
+            requests.Response object.
+        """
+        return self.session.post(
+            self.url(endpoint, session_id),
+            json=json,
+            timeout=self._timeout(timeout, endpoint),
+            **kwargs,
+        )
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+
+@dataclass
+class WDAResponse:
+    """Buffered response from AsyncWDAClient, mirroring the requests.Response API used here."""
+
+    status_code: int
+    content: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.content or b"null")
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+
+class AsyncWDAClient:
+    """
+    Keep-alive asyncio HTTP client bound to a single WebDriverAgent URL.
+
+    The async counterpart of WDAClient, built on aiohttp. Responses are read
+    fully and returned as WDAResponse, so code written against WDAClient's
+    status_code/json() works unchanged after adding await. Create the client
+    inside the event loop that uses it and close it when done.
+
+    Args:
+        wda_url: WebDriverAgent URL.
+        pool_size: Maximum number of pooled connections to the WDA host.
+        connect_timeout: Connect timeout in seconds applied to every call.
+
+    Example:
+        >>> async with AsyncWDAClient("http://localhost:8100") as client:
+        ...     response = await client.get("status", timeout=5)
+    """
+
+    def __init__(
+        self,
+        wda_url: str = "http://localhost:8100",
+        pool_size: int = 4,
+        connect_timeout: float = CONNECT_TIMEOUT,
+    ):
+        self.wda_url = wda_url.rstrip("/")
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self._session = None
+
+    url = WDAClient.url
+
+    def _get_session(self):
+        import aiohttp
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, ssl=False)
+            )
+        return self._session
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        json: Any = None,
+        session_id: str | None = None,
+        timeout: float | None = 10,
+    ) -> WDAResponse:
+        """
+        Send a request to WDA.
+
+        Args:
+            method: HTTP method.
+            endpoint: Endpoint path.
+            json: Optional JSON payload.
+            session_id: Optional WDA session ID.
+            timeout: Read timeout in seconds for this call.
+
+        Returns:
+            WDAResponse with the status code and body.
+        """
+        import aiohttp
+
+        timeout = command_timeout(timeout, f"WDA {endpoint}")
+        client_timeout = aiohttp.ClientTimeout(
+            sock_connect=self.connect_timeout
+            if timeout is None
+            else min(self.connect_timeout, timeout),
+            sock_read=timeout,
+        )
+        async with self._get_session().request(
+            method, self.url(endpoint, session_id), json=json, timeout=client_timeout
+        ) as response:
+            return WDAResponse(response.status, await response.read())
+
+    async def get(
+        self, endpoint: str, session_id: str | None = None, timeout: float | None = 10
+    ) -> WDAResponse:
+        """Send a GET request to WDA."""
+        return await self.request("GET", endpoint, session_id=session_id, timeout=timeout)
+
+    async def post(
+        self,
+        endpoint: str,
+        json: Any = None,
+        session_id: str | None = None,
+        timeout: float | None = 10,
+    ) -> WDAResponse:
+        """Send a POST request to WDA."""
+        return await self.request(
+            "POST", endpoint, json=json, session_id=session_id, timeout=timeout
+        )
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncWDAClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+
+_clients: dict[str, WDAClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_wda_client(wda_url: str = "http://localhost:8100") -> WDAClient:
+    """
+    Get the shared WDAClient for a WebDriverAgent URL, creating it on first use.
+
+    Args:
+        wda_url: WebDriverAgent URL.
+
+    Returns:
+        WDAClient instance for the URL.
+    """
+    key = wda_url.rstrip("/")
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = WDAClient(key)
+            _clients[key] = client
+        return client
+
+
+def close_wda_clients() -> None:
+    """Close and forget all shared WDA clients."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -1,10 +1,28 @@
 """iOS device connection management via idevice tools and WebDriverAgent."""
 
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 
+from phone_agent.xctest.client import get_wda_client
+
+# ideviceinfo keys read for each device, mapped to detail names
+_DETAIL_KEYS = {
+    "ProductType": "model",
+    "ProductVersion": "ios_version",
+    "DeviceName": "name",
+}
+
+# Maximum number of concurrent ideviceinfo probes
+_MAX_PROBES = 32
+
+# Device details per UDID, kept until the device disappears from idevice_id
+_device_details: dict[str, dict[str, str]] = {}
+_device_details_lock = threading.Lock()
+
 
 class ConnectionType(Enum):
     """Type of iOS connection."""
@@ -54,6 +72,11 @@ class XCTestConnection:
         """
         self.wda_url = wda_url.rstrip("/")
 
+    @property
+    def client(self):
+        """Shared keep-alive WDA client for this connection's URL."""
+        return get_wda_client(self.wda_url)
+
     def list_devices(self) -> list[DeviceInfo]:
         """
         List all connected iOS devices.
@@ -74,21 +97,24 @@ class XCTestConnection:
                 timeout=5,
             )
 
-            devices = []
+            udids = []
             for line in result.stdout.strip().split("\n"):
                 udid = line.strip()
-                if not udid:
-                    continue
+                if udid and udid not in udids:
+                    udids.append(udid)
+
+            # Get detailed device info (cached per UDID, probed concurrently)
+            details = self._get_all_device_details(udids)
 
+            devices = []
+            for udid in udids:
                 # Determine connection type (network devices have specific format)
                 conn_type = (
                     ConnectionType.NETWORK
                     if "-" in udid and len(udid) > 40
                     else ConnectionType.USB
                 )
-
-                # Get detailed device info
-                device_info = self._get_device_details(udid)
+                device_info = details.get(udid, {})
 
                 devices.append(
                     DeviceInfo(
@@ -112,6 +138,48 @@ class XCTestConnection:
             print(f"Error listing devices: {e}")
             return []
 
+    def _get_all_device_details(
+        self, udids: list[str], prune: bool = True
+    ) -> dict[str, dict[str, str]]:
+        """
+        Get details for several devices, probing uncached UDIDs concurrently.
+
+        Args:
+            udids: Device UDIDs.
+            prune: Drop cache entries of devices not in udids, so a device
+                that disappeared is probed again when it reconnects.
+
+        Returns:
+            Dictionary mapping UDID to device details.
+        """
+        with _device_details_lock:
+            if prune:
+                for udid in list(_device_details):
+                    if udid not in udids:
+                        del _device_details[udid]
+            details = {udid: _device_details[udid] for udid in udids if udid in _device_details}
+
+        missing = [udid for udid in udids if udid not in details]
+        if missing:
+            # One ideviceinfo -k call per device and key, all in parallel
+            probes = [(udid, key) for udid in missing for key in _DETAIL_KEYS]
+            with ThreadPoolExecutor(max_workers=min(_MAX_PROBES, len(probes))) as pool:
+                values = list(pool.map(lambda probe: self._read_device_key(*probe), probes))
+
+            for udid in missing:
+                details[udid] = {}
+            for (udid, key), value in zip(probes, values):
+                if value:
+                    details[udid][_DETAIL_KEYS[key]] = value
+
+            with _device_details_lock:
+                for udid in missing:
+                    # Failed probes are not cached so they are retried next time
+                    if details[udid]:
+                        _device_details[udid] = details[udid]
+
+        return details
+
     def _get_device_details(self, udid: str) -> dict[str, str]:
         """
         Get detailed information about a specific device.
@@ -122,32 +190,32 @@ class XCTestConnection:
         Returns:
             Dictionary with device details.
         """
+        return self._get_all_device_details([udid], prune=False)[udid]
+
+    @staticmethod
+    def _read_device_key(udid: str, key: str) -> str | None:
+        """
+        Read a single lockdown value with ideviceinfo -k.
+
+        Args:
+            udid: Device UDID.
+            key: Lockdown key, e.g. "ProductType".
+
+        Returns:
+            The value, or None if it could not be read.
+        """
         try:
             result = subprocess.run(
-                ["ideviceinfo", "-u", udid],
+                ["ideviceinfo", "-u", udid, "-k", key],
                 capture_output=True,
                 text=True,
                 timeout=5,
             )
-
-            info = {}
-            for line in result.stdout.split("\n"):
-                if ": " in line:
-                    key, value = line.split(": ", 1)
-                    key = key.strip()
-                    value = value.strip()
-
-                    if key == "ProductType":
-                        info["model"] = value
-                    elif key == "ProductVersion":
-                        info["ios_version"] = value
-                    elif key == "DeviceName":
-                        info["name"] = value
-
-            return info
-
+            if result.returncode != 0:
+                return None
+            return result.stdout.strip() or None
         except Exception:
-            return {}
+            return None
 
     def get_device_info(self, device_id: str | None = None) -> DeviceInfo | None:
         """
@@ -204,11 +272,7 @@ class XCTestConnection:
             True if WDA is ready, False otherwise.
         """
         try:
-            import requests
-
-            response = requests.get(
-                f"{self.wda_url}/status", timeout=timeout, verify=False
-            )
+            response = self.client.get("status", timeout=timeout)
             return response.status_code == 200
         except ImportError:
             print(
@@ -226,13 +290,8 @@ class XCTestConnection:
             Tuple of (success, session_id or error_message).
         """
         try:
-            import requests
-
-            response = requests.post(
-                f"{self.wda_url}/session",
-                json={"capabilities": {}},
-                timeout=30,
-                verify=False,
+            response = self.client.post(
+                "session", json={"capabilities": {}}, timeout=30
             )
 
             if response.status_code in (200, 201):
@@ -260,9 +319,7 @@ class XCTestConnection:
             Status dictionary or None if not available.
         """
         try:
-            import requests
-
-            response = requests.get(f"{self.wda_url}/status", timeout=5, verify=False)
+            response = self.client.get("status", timeout=5)
 
             if response.status_code == 200:
                 return response.json()
@@ -314,6 +371,12 @@ class XCTestConnection:
         Returns:
             Device name string or None if not found.
         """
+        if device_id:
+            with _device_details_lock:
+                cached = _device_details.get(device_id, {}).get("name")
+            if cached:
+                return cached
+
         try:
             cmd = ["ideviceinfo"]
             if device_id:
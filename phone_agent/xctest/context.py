@@ -0,0 +1,194 @@
+"""Per-device iOS state: cached screen geometry and WDA session health."""
+
+import time
+from dataclasses import dataclass
+
+from phone_agent.xctest.client import get_wda_client
+from phone_agent.xctest.connection import XCTestConnection
+from phone_agent.xctest.device import set_scale_factor
+
+# Typical iPhone scales (pixels per point); measured ratios are snapped to these.
+_KNOWN_SCALES = (1.0, 2.0, 3.0)
+
+
+@dataclass
+class DeviceGeometry:
+    """Screen geometry of an iOS device."""
+
+    width: int  # Window width in points
+    height: int  # Window height in points
+    scale: float  # Screenshot pixels per point
+    orientation: str  # "PORTRAIT" or "LANDSCAPE"
+
+    @property
+    def is_landscape(self) -> bool:
+        return self.width > self.height
+
+
+class IOSDeviceContext:
+    """
+    Cached geometry and WDA session state for one iOS device.
+
+    The window size, scale factor and orientation are fetched once and only
+    refreshed when the screenshot aspect ratio shows the orientation changed.
+    The WDA session is checked with a cheap ping at most every ping_interval
+    seconds and recreated transparently when it has expired.
+
+    Args:
+        wda_url: WebDriverAgent URL.
+        session_id: Existing WDA session ID, or None to create one.
+        ping_interval: Minimum seconds between session health pings.
+        verbose: Whether to print session changes.
+
+    Example:
+        >>> context = IOSDeviceContext("http://localhost:8100")
+        >>> session_id = context.ensure_session()
+        >>> geometry = context.geometry(1170, 2532)
+    """
+
+    def __init__(
+        self,
+        wda_url: str = "http://localhost:8100",
+        session_id: str | None = None,
+        ping_interval: float = 10.0,
+        verbose: bool = False,
+    ):
+        self.wda_url = wda_url.rstrip("/")
+        self.session_id = session_id
+        self.ping_interval = ping_interval
+        self.verbose = verbose
+        self.connection = XCTestConnection(wda_url=self.wda_url)
+        self.sessions_created = 0
+
+        self._geometry: DeviceGeometry | None = None
+        self._last_ping = 0.0
+        self._default_session = False
+
+    @property
+    def client(self):
+        return get_wda_client(self.wda_url)
+
+    def ensure_session(self, force: bool = False) -> str | None:
+        """
+        Make sure the WDA session is alive, recreating it if needed.
+
+        Args:
+            force: Ping even if the last ping was recent.
+
+        Returns:
+            The current (possibly new) session ID, or None if WDA uses the
+            default session.
+        """
+        now = time.time()
+        if self._default_session:
+            return None
+        if not force and now - self._last_ping < self.ping_interval:
+            return self.session_id
+
+        if self.session_id and self._session_alive():
+            self._last_ping = now
+            return self.session_id
+
+        success, session_id = self.connection.start_wda_session()
+        if success and session_id != "session_started":
+            if self.verbose and self.session_id:
+                print(f"🔄 WDA session expired, recreated: {session_id}")
+            self.session_id = session_id
+            self.sessions_created += 1
+            self._last_ping = time.time()
+            # A new session may come with a different orientation
+            self._geometry = None
+        elif success:
+            # WDA started a session without reporting its ID; use the default
+            self._default_session = True
+        else:
+            # Retry after ping_interval instead of on every step
+            self._last_ping = now
+            if self.verbose:
+                print(f"⚠️  {session_id}")
+
+        return self.session_id
+
+    def _session_alive(self) -> bool:
+        try:
+            response = self.client.get(f"session/{self.session_id}", timeout=3)
+        except Exception:
+            return False
+        return response.status_code == 200
+
+    def geometry(
+        self, screenshot_width: int | None = None, screenshot_height: int | None = None
+    ) -> DeviceGeometry | None:
+        """
+        Get the cached device geometry.
+
+        Args:
+            screenshot_width: Width of the latest screenshot in pixels.
+            screenshot_height: Height of the latest screenshot in pixels.
+
+        Returns:
+            DeviceGeometry, or None if WDA could not report the window size.
+
+        Note:
+            The geometry is refreshed only when the screenshot orientation no
+            longer matches the cached one. The measured scale is also applied
+            to coordinates sent by the xctest device functions.
+        """
+        cached = self._geometry
+        if cached is not None and (
+            screenshot_width is None
+            or screenshot_height is None
+            or (screenshot_width > screenshot_height) == cached.is_landscape
+        ):
+            return cached
+
+        size = self._fetch_window_size()
+        if size is None:
+            return cached
+
+        width, height = size
+        scale = cached.scale if cached is not None else None
+        if screenshot_width and width:
+            measured = screenshot_width / width
+            scale = min(_KNOWN_SCALES, key=lambda known: abs(known - measured))
+        if scale is None:
+            return cached
+
+        self._geometry = DeviceGeometry(
+            width=width,
+            height=height,
+            scale=scale,
+            orientation=self._fetch_orientation()
+            or ("LANDSCAPE" if width > height else "PORTRAIT"),
+        )
+        set_scale_factor(self.wda_url, scale)
+        return self._geometry
+
+    def invalidate(self) -> None:
+        """Drop the cached geometry so it is fetched again on next use."""
+        self._geometry = None
+
+    def _fetch_window_size(self) -> tuple[int, int] | None:
+        try:
+            response = self.client.get(
+                "window/size", session_id=self.session_id, timeout=5
+            )
+            if response.status_code == 200:
+                value = response.json().get("value") or {}
+                if value.get("width") and value.get("height"):
+                    return int(value["width"]), int(value["height"])
+        except Exception:
+            pass
+        return None
+
+    def _fetch_orientation(self) -> str | None:
+        try:
+            response = self.client.get(
+                "orientation", session_id=self.session_id, timeout=5
+            )
+            if response.status_code == 200:
+                value = response.json().get("value")
+                return value.upper() if isinstance(value, str) else None
+        except Exception:
+            pass
+        return None
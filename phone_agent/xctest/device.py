@@ -5,27 +5,28 @@ import time
 from typing import Optional
 
 from phone_agent.config.apps_ios import APP_PACKAGES_IOS as APP_PACKAGES
+from phone_agent.xctest.client import get_wda_client
 
 SCALE_FACTOR = 3 # 3 for most modern iPhone 
 
-def _get_wda_session_url(wda_url: str, session_id: str | None, endpoint: str) -> str:
+# Measured screenshot pixels per WDA point, per WDA URL (see IOSDeviceContext).
+_scale_factors: dict[str, float] = {}
+
+
+def set_scale_factor(wda_url: str, scale: float) -> None:
     """
-    Get the correct WDA URL for a session endpoint.
+    Set the pixel-to-point scale used for coordinates sent to a WDA URL.
 
     Args:
-        wda_url: Base WDA URL.
-        session_id: Optional session ID.
-        endpoint: The endpoint path.
-
-    Returns:
-        Full URL for the endpoint.
+        wda_url: WebDriverAgent URL.
+        scale: Screenshot pixels per WDA point.
     """
-    base = wda_url.rstrip("/")
-    if session_id:
-        return f"{base}/session/{session_id}/{endpoint}"
-    else:
-        # Try to use WDA endpoints without session when possible
-        return f"{base}/{endpoint}"
+    _scale_factors[wda_url.rstrip("/")] = scale
+
+
+def get_scale_factor(wda_url: str = "http://localhost:8100") -> float:
+    """Get the pixel-to-point scale for a WDA URL (SCALE_FACTOR if unknown)."""
+    return _scale_factors.get(wda_url.rstrip("/"), SCALE_FACTOR)
 
 
 def get_current_app(
@@ -42,12 +43,8 @@ def get_current_app(
         The app name if recognized, otherwise "System Home".
     """
     try:
-        import requests
-
         # Get active app info from WDA using activeAppInfo endpoint
-        response = requests.get(
-            f"{wda_url.rstrip('/')}/wda/activeAppInfo", timeout=5, verify=False
-        )
+        response = get_wda_client(wda_url).get("wda/activeAppInfo", timeout=5)
 
         if response.status_code == 200:
             data = response.json()
@@ -90,10 +87,7 @@ def tap(
         delay: Delay in seconds after tap.
     """
     try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "actions")
-
+        scale = get_scale_factor(wda_url)
         # W3C WebDriver Actions API for tap/click
         actions = {
             "actions": [
@@ -102,7 +96,7 @@ def tap(
                     "id": "finger1",
                     "parameters": {"pointerType": "touch"},
                     "actions": [
-                        {"type": "pointerMove", "duration": 0, "x": x / SCALE_FACTOR, "y": y / SCALE_FACTOR},
+                        {"type": "pointerMove", "duration": 0, "x": x / scale, "y": y / scale},
                         {"type": "pointerDown", "button": 0},
                         {"type": "pause", "duration": 0.1},
                         {"type": "pointerUp", "button": 0},
@@ -111,7 +105,9 @@ def tap(
             ]
         }
 
-        requests.post(url, json=actions, timeout=15, verify=False)
+        get_wda_client(wda_url).post(
+            "actions", json=actions, session_id=session_id, timeout=15
+        )
 
         time.sleep(delay)
 
@@ -139,10 +135,7 @@ def double_tap(
         delay: Delay in seconds after double tap.
     """
     try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "actions")
-
+        scale = get_scale_factor(wda_url)
         # W3C WebDriver Actions API for double tap
         actions = {
             "actions": [
@@ -151,7 +144,7 @@ def double_tap(
                     "id": "finger1",
                     "parameters": {"pointerType": "touch"},
                     "actions": [
-                        {"type": "pointerMove", "duration": 0, "x": x / SCALE_FACTOR, "y": y / SCALE_FACTOR},
+                        {"type": "pointerMove", "duration": 0, "x": x / scale, "y": y / scale},
                         {"type": "pointerDown", "button": 0},
                         {"type": "pause", "duration": 100},
                         {"type": "pointerUp", "button": 0},
@@ -164,7 +157,9 @@ def double_tap(
             ]
         }
 
-        requests.post(url, json=actions, timeout=10, verify=False)
+        get_wda_client(wda_url).post(
+            "actions", json=actions, session_id=session_id, timeout=10
+        )
 
         time.sleep(delay)
 
@@ -194,10 +189,7 @@ def long_press(
         delay: Delay in seconds after long press.
     """
     try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "actions")
-
+        scale = get_scale_factor(wda_url)
         # W3C WebDriver Actions API for long press
         # Convert duration to milliseconds
         duration_ms = int(duration * 1000)
@@ -209,7 +201,7 @@ def long_press(
                     "id": "finger1",
                     "parameters": {"pointerType": "touch"},
                     "actions": [
-                        {"type": "pointerMove", "duration": 0, "x": x / SCALE_FACTOR, "y": y / SCALE_FACTOR},
+                        {"type": "pointerMove", "duration": 0, "x": x / scale, "y": y / scale},
                         {"type": "pointerDown", "button": 0},
                         {"type": "pause", "duration": duration_ms},
                         {"type": "pointerUp", "button": 0},
@@ -218,7 +210,9 @@ def long_press(
             ]
         }
 
-        requests.post(url, json=actions, timeout=int(duration + 10), verify=False)
+        get_wda_client(wda_url).post(
+            "actions", json=actions, session_id=session_id, timeout=duration + 10
+        )
 
         time.sleep(delay)
 
@@ -252,26 +246,28 @@ def swipe(
         delay: Delay in seconds after swipe.
     """
     try:
-        import requests
-
         if duration is None:
             # Calculate duration based on distance
             dist_sq = (start_x - end_x) ** 2 + (start_y - end_y) ** 2
             duration = dist_sq / 1000000  # Convert to seconds
             duration = max(0.3, min(duration, 2.0))  # Clamp between 0.3-2 seconds
 
-        url = _get_wda_session_url(wda_url, session_id, "wda/dragfromtoforduration")
-
         # WDA dragfromtoforduration API payload
+        scale = get_scale_factor(wda_url)
         payload = {
-            "fromX": start_x / SCALE_FACTOR,
-            "fromY": start_y / SCALE_FACTOR,
-            "toX": end_x / SCALE_FACTOR,
-            "toY": end_y / SCALE_FACTOR,
+            "fromX": start_x / scale,
+            "fromY": start_y / scale,
+            "toX": end_x / scale,
+            "toY": end_y / scale,
             "duration": duration,
         }
 
-        requests.post(url, json=payload, timeout=int(duration + 10), verify=False)
+        get_wda_client(wda_url).post(
+            "wda/dragfromtoforduration",
+            json=payload,
+            session_id=session_id,
+            timeout=duration + 10,
+        )
 
         time.sleep(delay)
 
@@ -299,10 +295,6 @@ def back(
         by swiping from the left edge of the screen.
     """
     try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "wda/dragfromtoforduration")
-
         # Swipe from left edge to simulate back gesture
         payload = {
             "fromX": 0,
@@ -312,7 +304,9 @@ def back(
             "duration": 0.3,
         }
 
-        requests.post(url, json=payload, timeout=10, verify=False)
+        get_wda_client(wda_url).post(
+            "wda/dragfromtoforduration", json=payload, session_id=session_id, timeout=10
+        )
 
         time.sleep(delay)
 
@@ -336,11 +330,7 @@ def home(
         delay: Delay in seconds after pressing home.
     """
     try:
-        import requests
-
-        url = f"{wda_url.rstrip('/')}/wda/homescreen"
-
-        requests.post(url, timeout=10, verify=False)
+        get_wda_client(wda_url).post("wda/homescreen", timeout=10)
 
         time.sleep(delay)
 
@@ -372,13 +362,10 @@ def launch_app(
         return False
 
     try:
-        import requests
-
         bundle_id = APP_PACKAGES[app_name]
-        url = _get_wda_session_url(wda_url, session_id, "wda/apps/launch")
 
-        response = requests.post(
-            url, json={"bundleId": bundle_id}, timeout=10, verify=False
+        response = get_wda_client(wda_url).post(
+            "wda/apps/launch", json={"bundleId": bundle_id}, session_id=session_id, timeout=10
         )
 
         time.sleep(delay)
@@ -406,11 +393,7 @@ def get_screen_size(
         Tuple of (width, height). Returns (375, 812) as default if unable to fetch.
     """
     try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "window/size")
-
-        response = requests.get(url, timeout=5, verify=False)
+        response = get_wda_client(wda_url).get("window/size", session_id=session_id, timeout=5)
 
         if response.status_code == 200:
             data = response.json()
@@ -444,11 +427,7 @@ def press_button(
         delay: Delay in seconds after pressing.
     """
     try:
-        import requests
-
-        url = f"{wda_url.rstrip('/')}/wda/pressButton"
-
-        requests.post(url, json={"name": button_name}, timeout=10, verify=False)
+        get_wda_client(wda_url).post("wda/pressButton", json={"name": button_name}, timeout=10)
 
         time.sleep(delay)
 
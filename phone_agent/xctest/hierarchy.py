@@ -0,0 +1,47 @@
+"""UI hierarchy from WebDriverAgent's /source endpoint."""
+
+from phone_agent.ui_tree import UITree, parse_wda_xml
+from phone_agent.xctest.client import get_wda_client
+from phone_agent.xctest.device import get_scale_factor
+
+
+def get_ui_tree(
+    wda_url: str = "http://localhost:8100",
+    session_id: str | None = None,
+    timeout: int = 10,
+    width: int = 0,
+    height: int = 0,
+) -> UITree | None:
+    """
+    Fetch and compact the current UI hierarchy.
+
+    WDA returns the XML source as a JSON string, so it arrives in one piece;
+    bounds are converted from points to screenshot pixels.
+
+    Args:
+        wda_url: WebDriverAgent URL.
+        session_id: Optional WDA session ID.
+        timeout: Timeout in seconds for the request.
+        width: Screen width in pixels (0 to take it from the source).
+        height: Screen height in pixels.
+
+    Returns:
+        The compacted UITree, or None if the request failed.
+    """
+    try:
+        response = get_wda_client(wda_url).get(
+            "source?format=xml", session_id=session_id, timeout=timeout
+        )
+        if response.status_code != 200:
+            return None
+        source = response.json().get("value", "")
+    except Exception as e:
+        print(f"UI hierarchy error: {e}")
+        return None
+
+    if not isinstance(source, str) or not source:
+        return None
+    tree = parse_wda_xml(
+        [source.encode("utf-8")], get_scale_factor(wda_url), width, height
+    )
+    return tree if tree.nodes else None
@@ -1,26 +1,46 @@
 """Input utilities for iOS device text input via WebDriverAgent."""
 
+import base64
 import time
+from dataclasses import dataclass
 
+from phone_agent.xctest.client import get_wda_client
 
-def _get_wda_session_url(wda_url: str, session_id: str | None, endpoint: str) -> str:
-    """
-    Get the correct WDA URL for a session endpoint.
+# WDA typing frequency used by fast_type_text (keys per minute, 60 chars/s).
+FAST_TYPING_FREQUENCY = 3600
 
-    Args:
-        wda_url: Base WDA URL.
-        session_id: Optional session ID.
-        endpoint: The endpoint path.
+# Methods tried in order by fast_type_text. "set_value" sets the focused
+# element's value directly, "keys" types at FAST_TYPING_FREQUENCY, "slow"
+# types at the default WDA frequency and is never verified.
+INPUT_METHODS = ("set_value", "keys", "slow")
 
-    Returns:
-        Full URL for the endpoint.
-    """
-    base = wda_url.rstrip("/")
-    if session_id:
-        return f"{base}/session/{session_id}/{endpoint}"
-    else:
-        # Try to use WDA endpoints without session when possible
-        return f"{base}/{endpoint}"
+_ELEMENT_KEYS = ("ELEMENT", "element-6066-11e4-a52e-4f735466cecf")
+
+
+@dataclass
+class TypingResult:
+    """Outcome of a fast_type_text call."""
+
+    success: bool
+    method: str | None
+    chars: int
+    elapsed: float
+    verified: bool = False
+    attempts: tuple[str, ...] = ()
+
+    @property
+    def chars_per_second(self) -> float:
+        """Typing throughput of the method that succeeded."""
+        return self.chars / self.elapsed if self.elapsed > 0 else 0.0
+
+    def describe(self) -> str:
+        """Short human-readable summary, e.g. for ActionResult.message."""
+        if not self.success:
+            return f"Text input failed (tried: {', '.join(self.attempts)})"
+        return (
+            f"Typed {self.chars} chars via {self.method} "
+            f"in {self.elapsed:.2f}s ({self.chars_per_second:.1f} chars/s)"
+        )
 
 
 def type_text(
@@ -43,13 +63,12 @@ def type_text(
         Use tap() to focus on the input field first.
     """
     try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "wda/keys")
-
         # Send text to WDA
-        response = requests.post(
-            url, json={"value": list(text), "frequency": frequency}, timeout=30, verify=False
+        response = get_wda_client(wda_url).post(
+            "wda/keys",
+            json={"value": list(text), "frequency": frequency},
+            session_id=session_id,
+            timeout=30,
         )
 
         if response.status_code not in (200, 201):
@@ -61,6 +80,133 @@ def type_text(
         print(f"Error typing text: {e}")
 
 
+def fast_type_text(
+    text: str,
+    wda_url: str = "http://localhost:8100",
+    session_id: str | None = None,
+    methods: tuple[str, ...] = INPUT_METHODS,
+    frequency: int = FAST_TYPING_FREQUENCY,
+    verify: bool = True,
+) -> TypingResult:
+    """
+    Enter text into the focused field using the fastest method it accepts.
+
+    Methods are tried in order (see INPUT_METHODS). A method counts as
+    rejected when WDA returns an error or, with verify enabled, when the
+    field's value does not contain the text afterwards; the field is then
+    cleared and the next method is tried.
+
+    Args:
+        text: The text to enter.
+        wda_url: WebDriverAgent URL.
+        session_id: Optional WDA session ID.
+        methods: Methods to try, in order.
+        frequency: Typing frequency (keys per minute) for the "keys" method.
+        verify: Whether to read the field value back after typing.
+
+    Returns:
+        TypingResult with the method used and characters per second.
+
+    Note:
+        The input field must be focused before calling this function.
+    """
+    attempts = []
+    try:
+        client = get_wda_client(wda_url)
+        element_id = _get_active_element(wda_url, session_id)
+
+        for method in methods:
+            if method == "set_value" and not element_id:
+                continue
+            attempts.append(method)
+
+            start = time.time()
+            if method == "set_value":
+                response = client.post(
+                    f"element/{element_id}/value",
+                    json={"value": list(text), "frequency": frequency},
+                    session_id=session_id,
+                    timeout=30,
+                )
+            else:
+                response = client.post(
+                    "wda/keys",
+                    json={
+                        "value": list(text),
+                        "frequency": frequency if method == "keys" else 60,
+                    },
+                    session_id=session_id,
+                    timeout=30 if method == "keys" else max(30, len(text) * 2),
+                )
+            elapsed = time.time() - start
+
+            if response.status_code not in (200, 201):
+                continue
+
+            if method == "slow" or not verify or not element_id:
+                return TypingResult(True, method, len(text), elapsed, False, tuple(attempts))
+
+            value = _get_element_value(wda_url, session_id, element_id)
+            if value is None or _value_matches(value, text):
+                return TypingResult(
+                    True, method, len(text), elapsed, value is not None, tuple(attempts)
+                )
+
+            # Field dropped or mangled the text; reset it before the next method
+            client.post(f"element/{element_id}/clear", session_id=session_id, timeout=10)
+
+    except ImportError:
+        print("Error: requests library required. Install: pip install requests")
+    except Exception as e:
+        print(f"Error typing text: {e}")
+
+    return TypingResult(False, None, len(text), 0.0, False, tuple(attempts))
+
+
+def _get_active_element(
+    wda_url: str = "http://localhost:8100",
+    session_id: str | None = None,
+) -> str | None:
+    """Get the element ID of the focused element, or None."""
+    try:
+        response = get_wda_client(wda_url).get(
+            "element/active", session_id=session_id, timeout=5
+        )
+        if response.status_code == 200:
+            value = response.json().get("value") or {}
+            for key in _ELEMENT_KEYS:
+                if value.get(key):
+                    return value[key]
+    except Exception:
+        pass
+    return None
+
+
+def _get_element_value(
+    wda_url: str,
+    session_id: str | None,
+    element_id: str,
+) -> str | None:
+    """Read an element's value attribute, or None if it is not readable."""
+    try:
+        response = get_wda_client(wda_url).get(
+            f"element/{element_id}/attribute/value", session_id=session_id, timeout=5
+        )
+        if response.status_code == 200:
+            value = response.json().get("value")
+            return value if isinstance(value, str) else None
+    except Exception:
+        pass
+    return None
+
+
+def _value_matches(value: str, text: str) -> bool:
+    """Check a field value against the typed text (secure fields show bullets)."""
+    if text in value:
+        return True
+    return bool(value) and set(value) <= {"•", "●"} and len(value) >= len(text)
+
+
 def clear_text(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
@@ -77,12 +223,10 @@ def clear_text(
         The input field must be focused before calling this function.
     """
     try:
-        import requests
+        client = get_wda_client(wda_url)
 
         # First, try to get the active element
-        url = _get_wda_session_url(wda_url, session_id, "element/active")
-
-        response = requests.get(url, timeout=10, verify=False)
+        response = client.get("element/active", session_id=session_id, timeout=10)
 
         if response.status_code == 200:
             data = response.json()
@@ -90,8 +234,7 @@ def clear_text(
 
             if element_id:
                 # Clear the element
-                clear_url = _get_wda_session_url(wda_url, session_id, f"element/{element_id}/clear")
-                requests.post(clear_url, timeout=10, verify=False)
+                client.post(f"element/{element_id}/clear", session_id=session_id, timeout=10)
                 return
 
         # Fallback: send backspace commands
@@ -117,17 +260,13 @@ def _clear_with_backspace(
         max_backspaces: Maximum number of backspaces to send.
     """
     try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "wda/keys")
-
         # Send backspace character multiple times
         backspace_char = "\u0008"  # Backspace Unicode character
-        requests.post(
-            url,
+        get_wda_client(wda_url).post(
+            "wda/keys",
             json={"value": [backspace_char] * max_backspaces},
+            session_id=session_id,
             timeout=10,
-            verify=False,
         )
 
     except Exception as e:
@@ -152,11 +291,9 @@ def send_keys(
         >>> send_keys(["\n"])  # Send enter key
     """
     try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "wda/keys")
-
-        requests.post(url, json={"value": keys}, timeout=10, verify=False)
+        get_wda_client(wda_url).post(
+            "wda/keys", json={"value": keys}, session_id=session_id, timeout=10
+        )
 
     except ImportError:
         print("Error: requests library required. Install: pip install requests")
@@ -193,11 +330,7 @@ def hide_keyboard(
         session_id: Optional WDA session ID.
     """
     try:
-        import requests
-
-        url = f"{wda_url.rstrip('/')}/wda/keyboard/dismiss"
-
-        requests.post(url, timeout=10, verify=False)
+        get_wda_client(wda_url).post("wda/keyboard/dismiss", timeout=10)
 
     except ImportError:
         print("Error: requests library required. Install: pip install requests")
@@ -220,11 +353,9 @@ def is_keyboard_shown(
         True if keyboard is shown, False otherwise.
     """
     try:
-        import requests
-
-        url = _get_wda_session_url(wda_url, session_id, "wda/keyboard/shown")
-
-        response = requests.get(url, timeout=5, verify=False)
+        response = get_wda_client(wda_url).get(
+            "wda/keyboard/shown", session_id=session_id, timeout=5
+        )
 
         if response.status_code == 200:
             data = response.json()
@@ -254,12 +385,12 @@ def set_pasteboard(
         After setting pasteboard, you can simulate paste gesture.
     """
     try:
-        import requests
-
-        url = f"{wda_url.rstrip('/')}/wda/setPasteboard"
-
-        requests.post(
-            url, json={"content": text, "contentType": "plaintext"}, timeout=10, verify=False
+        # WDA expects the content base64-encoded
+        content = base64.b64encode(text.encode("utf-8")).decode("ascii")
+        get_wda_client(wda_url).post(
+            "wda/setPasteboard",
+            json={"content": content, "contentType": "plaintext"},
+            timeout=10,
         )
 
     except ImportError:
@@ -281,15 +412,13 @@ def get_pasteboard(
         Pasteboard content or None if failed.
     """
     try:
-        import requests
-
-        url = f"{wda_url.rstrip('/')}/wda/getPasteboard"
-
-        response = requests.post(url, timeout=10, verify=False)
+        response = get_wda_client(wda_url).post("wda/getPasteboard", timeout=10)
 
         if response.status_code == 200:
             data = response.json()
-            return data.get("value")
+            value = data.get("value")
+            # WDA returns the content base64-encoded
+            return base64.b64decode(value).decode("utf-8") if value else value
 
     except ImportError:
         print("Error: requests library required. Install: pip install requests")
@@ -2,7 +2,6 @@
 
 import base64
 import os
-import subprocess
 import tempfile
 import uuid
 from dataclasses import dataclass
@@ -10,6 +9,9 @@ from io import BytesIO
 
 from PIL import Image
 
+from phone_agent.deadline import run_command
+from phone_agent.xctest.client import get_wda_client
+
 
 @dataclass
 class Screenshot:
@@ -21,6 +23,12 @@ class Screenshot:
     is_sensitive: bool = False
 
 
+# Device screenshot size per WDA URL, recorded from /screenshot. MJPEG frames
+# may be scaled down, so they are reported with this size to keep coordinate
+# conversion in device pixels.
+_native_sizes: dict[str, tuple[int, int]] = {}
+
+
 def get_screenshot(
     wda_url: str = "http://localhost:8100",
     session_id: str | None = None,
@@ -40,10 +48,16 @@ def get_screenshot(
         Screenshot object containing base64 data and dimensions.
 
     Note:
-        Tries WebDriverAgent first, falls back to idevicescreenshot if available.
-        If both fail, returns a black fallback image.
+        Uses the latest MJPEG frame when a frame source is running for this
+        WDA URL (see phone_agent.xctest.stream), otherwise tries WebDriverAgent
+        /screenshot, then falls back to idevicescreenshot if available.
+        If all fail, returns a black fallback image.
     """
-    # Try WebDriverAgent first (preferred method)
+    screenshot = _get_screenshot_stream(wda_url)
+    if screenshot:
+        return screenshot
+
+    # Try WebDriverAgent /screenshot (preferred one-shot method)
     screenshot = _get_screenshot_wda(wda_url, session_id, timeout)
     if screenshot:
         return screenshot
@@ -57,6 +71,40 @@ def get_screenshot(
     return _create_fallback_screenshot(is_sensitive=False)
 
 
+def _get_screenshot_stream(wda_url: str) -> Screenshot | None:
+    """
+    Get the latest frame from a running MJPEG frame source.
+
+    Args:
+        wda_url: WebDriverAgent URL.
+
+    Returns:
+        Screenshot object, or None if no source is running, the frame is stale,
+        or the device size is not known yet.
+    """
+    from phone_agent.xctest.stream import get_frame_source
+
+    source = get_frame_source(wda_url)
+    if source is None or not source.is_running:
+        return None
+
+    # Needs one /screenshot first to learn the device pixel size
+    native = _native_sizes.get(wda_url.rstrip("/"))
+    if native is None:
+        return None
+
+    screenshot = source.latest_frame()
+    if screenshot is None:
+        return None
+
+    width, height = native
+    if (screenshot.width > screenshot.height) != (width > height):
+        # Orientation changed since the size was recorded
+        width, height = height, width
+    screenshot.width, screenshot.height = width, height
+    return screenshot
+
+
 def _get_screenshot_wda(
     wda_url: str, session_id: str | None, timeout: int
 ) -> Screenshot | None:
@@ -72,11 +120,7 @@ def _get_screenshot_wda(
         Screenshot object or None if failed.
     """
     try:
-        import requests
-
-        url = f"{wda_url.rstrip('/')}/screenshot"
-
-        response = requests.get(url, timeout=timeout, verify=False)
+        response = get_wda_client(wda_url).get("screenshot", timeout=timeout)
 
         if response.status_code == 200:
             data = response.json()
@@ -87,6 +131,7 @@ def _get_screenshot_wda(
                 img_data = base64.b64decode(base64_data)
                 img = Image.open(BytesIO(img_data))
                 width, height = img.size
+                _native_sizes[wda_url.rstrip("/")] = (width, height)
 
                 return Screenshot(
                     base64_data=base64_data,
@@ -126,9 +171,7 @@ def _get_screenshot_idevice(
             cmd.extend(["-u", device_id])
         cmd.append(temp_path)
 
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=timeout
-        )
+        result = run_command(cmd, timeout=timeout, capture_output=True, text=True)
 
         if result.returncode == 0 and os.path.exists(temp_path):
             # Read and encode image
@@ -0,0 +1,286 @@
+"""Continuous iOS frame source backed by the WebDriverAgent MJPEG server."""
+
+import base64
+import hashlib
+import threading
+import time
+from io import BytesIO
+
+from PIL import Image
+
+from phone_agent.xctest.screenshot import Screenshot
+
+_JPEG_SOI = b"\xff\xd8"
+_JPEG_EOI = b"\xff\xd9"
+
+
+class MJPEGFrameSource:
+    """
+    Keeps the WDA MJPEG stream open in a background thread and holds the
+    latest frame.
+
+    WebDriverAgent serves a multipart MJPEG stream (port 9100 by default).
+    Reading it continuously means a screenshot is available immediately
+    instead of costing a blocking GET /screenshot per step, and callers can
+    watch frames change to detect when the UI has settled.
+
+    Args:
+        mjpeg_url: MJPEG server URL, e.g. http://localhost:9100.
+        max_age: Frames older than this (seconds) are considered stale.
+        reconnect_delay: Delay before reconnecting after the stream drops.
+        read_timeout: Socket read timeout for the stream in seconds.
+
+    Example:
+        >>> source = MJPEGFrameSource("http://localhost:9100")
+        >>> source.start()
+        >>> screenshot = source.latest_frame()
+        >>> source.stop()
+    """
+
+    def __init__(
+        self,
+        mjpeg_url: str = "http://localhost:9100",
+        max_age: float = 2.0,
+        reconnect_delay: float = 1.0,
+        read_timeout: float = 10.0,
+    ):
+        self.mjpeg_url = mjpeg_url.rstrip("/")
+        self.max_age = max_age
+        self.reconnect_delay = reconnect_delay
+        self.read_timeout = read_timeout
+
+        self._frame: bytes | None = None
+        self._frame_size: tuple[int, int] | None = None
+        self._frame_time = 0.0
+        self._frame_id = 0
+        self._frame_digest: bytes | None = None
+        self._last_change_time = 0.0
+
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._response = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background reader thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def frame_id(self) -> int:
+        """Counter incremented for every frame whose content changed."""
+        with self._cond:
+            return self._frame_id
+
+    def start(self) -> "MJPEGFrameSource":
+        """Start the background reader (no-op if already running)."""
+        if self.is_running:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="wda-mjpeg", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the background reader and close the stream."""
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            try:
+                response.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        with self._cond:
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        import requests
+
+        while not self._stop.is_set():
+            try:
+                with requests.get(
+                    self.mjpeg_url, stream=True, timeout=(3, self.read_timeout)
+                ) as response:
+                    self._response = response
+                    response.raise_for_status()
+                    self._read_stream(response)
+            except Exception:
+                if self._stop.is_set():
+                    break
+            finally:
+                self._response = None
+            self._stop.wait(self.reconnect_delay)
+
+    def _read_stream(self, response) -> None:
+        """Extract JPEG frames from the multipart stream by SOI/EOI markers."""
+        buffer = b""
+        for chunk in self._iter_chunks(response):
+            if self._stop.is_set():
+                return
+            if not chunk:
+                continue
+            buffer += chunk
+
+            # Keep only the newest complete frame in the buffer
+            while True:
+                start = buffer.find(_JPEG_SOI)
+                if start < 0:
+                    buffer = b""
+                    break
+                end = buffer.find(_JPEG_EOI, start + 2)
+                if end < 0:
+                    buffer = buffer[start:]
+                    break
+                self._publish(buffer[start : end + 2])
+                buffer = buffer[end + 2 :]
+
+    @staticmethod
+    def _iter_chunks(response):
+        """
+        Yield stream data as soon as it arrives.
+
+        iter_content() blocks until a full chunk is buffered, which would hold
+        back small frames; urllib3 2.x read1() returns whatever is available.
+        """
+        raw = response.raw
+        if hasattr(raw, "read1"):
+            while True:
+                chunk = raw.read1(65536)
+                if not chunk:
+                    return
+                yield chunk
+        else:
+            yield from response.iter_content(chunk_size=1024)
+
+    def _publish(self, jpeg: bytes) -> None:
+        try:
+            size = Image.open(BytesIO(jpeg)).size
+        except Exception:
+            return
+
+        digest = hashlib.md5(jpeg).digest()
+        now = time.time()
+        with self._cond:
+            self._frame = jpeg
+            self._frame_size = size
+            self._frame_time = now
+            if digest != self._frame_digest:
+                self._frame_digest = digest
+                self._frame_id += 1
+                self._last_change_time = now
+            self._cond.notify_all()
+
+    def latest_frame(self, max_age: float | None = None) -> Screenshot | None:
+        """
+        Get the most recent frame.
+
+        Args:
+            max_age: Maximum frame age in seconds (defaults to self.max_age).
+
+        Returns:
+            Screenshot with base64 JPEG data, or None if no fresh frame exists.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        with self._cond:
+            if self._frame is None or time.time() - self._frame_time > max_age:
+                return None
+            jpeg, (width, height) = self._frame, self._frame_size
+
+        return Screenshot(
+            base64_data=base64.b64encode(jpeg).decode("utf-8"),
+            width=width,
+            height=height,
+            is_sensitive=False,
+        )
+
+    def wait_for_frame(self, after_id: int, timeout: float) -> bool:
+        """
+        Wait until a frame newer than after_id (by content) arrives.
+
+        Args:
+            after_id: Frame id observed earlier (see frame_id).
+            timeout: Maximum wait in seconds.
+
+        Returns:
+            True if the screen changed, False on timeout.
+        """
+        deadline = time.time() + timeout
+        with self._cond:
+            while self._frame_id <= after_id:
+                remaining = deadline - time.time()
+                if remaining <= 0 or self._stop.is_set():
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def wait_until_stable(self, stable_time: float = 0.3, timeout: float = 2.0) -> bool:
+        """
+        Wait until the screen content has not changed for stable_time.
+
+        Args:
+            stable_time: Required quiet period in seconds.
+            timeout: Maximum wait in seconds.
+
+        Returns:
+            True if the screen settled, False on timeout or without frames.
+        """
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                if self._frame is None or self._stop.is_set():
+                    return False
+                now = time.time()
+                quiet = now - self._last_change_time
+                if quiet >= stable_time:
+                    return True
+                remaining = deadline - now
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(stable_time - quiet, remaining))
+
+
+_sources: dict[str, MJPEGFrameSource] = {}
+_sources_lock = threading.Lock()
+
+
+def start_frame_source(
+    wda_url: str = "http://localhost:8100", mjpeg_url: str = "http://localhost:9100"
+) -> MJPEGFrameSource:
+    """
+    Start (or reuse) the MJPEG frame source used by get_screenshot for a WDA URL.
+
+    Args:
+        wda_url: WebDriverAgent URL the frames belong to.
+        mjpeg_url: MJPEG server URL.
+
+    Returns:
+        Running MJPEGFrameSource.
+    """
+    key = wda_url.rstrip("/")
+    with _sources_lock:
+        source = _sources.get(key)
+        if source is None or source.mjpeg_url != mjpeg_url.rstrip("/"):
+            if source is not None:
+                source.stop()
+            source = MJPEGFrameSource(mjpeg_url)
+            _sources[key] = source
+        return source.start()
+
+
+def get_frame_source(wda_url: str = "http://localhost:8100") -> MJPEGFrameSource | None:
+    """Get the registered frame source for a WDA URL, if any."""
+    with _sources_lock:
+        return _sources.get(wda_url.rstrip("/"))
+
+
+def stop_frame_source(wda_url: str = "http://localhost:8100") -> None:
+    """Stop and unregister the frame source for a WDA URL."""
+    with _sources_lock:
+        source = _sources.pop(wda_url.rstrip("/"), None)
+    if source is not None:
+        source.stop()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+任务精简缓存模块 - 基于SQLite的持久化LRU缓存
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, Optional, Any
+from datetime import datetime
+
+from task_history import normalize_task
+
+logger = logging.getLogger(__name__)
+
+
+# 缓存匹配类型
+MATCH_EXACT = "exact"
+MATCH_SIMILAR = "similar"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    norm_task TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    version TEXT NOT NULL,
+    simhash INTEGER NOT NULL,
+    simplified_task TEXT NOT NULL,
+    result_provider TEXT,
+    created_at TEXT NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_entries_scope ON entries(provider, version);
+CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access);
+"""
+
+# 忽略的首尾标点
+_EDGE_PUNCTUATION = "。.！!？?；;，, "
+# 中文标点两侧的空白没有意义
+_CJK_PUNCT_SPACE = re.compile(r"\s*([，。！？；：、])\s*")
+_SHINGLE_SIZE = 3
+_SIMHASH_BITS = 64
+
+
+def normalize_for_cache(task: str) -> str:
+    """规范化任务文本用于缓存键：合并空白、忽略大小写和首尾标点"""
+    text = _CJK_PUNCT_SPACE.sub(r"\1", normalize_task(task))
+    return text.lower().strip(_EDGE_PUNCTUATION)
+
+
+def shingles(text: str) -> set:
+    """将文本切分为字符shingle集合"""
+    text = re.sub(r"\s+", "", text)
+    if len(text) <= _SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + _SHINGLE_SIZE] for i in range(len(text) - _SHINGLE_SIZE + 1)}
+
+
+def simhash(text: str) -> int:
+    """
+    计算文本字符shingle的64位SimHash
+
+    相似文本的SimHash只有少量比特不同，可用汉明距离快速筛选近似重复。
+    """
+    weights = [0] * _SIMHASH_BITS
+    for shingle in shingles(text):
+        digest = int.from_bytes(hashlib.md5(shingle.encode("utf-8")).digest()[:8], "big")
+        for bit in range(_SIMHASH_BITS):
+            weights[bit] += 1 if digest >> bit & 1 else -1
+
+    value = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            value |= 1 << bit
+    return value
+
+
+def content_chars(text: str) -> str:
+    """文本中的文字和数字（汉字、字母、数字），去掉空白、标点和符号"""
+    return "".join(ch for ch in text if ch.isalnum())
+
+
+def _to_signed(value: int) -> int:
+    """SQLite INTEGER为有符号64位，存储前转换"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class SimplifyCache:
+    """任务精简缓存类
+
+    以（规范化任务文本、平台、模型/提示词版本）为键缓存精简结果，
+    超过容量时淘汰最久未使用的条目。可选（默认关闭）匹配近似重复任务：只有标点、
+    空白和符号不同、文字（汉字、字母、数字）完全相同的任务才算近似重复，按文字的
+    SimHash索引查找。只差一两个字的中文任务（取消/推迟、张三/张四）含义往往完全
+    不同，不能共用精简结果。
+    """
+
+    def __init__(self, db_path: str = "simplify_cache.db", max_entries: int = 1000,
+                 near_duplicates: bool = False):
+        """
+        Args:
+            db_path: 缓存数据库路径
+            max_entries: 最大缓存条目数
+            near_duplicates: 精确未命中时是否匹配近似重复任务（仅标点、空白不同）
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.near_duplicates = near_duplicates
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def make_key(norm_task: str, provider: str, version: str) -> str:
+        """生成缓存键"""
+        raw = "\x1f".join((version, provider, norm_task))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, task: str, provider: str, version: str) -> Optional[Dict[str, Any]]:
+        """
+        查询缓存
+
+        Args:
+            task: 原始任务文本
+            provider: AI平台（或多平台模式标识）
+            version: 模型/提示词版本
+
+        Returns:
+            缓存记录（含match字段表示exact/similar），未命中返回None
+        """
+        norm = normalize_for_cache(task)
+        if not norm:
+            return None
+
+        key = self.make_key(norm, provider, version)
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM entries WHERE key = ?", (key,)).fetchone()
+            match = MATCH_EXACT
+
+            if row is None and self.near_duplicates:
+                row = self._find_similar(norm, provider, version)
+                match = MATCH_SIMILAR
+
+            if row is None:
+                return None
+
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE entries SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                    (time.time(), row["key"]),
+                )
+
+        entry = dict(row)
+        entry["match"] = match
+        entry["simhash"] = _to_unsigned(entry["simhash"])
+        return entry
+
+    def _find_similar(self, norm: str, provider: str, version: str) -> Optional[sqlite3.Row]:
+        """在同一平台和版本下查找文字相同的近似任务，取最近使用的一条（调用方需持有锁）"""
+        content = content_chars(norm)
+        if not content:
+            return None
+        for row in self._conn.execute(
+            "SELECT * FROM entries WHERE provider = ? AND version = ? AND simhash = ? "
+            "ORDER BY last_access DESC",
+            (provider, version, _to_signed(simhash(content))),
+        ):
+            if content_chars(row["norm_task"]) == content:
+                return row
+        return None
+
+    def put(self, task: str, provider: str, version: str, simplified_task: str,
+            result_provider: Optional[str] = None) -> None:
+        """
+        写入缓存并按LRU淘汰超出容量的条目
+
+        Args:
+            task: 原始任务文本
+            provider: AI平台（或多平台模式标识）
+            version: 模型/提示词版本
+            simplified_task: 精简结果
+            result_provider: 实际产生结果的平台
+        """
+        norm = normalize_for_cache(task)
+        if not norm or not simplified_task:
+            return
+
+        key = self.make_key(norm, provider, version)
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO entries(key, norm_task, provider, version, simhash,
+                                               simplified_task, result_provider, created_at, last_access, hits)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+                """,
+                (key, norm, provider, version, _to_signed(simhash(content_chars(norm))),
+                 simplified_task, result_provider or provider, now, time.time()),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM entries WHERE key IN (
+                    SELECT key FROM entries ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def invalidate(self, task: str, provider: str, version: str) -> None:
+        """删除指定任务的精确缓存"""
+        norm = normalize_for_cache(task)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (self.make_key(norm, provider, version),))
+
+    def count(self) -> int:
+        """缓存条目数"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
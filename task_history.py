@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+任务历史存储模块 - 基于SQLite的任务历史记录
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, List, Optional, Any
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+# 运行结果常量
+OUTCOME_RUNNING = "running"
+OUTCOME_SUCCESS = "success"
+OUTCOME_FAILED = "failed"
+OUTCOME_STOPPED = "stopped"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task TEXT NOT NULL,
+    norm_task TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL,
+    last_used_at TEXT NOT NULL,
+    use_count INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_last_used ON tasks(last_used_at DESC, id DESC);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    started_at TEXT NOT NULL,
+    started_ts REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_task ON runs(task_id, id DESC);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    task, content='tasks', content_rowid='id', tokenize='{tokenizer}'
+);
+CREATE TRIGGER IF NOT EXISTS tasks_ai AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts(rowid, task) VALUES (new.id, new.task);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_ad AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, task) VALUES ('delete', old.id, old.task);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_au AFTER UPDATE OF task ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, task) VALUES ('delete', old.id, old.task);
+    INSERT INTO tasks_fts(rowid, task) VALUES (new.id, new.task);
+END;
+"""
+
+# trigram分词器支持中文子串检索，查询词至少需要3个字符
+_TRIGRAM_MIN_QUERY = 3
+
+
+def normalize_task(task: Any) -> str:
+    """规范化任务文本，去除多余空白"""
+    return ' '.join(task.split()) if isinstance(task, str) else str(task)
+
+
+class TaskHistoryStore:
+    """任务历史存储类
+
+    任务按规范化文本去重，每次使用只会更新计数和时间，
+    插入与更新均为单行操作，不再整体重写文件。
+    """
+
+    def __init__(self, db_path: str = "task_history.db", legacy_json_path: Optional[str] = "task_history.json"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._fts_tokenizer = None
+        self._init_schema()
+
+        if legacy_json_path:
+            self.migrate_from_json(legacy_json_path)
+
+    def _init_schema(self):
+        """创建表结构和全文索引"""
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+            # 优先使用trigram分词器（支持中文），不可用时退回unicode61，再不行则不建索引
+            for tokenizer in ("trigram", "unicode61"):
+                try:
+                    self._conn.executescript(_FTS_SCHEMA.format(tokenizer=tokenizer))
+                    self._fts_tokenizer = tokenizer
+                    break
+                except sqlite3.OperationalError as e:
+                    logger.debug(f"FTS5分词器 {tokenizer} 不可用: {e}")
+
+            if self._fts_tokenizer is None:
+                logger.warning("当前SQLite不支持FTS5，任务搜索将使用LIKE匹配")
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def migrate_from_json(self, json_path: str) -> int:
+        """
+        从旧版task_history.json一次性迁移历史记录
+
+        Args:
+            json_path: 旧版JSON历史文件路径
+
+        Returns:
+            迁移的记录条数（已迁移过则返回0）
+        """
+        with self._lock:
+            if self._get_meta("json_migrated"):
+                return 0
+
+        records = []
+        if os.path.exists(json_path):
+            try:
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, list):
+                    records = [r for r in data if isinstance(r, dict) and r.get('task')]
+            except Exception as e:
+                logger.error(f"读取旧版任务历史失败: {e}")
+                return 0
+
+        migrated = 0
+        with self._lock, self._conn:
+            # 旧文件最新记录在前，倒序导入以保持时间顺序；重复的id/任务合并为使用次数
+            for record in reversed(records):
+                norm = normalize_task(record.get('task', ''))
+                if not norm:
+                    continue
+                timestamp = record.get('timestamp') or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self._conn.execute(
+                    """
+                    INSERT INTO tasks(task, norm_task, created_at, last_used_at, use_count)
+                    VALUES (?, ?, ?, ?, 1)
+                    ON CONFLICT(norm_task) DO UPDATE SET
+                        use_count = use_count + 1,
+                        last_used_at = MAX(last_used_at, excluded.last_used_at)
+                    """,
+                    (norm, norm, timestamp, timestamp),
+                )
+                migrated += 1
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('json_migrated', ?)",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),),
+            )
+
+        if migrated:
+            logger.info(f"已从 {json_path} 迁移 {migrated} 条任务历史")
+        return migrated
+
+    def add_task(self, task: str) -> Optional[int]:
+        """
+        添加任务到历史记录，已存在的任务只增加使用次数
+
+        Args:
+            task: 任务文本
+
+        Returns:
+            任务ID，空任务返回None
+        """
+        norm = normalize_task(task)
+        if not norm:
+            return None
+
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO tasks(task, norm_task, created_at, last_used_at, use_count)
+                VALUES (?, ?, ?, ?, 1)
+                ON CONFLICT(norm_task) DO UPDATE SET
+                    use_count = use_count + 1,
+                    last_used_at = excluded.last_used_at
+                """,
+                (norm, norm, now, now),
+            )
+            row = self._conn.execute("SELECT id FROM tasks WHERE norm_task = ?", (norm,)).fetchone()
+        return row["id"]
+
+    def start_run(self, task_id: int) -> int:
+        """
+        记录一次任务执行的开始
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            执行记录ID
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs(task_id, started_at, started_ts, outcome) VALUES (?, ?, ?, ?)",
+                (task_id, now, time.time(), OUTCOME_RUNNING),
+            )
+        return cursor.lastrowid
+
+    def finish_run(self, run_id: int, outcome: str) -> None:
+        """
+        记录一次任务执行的结果和耗时
+
+        Args:
+            run_id: 执行记录ID
+            outcome: 执行结果（success/failed/stopped）
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                UPDATE runs SET outcome = ?, duration = ? - started_ts
+                WHERE id = ? AND outcome = ?
+                """,
+                (outcome, time.time(), run_id, OUTCOME_RUNNING),
+            )
+
+    def _match_clause(self, query: str) -> tuple[str, list]:
+        """构建搜索条件"""
+        query = normalize_task(query)
+        if not query:
+            return "", []
+
+        use_fts = self._fts_tokenizer == "unicode61" or (
+            self._fts_tokenizer == "trigram" and len(query) >= _TRIGRAM_MIN_QUERY
+        )
+        if use_fts:
+            # 作为短语检索，转义双引号
+            phrase = '"' + query.replace('"', '""') + '"'
+            return "WHERE t.id IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)", [phrase]
+
+        escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return "WHERE t.task LIKE ? ESCAPE '\\'", [f"%{escaped}%"]
+
+    def count_tasks(self, query: str = "") -> int:
+        """统计（匹配搜索词的）任务数量"""
+        where, params = self._match_clause(query)
+        with self._lock:
+            row = self._conn.execute(f"SELECT COUNT(*) AS n FROM tasks t {where}", params).fetchone()
+        return row["n"]
+
+    def list_tasks(self, query: str = "", limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        分页查询任务历史，按最近使用时间倒序
+
+        Args:
+            query: 搜索词，为空时返回全部任务
+            limit: 每页条数
+            offset: 偏移量
+
+        Returns:
+            任务记录列表
+        """
+        where, params = self._match_clause(query)
+        sql = f"""
+            SELECT t.id, t.task, t.created_at, t.last_used_at, t.use_count,
+                   (SELECT r.outcome FROM runs r WHERE r.task_id = t.id ORDER BY r.id DESC LIMIT 1) AS last_outcome,
+                   (SELECT r.duration FROM runs r WHERE r.task_id = t.id ORDER BY r.id DESC LIMIT 1) AS last_duration
+            FROM tasks t
+            {where}
+            ORDER BY t.last_used_at DESC, t.id DESC
+            LIMIT ? OFFSET ?
+        """
+        with self._lock:
+            rows = self._conn.execute(sql, params + [limit, offset]).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_task(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """按ID获取任务记录"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_task_stats(self, task_id: int) -> Dict[str, Any]:
+        """获取任务的执行统计（次数、成功数、平均耗时）"""
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT COUNT(*) AS runs,
+                       SUM(outcome = ?) AS successes,
+                       AVG(CASE WHEN outcome = ? THEN duration END) AS avg_success_duration
+                FROM runs WHERE task_id = ?
+                """,
+                (OUTCOME_SUCCESS, OUTCOME_SUCCESS, task_id),
+            ).fetchone()
+        return dict(row)
+
+    def delete_tasks(self, task_ids: List[int]) -> int:
+        """删除指定任务及其执行记录"""
+        if not task_ids:
+            return 0
+        with self._lock, self._conn:
+            cursor = self._conn.executemany("DELETE FROM tasks WHERE id = ?", [(i,) for i in task_ids])
+        return cursor.rowcount
+
+    def remove_duplicates(self) -> int:
+        """
+        删除重复任务（保留最早的一条）
+
+        任务表对规范化文本有唯一约束，正常情况下不会产生重复，
+        此方法用于兼容旧数据库中可能残留的重复记录。
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM tasks WHERE id NOT IN (SELECT MIN(id) FROM tasks GROUP BY norm_task)"
+            )
+        return cursor.rowcount
+
+    def clear(self) -> int:
+        """清空所有任务历史"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM tasks")
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
@@ -5,17 +5,31 @@
 
 import json
 import os
+import re
+import time
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+import concurrent.futures
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional, Any
 from enum import Enum
 from datetime import datetime
 
+from simplify_cache import SimplifyCache, MATCH_SIMILAR, normalize_for_cache
+
 # 设置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# 提示词版本，修改精简提示词时递增以使旧缓存失效
+PROMPT_VERSION = "1"
+
+# 未指定平台（多平台模式）时的缓存范围标识
+AUTO_PROVIDER = "auto"
+
+
 class AIProvider(Enum):
     """AI平台枚举"""
     DEEPSEEK = "deepseek"
@@ -29,11 +43,361 @@ class AIProvider(Enum):
     TONGYI = "tongyi"
 
 
+# 支持流式输出的平台（OpenAI兼容接口）
+STREAMING_PROVIDERS = {
+    AIProvider.DEEPSEEK,
+    AIProvider.DOUBAO,
+    AIProvider.YUANBAO,
+    AIProvider.TONGYI,
+    AIProvider.OPENAI,
+}
+
+
+class SimplifierRuntime:
+    """
+    精简器运行时 - 常驻后台事件循环 + 按平台复用的HTTP连接池
+
+    所有平台调用都提交到同一个后台事件循环线程中执行，
+    每个平台保持一个长连接的aiohttp会话，避免每次精简都重新建立连接。
+    """
+
+    def __init__(self, keepalive_timeout: float = 60.0, limit_per_host: int = 4):
+        self.keepalive_timeout = keepalive_timeout
+        self.limit_per_host = limit_per_host
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._sessions: Dict[str, Any] = {}
+        self._openai_clients: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """获取后台事件循环（首次访问时启动线程）"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                ready = threading.Event()
+                loop = asyncio.new_event_loop()
+
+                def run_loop():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run_loop, name="simplifier-loop", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def in_loop(self) -> bool:
+        """当前是否运行在运行时的事件循环中"""
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """提交协程到后台事件循环，返回可跨线程等待的Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: Optional[float] = None) -> Any:
+        """提交协程并阻塞等待结果"""
+        if self.in_loop():
+            raise RuntimeError("不能在运行时事件循环内同步等待结果")
+        return self.submit(coro).result(timeout)
+
+    def get_session(self, key: str):
+        """获取指定平台的共享aiohttp会话（必须在运行时事件循环中调用）"""
+        import aiohttp
+
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                keepalive_timeout=self.keepalive_timeout,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[key] = session
+        return session
+
+    def get_openai_client(self, key: str, api_key: str, base_url: str):
+        """获取指定平台的共享AsyncOpenAI客户端（必须在运行时事件循环中调用）"""
+        from openai import AsyncOpenAI
+
+        cache_key = (key, api_key, base_url)
+        client = self._openai_clients.get(cache_key)
+        if client is None:
+            # 配置变更后旧客户端不再使用，关闭其连接池
+            for old_key in [k for k in self._openai_clients if k[0] == key]:
+                asyncio.ensure_future(self._openai_clients.pop(old_key).close())
+            client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+            self._openai_clients[cache_key] = client
+        return client
+
+    async def _close_clients(self):
+        for session in self._sessions.values():
+            if not session.closed:
+                await session.close()
+        for client in self._openai_clients.values():
+            await client.close()
+        self._sessions.clear()
+        self._openai_clients.clear()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """关闭所有连接并停止后台事件循环"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_clients(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"关闭精简器连接失败: {str(e)}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+
+
+# 全局精简器运行时实例
+_simplifier_runtime: Optional[SimplifierRuntime] = None
+_simplifier_runtime_lock = threading.Lock()
+
+
+def get_simplifier_runtime() -> SimplifierRuntime:
+    """获取全局精简器运行时实例"""
+    global _simplifier_runtime
+    with _simplifier_runtime_lock:
+        if _simplifier_runtime is None:
+            _simplifier_runtime = SimplifierRuntime()
+        return _simplifier_runtime
+
+
+# 关键实体：引号内容、网址、账号（@用户名、邮箱）、数字（含时间/金额）。
+# 普通英文单词不算：英文或换一种说法的改写同样有效
+_ENTITY_PATTERNS = [
+    re.compile(r'[“"「『]([^”"」』]+)[”"」』]'),
+    re.compile(r'(?:https?://|www\.)[^\s，。！？、“”"]+'),
+    re.compile(r'[\w.+-]*@[\w.-]*\w'),
+    re.compile(r'\d+(?:[.:：]\d+)*'),
+]
+
+# 系统应用的名称（设置、相机、音乐等）也是普通词汇，不作为关键实体
+_SYSTEM_PACKAGE_PREFIXES = ("com.android.", "com.google.android.", "com.huawei.", "com.ohos.")
+
+_app_names: Optional[Dict[str, str]] = None
+
+
+def known_app_names() -> Dict[str, str]:
+    """
+    已知第三方应用名（小写）到应用标识的映射，来自phone_agent的应用表
+
+    同一应用在安卓和鸿蒙表中的名称共用一个标识，用于判断改写是否换了应用名的说法。
+    """
+    global _app_names
+    if _app_names is None:
+        names: Dict[str, str] = {}
+        apps: Dict[str, str] = {}  # 包名 -> 应用标识
+        try:
+            from phone_agent.config.apps import APP_PACKAGES
+            from phone_agent.config.apps_harmonyos import APP_PACKAGES as HARMONY_PACKAGES
+        except ImportError:
+            HARMONY_PACKAGES = APP_PACKAGES = {}
+        for table in (APP_PACKAGES, HARMONY_PACKAGES):
+            for name, package in table.items():
+                key = name.strip().lower()
+                if len(key) < 2 or package.startswith(_SYSTEM_PACKAGE_PREFIXES):
+                    continue
+                app = apps.get(package) or names.get(key) or package
+                apps.setdefault(package, app)
+                names.setdefault(key, app)
+        _app_names = names
+    return _app_names
+
+
+def _mentions(text: str, name: str) -> bool:
+    """文本（小写）是否提到该名称，英文名称需要完整匹配单词"""
+    if not name.isascii():
+        return name in text
+    return re.search(rf"(?<![a-z0-9]){re.escape(name)}(?![a-z0-9])", text) is not None
+
+
+def extract_key_entities(text: str) -> List[str]:
+    """提取任务描述中必须保留的关键实体（含提到的已知应用名）"""
+    entities = []
+    for pattern in _ENTITY_PATTERNS:
+        for match in pattern.finditer(text):
+            entity = (match.group(1) if pattern.groups else match.group(0)).strip()
+            if entity and entity not in entities:
+                entities.append(entity)
+    lowered = text.lower()
+    for name in known_app_names():
+        if name not in entities and _mentions(lowered, name):
+            entities.append(name)
+    return entities
+
+
+def check_simplify_quality(original: str, simplified: str,
+                           min_ratio: float = 0.15, max_ratio: float = 3.0) -> Dict[str, Any]:
+    """
+    检查精简结果质量：非空、保留关键实体、长度比例合理
+
+    Args:
+        original: 原始任务描述
+        simplified: 精简后的任务描述
+        min_ratio: 精简结果与原文的最小长度比
+        max_ratio: 精简结果与原文的最大长度比
+
+    Returns:
+        包含passed和reason的字典
+    """
+    simplified = (simplified or "").strip()
+    if not simplified:
+        return {"passed": False, "reason": "精简结果为空"}
+
+    original = original.strip()
+    if original:
+        ratio = len(simplified) / len(original)
+        # 很短的原文不检查下限，避免误判
+        if (ratio < min_ratio and len(original) > 20) or ratio > max_ratio:
+            return {"passed": False, "reason": f"长度比例异常({ratio:.2f})"}
+
+    normalized = simplified.lower()
+    apps = known_app_names()
+
+    def kept(entity: str) -> bool:
+        if entity.lower() in normalized:
+            return True
+        # 应用名换成同一应用的其他名称（如“微信”→“WeChat”）也算保留
+        app = apps.get(entity.lower())
+        return app is not None and any(
+            other == app and _mentions(normalized, name) for name, other in apps.items()
+        )
+
+    missing = [e for e in extract_key_entities(original) if not kept(e)]
+    if missing:
+        return {"passed": False, "reason": f"缺少关键信息: {', '.join(missing[:3])}"}
+
+    return {"passed": True, "reason": ""}
+
+
+class ProviderStats:
+    """
+    平台调用统计 - 记录各平台的延迟和成功率
+
+    用于竞速模式下对平台排序，并根据预期延迟决定何时对冲启动下一个平台。
+    """
+
+    # 失败的代价（秒），排序时按 预期延迟 + 失败率 * 代价 计算
+    FAILURE_PENALTY = 5.0
+    # 对冲等待时间 = 预期延迟 * 系数，限制在上下限之间
+    HEDGE_FACTOR = 1.5
+    MIN_HEDGE_DELAY = 0.5
+    MAX_HEDGE_DELAY = 10.0
+
+    def __init__(self, alpha: float = 0.3):
+        """
+        Args:
+            alpha: 延迟指数滑动平均的权重
+        """
+        self.alpha = alpha
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, latency: Optional[float], success: bool) -> None:
+        """记录一次平台调用的延迟和结果，latency为None时只计调用次数"""
+        with self._lock:
+            stat = self._stats.setdefault(provider, {"calls": 0, "successes": 0, "latency": None})
+            stat["calls"] += 1
+            if success:
+                stat["successes"] += 1
+            if latency is None:
+                return
+            if stat["latency"] is None:
+                stat["latency"] = latency
+            else:
+                stat["latency"] = self.alpha * latency + (1 - self.alpha) * stat["latency"]
+
+    def success_rate(self, provider: str) -> float:
+        """平滑后的成功率（无记录时为0.5）"""
+        with self._lock:
+            stat = self._stats.get(provider)
+            if not stat:
+                return 0.5
+            return (stat["successes"] + 1) / (stat["calls"] + 2)
+
+    def expected_latency(self, provider: str) -> Optional[float]:
+        """预期延迟（秒），无记录时返回None"""
+        with self._lock:
+            stat = self._stats.get(provider)
+            return stat["latency"] if stat else None
+
+    def order(self, providers: List[AIProvider]) -> List[AIProvider]:
+        """
+        按预期耗时（延迟 + 失败率 * 失败代价）排序，未记录的平台优先以便采集统计
+        """
+        def score(provider: AIProvider) -> float:
+            latency = self.expected_latency(provider.value)
+            if latency is None:
+                return 0.0
+            return latency + (1 - self.success_rate(provider.value)) * self.FAILURE_PENALTY
+
+        return sorted(providers, key=score)
+
+    def hedge_delay(self, provider: AIProvider) -> float:
+        """启动下一个平台前等待的时间，无记录时立即启动"""
+        latency = self.expected_latency(provider.value)
+        if latency is None:
+            return 0.0
+        return min(max(latency * self.HEDGE_FACTOR, self.MIN_HEDGE_DELAY), self.MAX_HEDGE_DELAY)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """获取统计快照"""
+        with self._lock:
+            return {name: dict(stat) for name, stat in self._stats.items()}
+
+
 class TaskSimplifier:
     """任务精简器核心类"""
     
-    def __init__(self, configs: Dict[AIProvider, Dict] = None):
+    def __init__(self, configs: Dict[AIProvider, Dict] = None, runtime: Optional[SimplifierRuntime] = None,
+                 stats: Optional[ProviderStats] = None):
+        """
+        Args:
+            configs: 各AI平台的配置
+            runtime: 精简器运行时，为None时每次调用使用独立的事件循环和连接
+            stats: 平台调用统计，为None时新建
+        """
         self.configs = configs or {}
+        self.runtime = runtime
+        self.stats = stats or ProviderStats()
+
+    @asynccontextmanager
+    async def _session(self, provider: AIProvider):
+        """获取HTTP会话：在运行时事件循环中复用连接池，否则创建临时会话"""
+        if self.runtime is not None and self.runtime.in_loop():
+            yield self.runtime.get_session(provider.value)
+        else:
+            import aiohttp
+
+            async with aiohttp.ClientSession() as session:
+                yield session
+
+    def _openai_client(self, provider: AIProvider, config: Dict):
+        """获取OpenAI兼容客户端：在运行时事件循环中复用，否则创建新客户端"""
+        if self.runtime is not None and self.runtime.in_loop():
+            return self.runtime.get_openai_client(provider.value, config['api_key'], config['base_url'])
+
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(
+            api_key=config['api_key'],
+            base_url=config['base_url']
+        )
         
     def _validate_config(self, provider: AIProvider, config: Dict) -> Dict[str, Any]:
         """
@@ -227,13 +591,16 @@ class TaskSimplifier:
                 "field": "unknown"
             }
 
-    async def simplify_task_async(self, task_description: str, provider: AIProvider) -> Dict[str, Any]:
+    async def simplify_task_async(self, task_description: str, provider: AIProvider,
+                                  on_delta: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """
         异步精简任务描述
         
         Args:
             task_description: 原始任务描述
             provider: 使用的AI平台
+            on_delta: 流式输出回调，收到增量文本时调用（仅STREAMING_PROVIDERS支持，
+                在事件循环线程中执行）
             
         Returns:
             包含精简结果的字典
@@ -262,13 +629,13 @@ class TaskSimplifier:
             
             # 根据不同平台调用相应的AI接口
             if provider == AIProvider.DEEPSEEK:
-                result = await self._call_deepseek(task_description, config)
+                result = await self._call_deepseek(task_description, config, on_delta)
             elif provider == AIProvider.DOUBAO:
-                result = await self._call_doubao(task_description, config)
+                result = await self._call_doubao(task_description, config, on_delta)
             elif provider == AIProvider.YUANBAO:
-                result = await self._call_yuanbao(task_description, config)
+                result = await self._call_yuanbao(task_description, config, on_delta)
             elif provider == AIProvider.OPENAI:
-                result = await self._call_openai(task_description, config)
+                result = await self._call_openai(task_description, config, on_delta)
             elif provider == AIProvider.GEMINI:
                 result = await self._call_gemini(task_description, config)
             elif provider == AIProvider.CLAUDE:
@@ -278,7 +645,7 @@ class TaskSimplifier:
             elif provider == AIProvider.WENXIN:
                 result = await self._call_wenxin(task_description, config)
             elif provider == AIProvider.TONGYI:
-                result = await self._call_tongyi(task_description, config)
+                result = await self._call_tongyi(task_description, config, on_delta)
             else:
                 result = {
                     "success": False,
@@ -310,6 +677,10 @@ class TaskSimplifier:
             包含精简结果的字典
         """
         try:
+            if self.runtime is not None:
+                # 提交到常驻事件循环，复用已建立的连接
+                return self.runtime.run(self.simplify_task_async(task_description, provider))
+
             # 创建新的事件循环以避免GUI死锁
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
@@ -325,9 +696,60 @@ class TaskSimplifier:
                 "simplified_task": task_description
             }
     
+    async def _timed_call(self, task_description: str, provider: AIProvider) -> Dict[str, Any]:
+        """调用单个平台，附加耗时和质量检查结果，并记录到平台统计"""
+        start = time.monotonic()
+        try:
+            result = await self.simplify_task_async(task_description, provider)
+        except asyncio.CancelledError:
+            # 被竞速取消：已等待时间只是实际延迟的下限，不能作为延迟样本，
+            # 否则输掉竞速的平台会显得比实际更快。只计调用次数，仅当已等待
+            # 时间超过当前预期延迟时才用它拉高预期延迟
+            elapsed = time.monotonic() - start
+            expected = self.stats.expected_latency(provider.value)
+            slower = expected is not None and elapsed > expected
+            self.stats.record(provider.value, elapsed if slower else None, False)
+            raise
+        latency = time.monotonic() - start
+
+        result["latency"] = latency
+        if result.get("success"):
+            result["quality"] = check_simplify_quality(task_description, result.get("simplified_task", ""))
+        passed = bool(result.get("success")) and result.get("quality", {}).get("passed", False)
+        self.stats.record(provider.value, latency, passed)
+        return result
+
+    def _summarize_results(self, task_description: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """从全部平台结果中选择最佳结果，全部失败时汇总错误"""
+        successful_results = [r for r in results if r.get("success")]
+        if successful_results:
+            # 优先选择通过质量检查的结果，其中选择最简洁的
+            passed_results = [r for r in successful_results if r.get("quality", {}).get("passed")]
+            best_result = min(passed_results or successful_results, key=lambda x: len(x.get("simplified_task", "")))
+            best_result["all_results"] = results
+            return best_result
+
+        # 如果所有平台都失败，提供详细的错误汇总
+        error_details = []
+        for result in results:
+            provider = result.get("provider", "unknown")
+            error = result.get("error", "未知错误")
+            error_details.append(f"• {provider.upper()}: {error}")
+
+        error_summary = f"所有AI平台都失败了:\n\n" + "\n".join(error_details[:3])  # 最多显示3个错误
+        if len(error_details) > 3:
+            error_summary += f"\n\n还有{len(error_details)-3}个平台的错误..."
+
+        return {
+            "success": False,
+            "error": error_summary,
+            "simplified_task": task_description,
+            "all_results": results
+        }
+
     async def simplify_task_multiple_providers(self, task_description: str, providers: List[AIProvider]) -> Dict[str, Any]:
         """
-        使用多个AI平台精简任务，选择最佳结果
+        使用多个AI平台精简任务，等待全部平台返回后选择最佳结果
         
         Args:
             task_description: 原始任务描述
@@ -340,7 +762,7 @@ class TaskSimplifier:
             results = []
             
             # 并发调用多个平台
-            tasks = [self.simplify_task_async(task_description, provider) for provider in providers]
+            tasks = [self._timed_call(task_description, provider) for provider in providers]
             provider_results = await asyncio.gather(*tasks, return_exceptions=True)
             
             for i, result in enumerate(provider_results):
@@ -355,31 +777,7 @@ class TaskSimplifier:
                 else:
                     results.append(result)
             
-            # 选择最佳结果
-            successful_results = [r for r in results if r.get("success")]
-            if successful_results:
-                # 选择最简洁且保留关键信息的结果
-                best_result = min(successful_results, key=lambda x: len(x.get("simplified_task", "")))
-                best_result["all_results"] = results
-                return best_result
-            else:
-                # 如果所有平台都失败，提供详细的错误汇总
-                error_details = []
-                for result in results:
-                    provider = result.get("provider", "unknown")
-                    error = result.get("error", "未知错误")
-                    error_details.append(f"• {provider.upper()}: {error}")
-                
-                error_summary = f"所有AI平台都失败了:\n\n" + "\n".join(error_details[:3])  # 最多显示3个错误
-                if len(error_details) > 3:
-                    error_summary += f"\n\n还有{len(error_details)-3}个平台的错误..."
-                
-                return {
-                    "success": False,
-                    "error": error_summary,
-                    "simplified_task": task_description,
-                    "all_results": results
-                }
+            return self._summarize_results(task_description, results)
                 
         except Exception as e:
             logger.error(f"多平台精简任务失败: {str(e)}")
@@ -388,12 +786,165 @@ class TaskSimplifier:
                 "error": str(e),
                 "simplified_task": task_description
             }
+
+    async def simplify_task_race(self, task_description: str, providers: List[AIProvider]) -> Dict[str, Any]:
+        """
+        竞速模式：按历史统计排序依次（对冲）启动平台，返回第一个通过质量检查的结果，
+        并取消其余仍在进行的调用
+
+        排在前面的平台超过预期延迟仍未返回、或返回失败时，立即启动下一个平台；
+        没有统计记录时所有平台同时启动。
+        
+        Args:
+            task_description: 原始任务描述
+            providers: AI平台列表
+            
+        Returns:
+            包含精简结果的字典，全部不合格时退回为最佳可用结果
+        """
+        ordered = self.stats.order(providers)
+        pending: Dict[asyncio.Task, AIProvider] = {}
+        results = []
+        next_index = 0
+
+        def launch_next():
+            nonlocal next_index
+            provider = ordered[next_index]
+            next_index += 1
+            task = asyncio.ensure_future(self._timed_call(task_description, provider))
+            pending[task] = provider
+
+        try:
+            while next_index < len(ordered) or pending:
+                if not pending:
+                    launch_next()
+                    continue
+
+                timeout = None
+                if next_index < len(ordered):
+                    timeout = self.stats.hedge_delay(ordered[next_index - 1])
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # 对冲：当前平台超过预期延迟，启动下一个平台
+                    launch_next()
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.error(f"平台 {provider.value} 调用异常: {str(e)}")
+                        result = {
+                            "success": False,
+                            "provider": provider.value,
+                            "error": str(e),
+                            "simplified_task": task_description
+                        }
+                    results.append(result)
+
+                    if result.get("success") and result.get("quality", {}).get("passed"):
+                        result["all_results"] = results
+                        result["cancelled_providers"] = [p.value for p in pending.values()]
+                        return result
+
+                    if result.get("success"):
+                        logger.info(f"平台 {provider.value} 结果未通过质量检查: {result['quality']['reason']}")
+
+                # 有平台失败或不合格，立即补位启动下一个
+                if next_index < len(ordered):
+                    launch_next()
+
+            return self._summarize_results(task_description, results)
+
+        except Exception as e:
+            logger.error(f"竞速精简任务失败: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "simplified_task": task_description,
+                "all_results": results
+            }
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    @staticmethod
+    def _http_timeout(config: Dict, stream: bool):
+        """
+        aiohttp请求超时：普通请求限制总时长；流式请求只限制建立连接和两次读取
+        之间的间隔，避免输出较长但仍在持续返回的流被总时长截断
+        """
+        import aiohttp
+
+        seconds = config.get("timeout", 30)
+        if stream:
+            return aiohttp.ClientTimeout(total=None, sock_connect=seconds, sock_read=seconds)
+        return aiohttp.ClientTimeout(total=seconds)
+    
+    async def _read_sse_stream(self, response, on_delta: Callable[[str], None], start: float) -> tuple:
+        """
+        读取OpenAI兼容接口的SSE流式响应，每收到一段文本就回调on_delta
+        
+        Returns:
+            (完整文本, usage, 首token耗时秒数)
+        """
+        parts = []
+        usage = {}
+        ttft = None
+        async for raw_line in response.content:
+            line = raw_line.decode("utf-8", errors="ignore").strip()
+            if not line.startswith("data:"):
+                continue
+            payload = line[5:].strip()
+            if payload == "[DONE]":
+                break
+            try:
+                chunk = json.loads(payload)
+            except json.JSONDecodeError:
+                continue
+            if chunk.get("usage"):
+                usage = chunk["usage"]
+            for choice in chunk.get("choices") or []:
+                delta = (choice.get("delta") or {}).get("content")
+                if delta:
+                    if ttft is None:
+                        ttft = time.monotonic() - start
+                    parts.append(delta)
+                    on_delta(delta)
+        return "".join(parts).strip(), usage, ttft
+    
+    async def _read_openai_stream(self, stream, on_delta: Callable[[str], None], start: float) -> tuple:
+        """
+        读取OpenAI客户端的流式响应，每收到一段文本就回调on_delta
+        
+        Returns:
+            (完整文本, usage, 首token耗时秒数)
+        """
+        parts = []
+        usage = {}
+        ttft = None
+        async for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage.model_dump()
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                if ttft is None:
+                    ttft = time.monotonic() - start
+                parts.append(delta)
+                on_delta(delta)
+        return "".join(parts).strip(), usage, ttft
     
     # AI平台调用方法
-    async def _call_deepseek(self, task: str, config: Dict) -> Dict[str, Any]:
+    async def _call_deepseek(self, task: str, config: Dict,
+                             on_delta: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """调用DeepSeek API"""
         try:
-            import aiohttp
             import json
             
             headers = {
@@ -417,14 +968,28 @@ class TaskSimplifier:
                 "temperature": config.get("temperature", 0.1)
             }
             
-            timeout = aiohttp.ClientTimeout(total=config.get("timeout", 30))
+            if on_delta is not None:
+                data["stream"] = True
             
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            timeout = self._http_timeout(config, stream=on_delta is not None)
+            start = time.monotonic()
+            
+            async with self._session(AIProvider.DEEPSEEK) as session:
                 async with session.post(
                     f"{config['base_url']}/chat/completions",
                     headers=headers,
-                    json=data
+                    json=data,
+                    timeout=timeout
                 ) as response:
+                    if response.status == 200 and on_delta is not None:
+                        simplified, usage, ttft = await self._read_sse_stream(response, on_delta, start)
+                        return {
+                            "success": True,
+                            "provider": "deepseek",
+                            "simplified_task": simplified,
+                            "usage": usage,
+                            "time_to_first_token": ttft
+                        }
                     if response.status == 200:
                         result = await response.json()
                         simplified = result["choices"][0]["message"]["content"].strip()
@@ -474,10 +1039,10 @@ class TaskSimplifier:
                     "simplified_task": task
                 }
     
-    async def _call_doubao(self, task: str, config: Dict) -> Dict[str, Any]:
+    async def _call_doubao(self, task: str, config: Dict,
+                           on_delta: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """调用豆包API"""
         try:
-            import aiohttp
             
             headers = {
                 "Authorization": f"Bearer {config['api_key']}",
@@ -500,14 +1065,28 @@ class TaskSimplifier:
                 "temperature": config.get("temperature", 0.1)
             }
             
-            timeout = aiohttp.ClientTimeout(total=config.get("timeout", 30))
+            if on_delta is not None:
+                data["stream"] = True
+            
+            timeout = self._http_timeout(config, stream=on_delta is not None)
+            start = time.monotonic()
             
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with self._session(AIProvider.DOUBAO) as session:
                 async with session.post(
                     f"{config['base_url']}/chat/completions",
                     headers=headers,
-                    json=data
+                    json=data,
+                    timeout=timeout
                 ) as response:
+                    if response.status == 200 and on_delta is not None:
+                        simplified, usage, ttft = await self._read_sse_stream(response, on_delta, start)
+                        return {
+                            "success": True,
+                            "provider": "doubao",
+                            "simplified_task": simplified,
+                            "usage": usage,
+                            "time_to_first_token": ttft
+                        }
                     if response.status == 200:
                         result = await response.json()
                         simplified = result["choices"][0]["message"]["content"].strip()
@@ -541,17 +1120,14 @@ class TaskSimplifier:
                 "simplified_task": task
             }
     
-    async def _call_yuanbao(self, task: str, config: Dict) -> Dict[str, Any]:
+    async def _call_yuanbao(self, task: str, config: Dict,
+                            on_delta: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """调用腾讯元宝API"""
         try:
             # 使用OpenAI客户端库调用混元API
-            from openai import AsyncOpenAI
-            
-            client = AsyncOpenAI(
-                api_key=config['api_key'],
-                base_url=config['base_url']
-            )
+            client = self._openai_client(AIProvider.YUANBAO, config)
             
+            start = time.monotonic()
             completion = await client.chat.completions.create(
                 model=config.get("model", "hunyuan-lite"),
                 messages=[
@@ -568,9 +1144,20 @@ class TaskSimplifier:
                 temperature=config.get("temperature", 0.1),
                 extra_body={
                     "enable_enhancement": True,  # 混元自定义参数，启用增强功能
-                }
+                },
+                stream=on_delta is not None
             )
             
+            if on_delta is not None:
+                simplified, usage, ttft = await self._read_openai_stream(completion, on_delta, start)
+                return {
+                    "success": True,
+                    "provider": "yuanbao",
+                    "simplified_task": simplified,
+                    "usage": usage,
+                    "time_to_first_token": ttft
+                }
+            
             simplified = completion.choices[0].message.content.strip()
             return {
                 "success": True,
@@ -615,10 +1202,10 @@ class TaskSimplifier:
                     "simplified_task": task
                 }
     
-    async def _call_openai(self, task: str, config: Dict) -> Dict[str, Any]:
+    async def _call_openai(self, task: str, config: Dict,
+                           on_delta: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """调用OpenAI API"""
         try:
-            import aiohttp
             
             headers = {
                 "Authorization": f"Bearer {config['api_key']}",
@@ -641,14 +1228,28 @@ class TaskSimplifier:
                 "temperature": config.get("temperature", 0.1)
             }
             
-            timeout = aiohttp.ClientTimeout(total=config.get("timeout", 30))
+            if on_delta is not None:
+                data["stream"] = True
+            
+            timeout = self._http_timeout(config, stream=on_delta is not None)
+            start = time.monotonic()
             
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with self._session(AIProvider.OPENAI) as session:
                 async with session.post(
                     f"{config['base_url']}/chat/completions",
                     headers=headers,
-                    json=data
+                    json=data,
+                    timeout=timeout
                 ) as response:
+                    if response.status == 200 and on_delta is not None:
+                        simplified, usage, ttft = await self._read_sse_stream(response, on_delta, start)
+                        return {
+                            "success": True,
+                            "provider": "openai",
+                            "simplified_task": simplified,
+                            "usage": usage,
+                            "time_to_first_token": ttft
+                        }
                     if response.status == 200:
                         result = await response.json()
                         simplified = result["choices"][0]["message"]["content"].strip()
@@ -738,11 +1339,12 @@ class TaskSimplifier:
             
             timeout = aiohttp.ClientTimeout(total=config.get("timeout", 30))
             
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with self._session(AIProvider.WENXIN) as session:
                 async with session.post(
                     config['base_url'],
                     headers=headers,
-                    json=data
+                    json=data,
+                    timeout=timeout
                 ) as response:
                     if response.status == 200:
                         result = await response.json()
@@ -777,17 +1379,14 @@ class TaskSimplifier:
                 "simplified_task": task
             }
     
-    async def _call_tongyi(self, task: str, config: Dict) -> Dict[str, Any]:
+    async def _call_tongyi(self, task: str, config: Dict,
+                           on_delta: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """调用阿里通义千问API"""
         try:
             # 使用OpenAI客户端库调用通义千问API（兼容模式）
-            from openai import AsyncOpenAI
-            
-            client = AsyncOpenAI(
-                api_key=config['api_key'],
-                base_url=config['base_url']
-            )
+            client = self._openai_client(AIProvider.TONGYI, config)
             
+            start = time.monotonic()
             completion = await client.chat.completions.create(
                 model=config.get("model", "qwen-plus"),
                 messages=[
@@ -797,9 +1396,20 @@ class TaskSimplifier:
                     }
                 ],
                 temperature=config.get("temperature", 0.1),
-                max_tokens=config.get("max_tokens", 200)
+                max_tokens=config.get("max_tokens", 200),
+                stream=on_delta is not None
             )
             
+            if on_delta is not None:
+                simplified, usage, ttft = await self._read_openai_stream(completion, on_delta, start)
+                return {
+                    "success": True,
+                    "provider": "tongyi",
+                    "simplified_task": simplified,
+                    "usage": usage,
+                    "time_to_first_token": ttft
+                }
+            
             simplified = completion.choices[0].message.content.strip()
             
             return {
@@ -828,8 +1438,26 @@ class TaskSimplifier:
 class TaskSimplifierManager:
     """任务精简器管理类"""
     
-    def __init__(self):
+    def __init__(self, runtime: Optional[SimplifierRuntime] = None, race: bool = True,
+                 cache: Optional[SimplifyCache] = None, use_cache: bool = True):
+        """
+        Args:
+            runtime: 精简器运行时，为None时使用全局实例
+            race: 未指定平台时使用竞速模式（首个合格结果即返回），否则等待全部平台
+            cache: 精简结果缓存，为None且use_cache为True时使用默认缓存文件
+            use_cache: 是否启用精简结果缓存
+        """
         self.simplifier = None
+        self.runtime = runtime or get_simplifier_runtime()
+        self.race = race
+        self.cache = cache
+        if self.cache is None and use_cache:
+            try:
+                self.cache = SimplifyCache()
+            except Exception as e:
+                logger.error(f"初始化精简缓存失败: {str(e)}")
+        # 平台统计跨配置重载保留
+        self.stats = ProviderStats()
         self.config_file = "ai_config.json"
         self.load_config()
     
@@ -849,65 +1477,159 @@ class TaskSimplifierManager:
                     except ValueError:
                         continue
                 
-                self.simplifier = TaskSimplifier(configs)
+                self.simplifier = TaskSimplifier(configs, runtime=self.runtime, stats=self.stats)
                 logger.info(f"已加载 {len(configs)} 个AI平台配置")
             else:
                 # 创建空的配置
-                self.simplifier = TaskSimplifier()
+                self.simplifier = TaskSimplifier(runtime=self.runtime, stats=self.stats)
                 logger.info("未找到配置文件，使用默认配置")
                 
         except Exception as e:
             logger.error(f"加载配置失败: {str(e)}")
-            self.simplifier = TaskSimplifier()
+            self.simplifier = TaskSimplifier(runtime=self.runtime, stats=self.stats)
     
-    def simplify_task(self, task_description: str, provider: Optional[str] = None) -> Dict[str, Any]:
+    def simplify_task(self, task_description: str, provider: Optional[str] = None,
+                      force_refresh: bool = False) -> Dict[str, Any]:
         """
         精简任务描述
         
         Args:
             task_description: 原始任务描述
             provider: 指定使用的AI平台，如果为None则使用最佳可用平台
+            force_refresh: 忽略缓存，重新调用AI平台
             
         Returns:
             精简结果
         """
+        try:
+            return self.submit_simplify(task_description, provider, force_refresh).result()
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"精简任务失败: {str(e)}",
+                "simplified_task": task_description
+            }
+    
+    def submit_simplify(self, task_description: str, provider: Optional[str] = None,
+                        force_refresh: bool = False,
+                        on_delta: Optional[Callable[[str], None]] = None) -> concurrent.futures.Future:
+        """
+        提交精简任务到后台事件循环，不阻塞调用线程
+        
+        缓存命中时直接返回已完成的Future，结果中cached为True，
+        cache_match表示精确命中(exact)或近似任务命中(similar)。
+        取消返回的Future会中止进行中的请求（可用于提前采用流式输出的部分结果）。
+        
+        Args:
+            task_description: 原始任务描述
+            provider: 指定使用的AI平台，如果为None则使用最佳可用平台
+            force_refresh: 忽略缓存，重新调用AI平台（结果仍会写入缓存）
+            on_delta: 流式输出回调，仅指定了支持流式的平台时生效，在事件循环线程中调用
+            
+        Returns:
+            结果为精简结果字典的Future
+        """
         if not self.simplifier:
             self.load_config()
         
+        if self.cache is None:
+            return self._submit_uncached(task_description, provider, on_delta)
+        
+        scope, version = self._cache_scope(provider)
+        if not force_refresh:
+            cached = self._lookup_cache(task_description, scope, version)
+            if cached:
+                future = concurrent.futures.Future()
+                future.set_result(cached)
+                return future
+        
+        future = self._submit_uncached(task_description, provider, on_delta)
+        future.add_done_callback(lambda f: self._store_cache(task_description, scope, version, f))
+        return future
+    
+    def _cache_scope(self, provider: Optional[str]) -> tuple:
+        """获取缓存范围（平台标识）和版本（模型 + 提示词版本）"""
+        configs = self.simplifier.configs
         if provider:
-            # 直接调用TaskSimplifier的同步方法
-            return self.simplifier.simplify_task(task_description, AIProvider(provider))
-        else:
-            # 使用所有可用平台，选择最佳结果
-            available_providers = [p for p in AIProvider 
-                                 if p in self.simplifier.configs 
-                                 and self.simplifier.configs[p].get("api_key")]
-            
-            if not available_providers:
-                return {
-                    "success": False,
-                    "error": "没有配置可用的AI平台",
-                    "simplified_task": task_description
-                }
-            
-            # 直接调用TaskSimplifier的同步方法
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    return loop.run_until_complete(
-                        self.simplifier.simplify_task_multiple_providers(
-                            task_description, available_providers
-                        )
-                    )
-                finally:
-                    loop.close()
-            except Exception as e:
-                return {
-                    "success": False,
-                    "error": f"精简任务失败: {str(e)}",
-                    "simplified_task": task_description
-                }
+            model = configs.get(AIProvider(provider), {}).get("model", "")
+            return provider, f"{model}@{PROMPT_VERSION}"
+        
+        models = ",".join(f"{p.value}:{configs[p].get('model', '')}" 
+                          for p in AIProvider if p in configs and configs[p].get("api_key"))
+        return AUTO_PROVIDER, f"{models}@{PROMPT_VERSION}"
+    
+    def _lookup_cache(self, task_description: str, scope: str, version: str) -> Optional[Dict[str, Any]]:
+        """查询缓存，近似命中时要求关键实体完全一致"""
+        try:
+            entry = self.cache.get(task_description, scope, version)
+        except Exception as e:
+            logger.error(f"读取精简缓存失败: {str(e)}")
+            return None
+        if not entry:
+            return None
+        
+        if entry["match"] == MATCH_SIMILAR:
+            if extract_key_entities(normalize_for_cache(task_description)) != extract_key_entities(entry["norm_task"]):
+                return None
+        
+        return {
+            "success": True,
+            "provider": entry["result_provider"],
+            "simplified_task": entry["simplified_task"],
+            "cached": True,
+            "cache_match": entry["match"],
+            "cached_at": entry["created_at"],
+        }
+    
+    def _store_cache(self, task_description: str, scope: str, version: str, future: concurrent.futures.Future):
+        """将成功且通过质量检查的结果写入缓存"""
+        if future.cancelled():
+            return
+        try:
+            result = future.result()
+            if not result.get("success") or not result.get("quality", {}).get("passed", True):
+                return
+            self.cache.put(task_description, scope, version,
+                           result.get("simplified_task", ""), result.get("provider"))
+        except Exception as e:
+            logger.error(f"写入精简缓存失败: {str(e)}")
+    
+    def _submit_uncached(self, task_description: str, provider: Optional[str],
+                         on_delta: Optional[Callable[[str], None]] = None) -> concurrent.futures.Future:
+        """提交精简任务到后台事件循环（不经过缓存）"""
+        if provider:
+            return self.runtime.submit(
+                self.simplifier.simplify_task_async(task_description, AIProvider(provider), on_delta)
+            )
+        
+        # 使用所有可用平台，竞速或选择最佳结果
+        available_providers = [p for p in AIProvider 
+                             if p in self.simplifier.configs 
+                             and self.simplifier.configs[p].get("api_key")]
+        
+        if not available_providers:
+            future = concurrent.futures.Future()
+            future.set_result({
+                "success": False,
+                "error": "没有配置可用的AI平台",
+                "simplified_task": task_description
+            })
+            return future
+        
+        if self.race:
+            return self.runtime.submit(
+                self.simplifier.simplify_task_race(task_description, available_providers)
+            )
+        return self.runtime.submit(
+            self.simplifier.simplify_task_multiple_providers(task_description, available_providers)
+        )
+    
+    def close(self):
+        """关闭精简器运行时的连接和事件循环，以及精简缓存"""
+        if self.runtime is not None:
+            self.runtime.close()
+        if self.cache is not None:
+            self.cache.close()
     
     def get_available_providers(self) -> List[str]:
         """获取可用的AI平台列表"""